@@ -1,5 +1,8 @@
 # app.py — Agent Funcționar Public v3 — Ediția Seif Personal de Documente
+import os
+import re
 import time
+import secrets
 from pathlib import Path
 
 import streamlit as st
@@ -10,6 +13,9 @@ from src.pdf_handler import PDFHandler
 from src.vault_agent import VaultAgent, TYPE_ICONS
 from src import database as db
 from src import ui
+from src.vault_writer import VAULT_WRITER
+
+db.ensure_schema()
 
 # ─── Configurare Pagină ─────────────────────────────────────────────────────
 st.set_page_config(
@@ -23,8 +29,44 @@ st.set_page_config(
 st.markdown(ui.load_css(), unsafe_allow_html=True)
 
 
+# ─── Proprietarul seifului ───────────────────────────────────────────────────
+# VAULT_OWNER_MODE: "local" (implicit — un singur seif, instalare personală),
+# "session" (fiecare sesiune de browser primește un token aleator, păstrat în
+# URL ca ?vault=…) sau "header" (identitatea vine de la proxy-ul de
+# autentificare, în antetul VAULT_OWNER_HEADER).
+VAULT_OWNER_MODE = os.getenv("VAULT_OWNER_MODE", "local")
+VAULT_OWNER_HEADER = os.getenv("VAULT_OWNER_HEADER", "X-Forwarded-User")
+
+
+def resolve_owner() -> str:
+    if VAULT_OWNER_MODE == "header":
+        user = st.context.headers.get(VAULT_OWNER_HEADER)
+        if not user:
+            st.error("Autentificare necesară: identitatea utilizatorului lipsește.")
+            st.stop()
+        return f"user:{user}"
+    if VAULT_OWNER_MODE == "session":
+        token = st.query_params.get("vault", "")
+        if not re.fullmatch(r"[0-9a-f]{32}", token):
+            token = secrets.token_hex(16)
+            st.query_params["vault"] = token
+        return f"session:{token}"
+    return db.DEFAULT_OWNER
+
+
+def flush_vault_writes():
+    """Barieră pentru scrierile amânate ale sesiunii; o eroare devine avertisment, nu blochează rularea."""
+    try:
+        VAULT_WRITER.flush(owner=st.session_state.owner)
+    except (TimeoutError, RuntimeError) as e:
+        st.warning(f"Unele documente nu au fost salvate în seif: {e}", icon="⚠️")
+
+
 # ─── Starea Sesiunii ─────────────────────────────────────────────────────────
 def init_state():
+    if "owner" not in st.session_state:
+        st.session_state.owner = resolve_owner()
+
     if "agent" not in st.session_state:
         try:
             st.session_state.agent = UniversalAgent()
@@ -42,10 +84,10 @@ def init_state():
 
     # Încarcă vault din baza de date SQLite
     if "vault" not in st.session_state:
-        st.session_state.vault = db.get_vault_fields()
+        st.session_state.vault = db.get_vault_fields(owner=st.session_state.owner)
 
     if "vault_docs" not in st.session_state:
-        st.session_state.vault_docs = db.get_vault_documents()
+        st.session_state.vault_docs = db.get_vault_documents(owner=st.session_state.owner)
 
     for key, default in [
         ("pdf_handler", PDFHandler()),
@@ -451,15 +493,16 @@ with tab_vault:
                 except Exception:
                     pass
 
-                already_scanned = db.is_folder_scanned(folder_path)
+                already_scanned = db.is_folder_scanned(folder_path, owner=st.session_state.owner)
 
                 if already_scanned:
                     st.info("Acest folder a fost deja scanat.", icon="ℹ️")
                     if st.button("🔄 Re-scanează folderul", use_container_width=True, key="rescan_btn"):
-                        db.delete_vault_documents_by_folder(folder_path)
-                        db.clear_vault()
-                        st.session_state.vault_docs = db.get_vault_documents()
-                        st.session_state.vault = db.get_vault_fields()
+                        flush_vault_writes()       # scrierile amânate, înainte de ștergere
+                        db.delete_vault_documents_by_folder(folder_path, owner=st.session_state.owner)
+                        db.clear_vault(owner=st.session_state.owner)
+                        st.session_state.vault_docs = db.get_vault_documents(owner=st.session_state.owner)
+                        st.session_state.vault = db.get_vault_fields(owner=st.session_state.owner)
                         st.session_state.vault_autofill_done = False
                         st.rerun()
                 else:
@@ -534,23 +577,25 @@ with tab_vault:
                                 for k, v in result["vault"].items():
                                     if k not in st.session_state.vault:
                                         st.session_state.vault[k] = v
-                                db.save_vault_fields(st.session_state.vault)
-
-                                for fr in result["files"]:
-                                    if not fr["skipped"] and fr.get("fields"):
-                                        doc_entry = {
-                                            "name": fr["name"],
-                                            "rel":  fr["rel"],
-                                            "type": fr.get("type", "general"),
-                                            "icon": fr.get("icon", "📄"),
-                                            "fields": fr["fields"],
-                                            "count": len(fr["fields"]),
-                                            "source": "folder",
-                                            "folder": folder_path,
-                                        }
-                                        db.save_vault_document(doc_entry)
-
-                                st.session_state.vault_docs = db.get_vault_documents()
+                                # Câmpuri + toate documentele: o singură tranzacție,
+                                # după fișierele individuale încă din coadă.
+                                flush_vault_writes()
+                                db.save_vault_scan(st.session_state.vault, (
+                                    {
+                                        "name": fr["name"],
+                                        "rel":  fr["rel"],
+                                        "type": fr.get("type", "general"),
+                                        "icon": fr.get("icon", "📄"),
+                                        "fields": fr["fields"],
+                                        "count": len(fr["fields"]),
+                                        "source": "folder",
+                                        "folder": folder_path,
+                                    }
+                                    for fr in result["files"]
+                                    if not fr["skipped"] and fr.get("fields")
+                                ), owner=st.session_state.owner)
+
+                                st.session_state.vault_docs = db.get_vault_documents(owner=st.session_state.owner)
                                 st.session_state.vault_autofill_done = False
                                 useful = len([f for f in result["files"] if f.get("fields")])
                                 add_log(
@@ -609,8 +654,9 @@ with tab_vault:
                                         "source": "single",
                                     }
                                     st.session_state.vault_docs.append(doc_entry)
-                                    db.save_vault_fields(extracted)
-                                    db.save_vault_document(doc_entry)
+                                    # Write-behind: firul VAULT_WRITER confirmă în lot, rularea nu așteaptă.
+                                    VAULT_WRITER.save_fields(extracted, owner=st.session_state.owner)
+                                    VAULT_WRITER.save_document(doc_entry, owner=st.session_state.owner)
                                     add_log(f"+{len(extracted)} câmpuri", "ok")
                                 pb.progress((i + 1) / len(new_files))
                             pb.empty(); st_s.empty()
@@ -662,21 +708,55 @@ with tab_vault:
             </div>
             """, unsafe_allow_html=True)
         else:
-            # Grupare după sursă
-            folder_sources = sorted({d.get("folder", "Încărcat") for d in st.session_state.vault_docs})
-
-            for source in folder_sources:
-                docs_in_source = [d for d in st.session_state.vault_docs if d.get("folder", "Încărcat") == source]
-                source_label = source if source != "Încărcat" else "📎 Fișiere încărcate"
+            search_query = st.text_input(
+                "🔎 Caută în seif",
+                key="vault_search",
+                placeholder="ex. adresa veche, Teiului 17, pașaport, CNP…",
+            )
+            if search_query.strip():
+                # Căutare full-text (FTS5): nume de fișier, tip și câmpurile extrase.
+                started = time.perf_counter()
+                flush_vault_writes()           # fișierele abia încărcate sunt și ele căutabile
+                hits = db.search_vault(search_query, owner=st.session_state.owner)
+                elapsed_ms = (time.perf_counter() - started) * 1000
                 st.markdown(f'''
                 <div style="font-family:Inter,sans-serif;font-size:0.7rem;font-weight:700;
                             color:#94A3B8;text-transform:uppercase;letter-spacing:1.5px;
                             margin:12px 0 8px 0;">
-                    📂 {source_label} · {len(docs_in_source)} fișier{"e" if len(docs_in_source)!=1 else ""}
+                    🔎 {len(hits["documents"])} rezultat{"e" if len(hits["documents"])!=1 else ""} · {elapsed_ms:.0f} ms
                 </div>''', unsafe_allow_html=True)
-
-                for doc in docs_in_source:
+                for doc in hits["documents"]:
                     st.markdown(ui.vault_doc_card(doc), unsafe_allow_html=True)
+                if hits["required_documents"]:
+                    rows_html = "".join(
+                        f'<div style="padding:6px 0;border-bottom:1px solid #F1F5F9;font-family:Inter,sans-serif;font-size:0.8rem;">'
+                        f'📋 {h["document"]} <span style="color:#94A3B8;">· '
+                        f'{SERVICES[h["service"]]["name"] if h["service"] in SERVICES else h["service"]}</span></div>'
+                        for h in hits["required_documents"]
+                    )
+                    st.markdown(f'''
+                    <div style="font-family:Inter,sans-serif;font-size:0.7rem;font-weight:700;
+                                color:#94A3B8;text-transform:uppercase;letter-spacing:1.5px;
+                                margin:16px 0 4px 0;">Documente necesare la ghișeu</div>
+                    <div>{rows_html}</div>''', unsafe_allow_html=True)
+                elif not hits["documents"]:
+                    st.info("Niciun document din seif nu se potrivește căutării.")
+            else:
+                # Grupare după sursă
+                folder_sources = sorted({d.get("folder", "Încărcat") for d in st.session_state.vault_docs})
+
+                for source in folder_sources:
+                    docs_in_source = [d for d in st.session_state.vault_docs if d.get("folder", "Încărcat") == source]
+                    source_label = source if source != "Încărcat" else "📎 Fișiere încărcate"
+                    st.markdown(f'''
+                    <div style="font-family:Inter,sans-serif;font-size:0.7rem;font-weight:700;
+                                color:#94A3B8;text-transform:uppercase;letter-spacing:1.5px;
+                                margin:12px 0 8px 0;">
+                        📂 {source_label} · {len(docs_in_source)} fișier{"e" if len(docs_in_source)!=1 else ""}
+                    </div>''', unsafe_allow_html=True)
+
+                    for doc in docs_in_source:
+                        st.markdown(ui.vault_doc_card(doc), unsafe_allow_html=True)
 
             # Tabel complet date vault
             with st.expander("🔍 Vizualizează toate datele extrase", expanded=False):
@@ -691,7 +771,8 @@ with tab_vault:
 
             st.markdown("<div style='height:12px'></div>", unsafe_allow_html=True)
             if st.button("🗑️ Golește Seiful", key="clear_vault"):
-                db.clear_vault()
+                flush_vault_writes()           # altfel o scriere din coadă ar reapărea după golire
+                db.clear_vault(owner=st.session_state.owner)
                 st.session_state.vault = {}
                 st.session_state.vault_docs = []
                 st.session_state.vault_autofill_done = False
@@ -0,0 +1,124 @@
+# benchmarks/bench_registry_layout.py — Instantaneul registrelor: schema TEXT vs. compactă
+#
+#   python benchmarks/bench_registry_layout.py [--rows 1000000] [--dir /var/tmp]
+#
+# Importă N cetățeni și N/2 vehicule sintetice într-o bază temporară (baza
+# aplicației nu este atinsă), publică același conținut în ambele formate de
+# instantaneu și compară dimensiunea fișierului, timpul de publicare (importul
+# în masă în instantaneu) și latența get_citizen / get_vehicle: la rece (pagini
+# scoase din cache-ul sistemului cu posix_fadvise, conexiune nouă) și la cald.
+# Pe tmpfs fadvise nu are efect: pentru „la rece” folosiți --dir pe un disc.
+"""Compară instantaneul registrelor în format text și compact: dimensiune, publicare, latență."""
+import os
+import sys
+import time
+import random
+import argparse
+import statistics
+import tempfile
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+from src import database as db
+from src import registry_loader as loader
+
+
+def _evict(path: str) -> bool:
+    """Scoate fișierul din cache-ul de pagini al sistemului; False dacă nu se poate."""
+    if not hasattr(os, "posix_fadvise"):
+        return False
+    fd = os.open(path, os.O_RDONLY)
+    try:
+        os.fsync(fd)
+        os.posix_fadvise(fd, 0, 0, os.POSIX_FADV_DONTNEED)
+    finally:
+        os.close(fd)
+    return True
+
+
+def _table_bytes(path: str) -> dict:
+    """Octeți per tabelă (cu indecșii ei), din dbstat, dacă SQLite îl are compilat."""
+    import sqlite3
+    conn = sqlite3.connect(path)
+    try:
+        rows = conn.execute("""SELECT COALESCE(m.tbl_name, s.name), SUM(s.pgsize) FROM dbstat s
+                               LEFT JOIN sqlite_master m ON m.name = s.name GROUP BY 1""").fetchall()
+    except sqlite3.OperationalError:
+        rows = []
+    finally:
+        conn.close()
+    return dict(rows)
+
+
+def _micros(fn, keys: list) -> float:
+    """Mediana, în µs, a câte unui apel fn(cheie)."""
+    times = []
+    for key in keys:
+        start = time.perf_counter()
+        fn(key)
+        times.append((time.perf_counter() - start) * 1e6)
+    return statistics.median(times)
+
+
+def _cold(fn, keys: list, path: str) -> float:
+    times = []
+    for key in keys:
+        db.close_connection()
+        _evict(path)
+        start = time.perf_counter()
+        fn(key)
+        times.append((time.perf_counter() - start) * 1e6)
+    return statistics.median(times)
+
+
+def main(argv=None) -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--rows", type=int, default=1_000_000)
+    parser.add_argument("--lookups", type=int, default=2000)
+    parser.add_argument("--cold", type=int, default=100)
+    parser.add_argument("--dir", help="directorul fișierelor temporare (implicit cel al sistemului)")
+    args = parser.parse_args(argv)
+
+    with tempfile.TemporaryDirectory(dir=args.dir) as tmp:
+        db.DB_PATH = os.path.join(tmp, "bench.db")
+        db.ensure_schema()
+        for table, n in (("citizens", args.rows), ("vehicles", args.rows // 2)):
+            report = loader.load_records(loader.generate(table, n), table)
+            print(f"📥 {report['loaded']:,} {table} importate în baza principală în {report['seconds']:.1f}s")
+
+        rng = random.Random(0)
+        cnps = [loader.synthetic_cnp(rng.randrange(args.rows)) for _ in range(args.lookups)]
+        vins = [loader.synthetic_vin(rng.randrange(max(args.rows // 2, 1))) for _ in range(args.lookups)]
+        evicts = _evict(db.DB_PATH)
+        print(f"   lookups: {args.lookups} la cald, {args.cold} la rece "
+              f"({'posix_fadvise' if evicts else 'fără evacuare din cache'})\n")
+
+        results = {}
+        for layout in db.REGISTRY_LAYOUTS:
+            db.REGISTRY_SNAPSHOT_PATH = os.path.join(tmp, f"registry_{layout}.db")
+            report = loader.publish_snapshot(layout=layout)
+            path = report["path"]
+            expected = db.get_citizen(cnps[0])
+            results[layout] = {
+                "publicare (s)": report["seconds"],
+                "fișier (MiB)": os.path.getsize(path) / 2 ** 20,
+                **{f"{t} (MiB)": b / 2 ** 20 for t, b in _table_bytes(path).items() if t in db.REGISTRY_TABLES},
+                "get_citizen la rece (µs)": _cold(db.get_citizen, cnps[:args.cold], path),
+                "get_vehicle la rece (µs)": _cold(db.get_vehicle, vins[:args.cold], path),
+                "get_citizen la cald (µs)": _micros(db.get_citizen, cnps),
+                "get_vehicle la cald (µs)": _micros(db.get_vehicle, vins),
+                "get_citizens(500) la cald (ms)": _micros(db.get_citizens, [cnps[i:i + 500] for i in
+                                                                             range(0, len(cnps), 500)]) / 1000,
+            }
+            assert expected is not None and db.get_citizen(cnps[0]) == expected
+            db.close_connection()
+
+    width = max(map(len, next(iter(results.values()))))
+    print(f"{'':{width}}  {'text':>12}  {'compact':>12}")
+    for label in results["text"]:
+        text, compact = results["text"][label], results["compact"].get(label, float("nan"))
+        print(f"{label:{width}}  {text:12.2f}  {compact:12.2f}   ×{compact / text:.2f}")
+
+
+if __name__ == "__main__":
+    main()
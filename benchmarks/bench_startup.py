@@ -0,0 +1,82 @@
+# benchmarks/bench_startup.py — Timpul de pornire al serverului MCP și al aplicației
+#
+#   python benchmarks/bench_startup.py [--runs 15]
+#
+# Fiecare măsurătoare rulează într-un proces Python nou (exact ce plătește un
+# copil stdio al serverului MCP), pe o bază temporară deja la zi. Rândurile
+# „init_db + seed_db” rulează la pornire init_db și seed_db de azi, adică
+# lucrul pe care importul src.database îl făcea înainte, nu codul vechi ca
+# atare; cele „ensure_schema” rulează calea actuală.
+"""Timpul de pornire al serverului MCP și al aplicației: init_db + seed_db vs. ensure_schema."""
+import os
+import sys
+import argparse
+import statistics
+import subprocess
+import tempfile
+
+ROOT = os.path.join(os.path.dirname(__file__), "..")
+sys.path.insert(0, ROOT)
+
+from src import database as db
+
+# Rândurile server / aplicație includ importurile; cele de bootstrap doar apelul.
+_TIMED = ("import time, sys; sys.path.insert(0, {root!r}); t = time.perf_counter()\n"
+          "{setup}\n"
+          "from src import database as db; db.DB_PATH = {path!r}\n"
+          "{restart}{body}\n"
+          "print((time.perf_counter() - t) * 1000)")
+
+# Aceleași importuri, aceeași bază deja la zi; diferă doar pregătirea schemei:
+# init_db + seed_db la fiecare proces nou (ce făcea importul src.database
+# înainte de ensure_schema) sau ensure_schema.
+_EAGER, _LAZY = "db.init_db(); db.seed_db()", "db.ensure_schema()"
+CASES = {
+    "bootstrap (init_db + seed_db)": ("", _EAGER),
+    "bootstrap (ensure_schema)": ("", _LAZY),
+    "server: import + verify_cnp (init_db + seed_db)": (
+        "import asyncio; from src import mcp_server",
+        f"{_EAGER}; asyncio.run(mcp_server.verify_cnp('1900101123457'))",
+    ),
+    "server: import + verify_cnp (ensure_schema)": (
+        "import asyncio; from src import mcp_server",
+        f"{_LAZY}; asyncio.run(mcp_server.verify_cnp('1900101123457'))",
+    ),
+    "aplicație: importuri + SERVICES (init_db + seed_db)": (
+        "import src.agent, src.vault_agent; from src.services import SERVICES",
+        f"{_EAGER}; len(SERVICES)",
+    ),
+    "aplicație: importuri + SERVICES (ensure_schema)": (
+        "import src.agent, src.vault_agent; from src.services import SERVICES",
+        f"{_LAZY}; len(SERVICES)",
+    ),
+}
+
+
+def _run(code: str) -> float:
+    out = subprocess.run([sys.executable, "-c", code], capture_output=True, text=True, check=True)
+    return float(out.stdout.strip().splitlines()[-1])
+
+
+def main(argv=None) -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--runs", type=int, default=15)
+    args = parser.parse_args(argv)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "startup.db")
+        db.DB_PATH = path
+        db.ensure_schema()
+        db.close_connection()
+
+        print(f"⏱️ mediana a {args.runs} procese noi, schema v{db.SCHEMA_VERSION}\n")
+        for label, (setup, body) in CASES.items():
+            restart = "" if setup else "t = time.perf_counter(); "
+            code = _TIMED.format(root=os.path.abspath(ROOT), setup=setup, path=path,
+                                 restart=restart, body=body)
+            times = [_run(code) for _ in range(args.runs)]
+            print(f"   {label:52s} {statistics.median(times):8.2f} ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,95 @@
+# benchmarks/bench_vault_indexes.py — Indecșii de căutare din seif, pe 100k documente
+#
+#   python benchmarks/bench_vault_indexes.py [--docs 100000]
+#
+# Construiește o bază temporară (baza aplicației nu este atinsă), o populează
+# cu documente din N/100 foldere și compară planul de execuție și timpul
+# mediu al interogărilor de pe calea fierbinte, cu și fără indecși.
+"""Compară planul și timpul interogărilor din seif, cu și fără indecși."""
+import os
+import sys
+import time
+import argparse
+import tempfile
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+from src import database as db
+
+QUERIES = {
+    "is_folder_scanned": (
+        "SELECT COUNT(*) FROM vault_documents WHERE owner = ? AND folder = ?",
+        (db.DEFAULT_OWNER, "/scan/folder_0042"),
+    ),
+    "is_file_in_vault": (
+        "SELECT COUNT(*) FROM vault_documents WHERE owner = ? AND name = ?",
+        (db.DEFAULT_OWNER, "doc_0004242.pdf"),
+    ),
+    "get_required_documents": (
+        "SELECT document_name FROM required_documents WHERE service_key = ? ORDER BY doc_order",
+        ("identity_card",),
+    ),
+    "service_fields": (
+        "SELECT field_key, field_label FROM service_fields WHERE service_key = ? ORDER BY field_order",
+        ("identity_card",),
+    ),
+}
+INDEXES = ("idx_vault_documents_owner_folder", "idx_vault_documents_owner_name",
+           "idx_required_documents_service", "idx_service_fields_service")
+
+
+def _populate(n_docs: int) -> None:
+    db.save_vault_scan({}, (
+        {"name": f"doc_{i:07d}.pdf", "rel": f"folder_{i % (n_docs // 100 or 1):04d}/doc_{i:07d}.pdf",
+         "type": "id_card", "fields": {"CNP": "1900101123457"}, "count": 1, "source": "folder",
+         "folder": f"/scan/folder_{i % (n_docs // 100 or 1):04d}"}
+        for i in range(n_docs)
+    ), batch_size=5000)
+
+
+def _measure(conn, repeat: int) -> dict:
+    results = {}
+    for label, (sql, params) in QUERIES.items():
+        plan = " | ".join(r[3] for r in conn.execute("EXPLAIN QUERY PLAN " + sql, params))
+        start = time.perf_counter()
+        for _ in range(repeat):
+            conn.execute(sql, params).fetchall()
+        results[label] = (plan, (time.perf_counter() - start) / repeat * 1e6)
+    return results
+
+
+def main(argv=None) -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--docs", type=int, default=100_000)
+    parser.add_argument("--repeat", type=int, default=200)
+    args = parser.parse_args(argv)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        db.DB_PATH = os.path.join(tmp, "bench.db")
+        db.init_db()
+        db.seed_db()
+        start = time.perf_counter()
+        _populate(args.docs)
+        print(f"📦 {args.docs} documente inserate în {time.perf_counter() - start:.2f}s "
+              f"(schema v{db.migrate(db.get_connection())})\n")
+
+        conn = db.get_connection()
+        conn.execute("ANALYZE")
+        with_idx = _measure(conn, args.repeat)
+        for name in INDEXES:
+            conn.execute(f"DROP INDEX {name}")
+        conn.commit()
+        db.close_connection()          # conexiune nouă: fără planuri preparate pe schema veche
+        without = _measure(db.get_connection(), max(1, args.repeat // 20))
+        db.close_connection()
+
+    for label in QUERIES:
+        plan_idx, t_idx = with_idx[label]
+        plan_no, t_no = without[label]
+        print(f"▶ {label}")
+        print(f"   cu indecși   {t_idx:10.1f} µs   {plan_idx}")
+        print(f"   fără indecși {t_no:10.1f} µs   {plan_no}")
+
+
+if __name__ == "__main__":
+    main()
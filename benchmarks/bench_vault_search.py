@@ -0,0 +1,72 @@
+# benchmarks/bench_vault_search.py — Căutarea full-text (FTS5) în seif, pe 100k documente
+#
+#   python benchmarks/bench_vault_search.py [--docs 100000]
+#
+# Construiește o bază temporară (baza aplicației nu este atinsă), o populează
+# cu documente sintetice (nume, CNP, adresă, date de emitere) și măsoară
+# timpul mediu al search_vault pentru interogări selective și comune.
+"""Măsoară timpul mediu al search_vault pe un seif sintetic."""
+import os
+import sys
+import time
+import random
+import argparse
+import tempfile
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+from src import database as db
+
+QUERIES = (
+    "scan_0042420.pdf",             # un singur document, după numele fișierului
+    "Teiului 17",                   # adresa veche: două cuvinte din același câmp
+    "Popescu Cluj pasaport",        # câmpuri diferite ale aceluiași document
+    "certificat de nastere",        # fără diacritice; găsește și catalogul de documente
+    "Str",                          # termen prezent în toate documentele (cazul cel mai rău)
+)
+_STREETS = ("Lainici", "Victoriei", "Unirii", "Mihai Viteazu", "Florilor", "Teiului", "Libertății")
+_CITIES = ("București", "Cluj-Napoca", "Iași", "Brașov", "Timișoara")
+_TYPES = ("id_card", "passport", "utility_bill", "property_deed", "birth_certificate")
+
+
+def _documents(n_docs: int):
+    rng = random.Random(0)
+    for i in range(n_docs):
+        yield {"name": f"scan_{i:07d}.pdf", "rel": f"folder_{i % 1000:04d}/scan_{i:07d}.pdf",
+               "type": rng.choice(_TYPES), "count": 5, "source": "folder",
+               "folder": f"/scan/folder_{i % 1000:04d}",
+               "fields": {"LastName": rng.choice(("Popescu", "Ionescu", "Stan", "Rusu")),
+                          "CNP": str(1900101000000 + i),
+                          "Address": f"Str. {rng.choice(_STREETS)} {rng.randint(1, 200)}, {rng.choice(_CITIES)}",
+                          "IssueDate": f"{rng.randint(1, 28):02d}.{rng.randint(1, 12):02d}.{rng.randint(1990, 2024)}",
+                          "Number": str(rng.randint(100000, 999999))}}
+
+
+def main(argv=None) -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--docs", type=int, default=100_000)
+    parser.add_argument("--repeat", type=int, default=20)
+    args = parser.parse_args(argv)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        db.DB_PATH = os.path.join(tmp, "bench.db")
+        db.ensure_schema()
+        start = time.perf_counter()
+        db.save_vault_scan({}, _documents(args.docs), batch_size=5000)
+        print(f"📦 {args.docs} documente inserate (cu indexul full-text) în "
+              f"{time.perf_counter() - start:.2f}s\n")
+
+        for query in QUERIES:
+            result = db.search_vault(query)
+            start = time.perf_counter()
+            for _ in range(args.repeat):
+                db.search_vault(query)
+            elapsed = (time.perf_counter() - start) / args.repeat * 1000
+            top = result["documents"][0]["name"] if result["documents"] else "—"
+            print(f"▶ {query!r:28s} {elapsed:8.2f} ms   {len(result['documents']):2d} documente "
+                  f"(primul: {top}), {len(result['required_documents'])} din catalog")
+        db.close_connection()
+
+
+if __name__ == "__main__":
+    main()
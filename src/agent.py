@@ -17,52 +17,265 @@
 
 import os
 import json
+import time
 import asyncio
+import hashlib
+import threading
+import concurrent.futures
 from typing import Optional
 from openai import OpenAI
 from dotenv import load_dotenv
-from mcp import ClientSession, StdioServerParameters
-from mcp.client.stdio import stdio_client
+from src.mcp_pool import get_pool
+from src.mcp_cache import ResultCache, RESULT_CACHE, cache_key
+from src.mcp_resilience import (
+    Deadline, MCPUnavailable, STATS, IDEMPOTENT_TOOLS, HEDGE_AFTER_S, TURN_BUDGET_S,
+    DEFAULT_TOOL_TIMEOUT_S, breaker_for, tool_timeout,
+)
 
 load_dotenv()
 
 THINK_MODEL = "gpt-4o-mini"
 MCP_SERVER_PATH = os.path.join(os.path.dirname(__file__), "mcp_server.py")
+# Cât timp e considerată proaspătă lista de unelte descoperită din MCP.
+DISCOVERY_TTL_S = float(os.getenv("MCP_DISCOVERY_TTL", "300"))
 
 
 # ─── Client MCP de bază ───────────────────────────────────────────────────────
 
 class MCPClient:
-    """Client MCP async generic. Se conectează, apelează o unealtă, întoarce rezultatul."""
+    """Client MCP generic. Apelurile rulează pe sesiunile calde ale pool-ului
+    partajat (vezi src/mcp_pool.py), nu mai pornesc câte un server nou.
+
+    Fiecare apel are un termen (per unealtă, plafonat de `deadline`) și trece
+    prin circuit breaker-ul serverului. Dacă serverul nu răspunde, `call` /
+    `submit` evaluează unealta local, determinist (aceleași funcții din
+    src/mcp_server.py), în loc să întoarcă o eroare pe care avalul ar citi-o
+    drept „CNP invalid".
+    """
+
+    def __init__(self, server_script: str = MCP_SERVER_PATH, transport: Optional[str] = None,
+                 cache: Optional[ResultCache] = RESULT_CACHE, url: Optional[str] = None,
+                 hedge_after: Optional[float] = HEDGE_AFTER_S):
+        # transport: "stdio" | "inprocess" | "http" | "sse"; implicit din MCP_TRANSPORT.
+        # url: adresa daemonului partajat (http / sse); implicit din MCP_SERVER_URL.
+        self.pool = get_pool(server_script, transport, url=url)
+        self.breaker = breaker_for(self.pool)
+        # Cache de rezultate pentru uneltele deterministe (None = dezactivat).
+        self.cache = cache
+        # Secunde până la cererea „hedged" pentru uneltele idempotente (None = dezactivat).
+        self.hedge_after = hedge_after
+
+    @property
+    def healthy(self) -> bool:
+        return self.breaker.healthy
+
+    async def _invoke(self, tool_name: str, arguments: dict) -> str:
+        result = await self.pool.call_tool(tool_name, arguments)
+        return result.content[0].text
+
+    async def _hedged(self, tool_name: str, arguments: dict) -> str:
+        """Dacă primul răspuns întârzie peste `hedge_after`, trimite a doua cerere
+        (pe alt worker, prin rutare) și întoarce primul răspuns reușit."""
+        tasks = [asyncio.ensure_future(self._invoke(tool_name, arguments))]
+        try:
+            done, _ = await asyncio.wait(tasks, timeout=self.hedge_after)
+            if done:
+                return tasks[0].result()
+            STATS.incr("hedges")
+            tasks.append(asyncio.ensure_future(self._invoke(tool_name, arguments)))
+            pending, error = set(tasks), None
+            while pending:
+                done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                for task in done:
+                    if task.exception() is None:
+                        if task is tasks[1]:
+                            STATS.incr("hedge_wins")
+                        return task.result()
+                    error = task.exception()
+            raise error
+        finally:
+            for task in tasks:
+                task.cancel()
+
+    async def _call(self, tool_name: str, arguments: dict, deadline: Optional[Deadline] = None) -> str:
+        use_cache = self.cache is not None and self.cache.cacheable(tool_name)
+        if use_cache:
+            # Versiunile tabelelor se citesc pe executorul bazei, nu pe bucla de evenimente.
+            versions = dict(await self.cache.aversions())
+            cached = self.cache.get(tool_name, arguments, versions)
+            if cached is not None:
+                return cached
+
+        timeout = tool_timeout(tool_name)
+        if deadline is not None:
+            timeout = min(timeout, deadline.remaining())
+            if timeout <= 0:
+                STATS.incr("budget_exhausted")
+                raise MCPUnavailable("bugetul de timp al turei s-a epuizat")
+        if not self.breaker.allow():
+            STATS.incr("short_circuits")
+            raise MCPUnavailable("circuit deschis: serverul MCP este nesănătos")
+
+        hedge = self.hedge_after is not None and tool_name in IDEMPOTENT_TOOLS
+        try:
+            text = await asyncio.wait_for(
+                self._hedged(tool_name, arguments) if hedge else self._invoke(tool_name, arguments),
+                timeout,
+            )
+        except asyncio.CancelledError:
+            # Anulat (ex. apel speculativ nefolosit): fără verdict, dar proba se eliberează.
+            self.breaker.release_probe()
+            raise
+        except asyncio.TimeoutError:
+            STATS.incr("timeouts")
+            self.breaker.record_failure()
+            raise MCPUnavailable(f"{tool_name} nu a răspuns în {timeout:.1f}s")
+        except Exception as e:
+            STATS.incr("failures")
+            self.breaker.record_failure()
+            raise MCPUnavailable(f"MCP connection failed: {e}") from e
+        self.breaker.record_success()
 
-    def __init__(self, server_script: str = MCP_SERVER_PATH):
-        self.server_params = StdioServerParameters(command="python", args=[server_script])
+        if use_cache:
+            self.cache.put(tool_name, arguments, text, versions)
+        return text
 
-    async def _call(self, tool_name: str, arguments: dict) -> str:
-        async with stdio_client(self.server_params) as (read, write):
-            async with ClientSession(read, write) as session:
-                await session.initialize()
-                result = await session.call_tool(tool_name, arguments=arguments)
-                return result.content[0].text
+    @staticmethod
+    async def _local_call(tool_name: str, arguments: dict) -> str:
+        """Calea deterministă locală: aceeași unealtă, apelată direct, fără transport.
+
+        Trece prin registrul de unelte al serverului (numele vine de la model):
+        un nume care nu e unealtă MCP ridică ToolError, nu atinge alt atribut al modulului.
+        """
+        from src import mcp_server
+        result = await mcp_server.mcp.call_tool(tool_name, arguments)
+        content = result[0] if isinstance(result, tuple) else result
+        return content[0].text
 
-    def call(self, tool_name: str, arguments: dict) -> str:
+    async def _call_safe(self, tool_name: str, arguments: dict, deadline: Optional[Deadline] = None) -> str:
         try:
-            return asyncio.run(self._call(tool_name, arguments))
-        except Exception as e:
-            return json.dumps({"error": f"MCP connection failed: {e}"})
+            return await self._call(tool_name, arguments, deadline)
+        except MCPUnavailable as e:
+            # Fără buget rămas nu se mai face nici evaluarea locală.
+            if deadline is not None and deadline.expired:
+                return json.dumps({"error": str(e), "unavailable": True})
+            print(f"⚠️ [MCPClient] {e}; evaluez {tool_name} local.")
+            try:
+                local = self._local_call(tool_name, arguments)
+                text = await (asyncio.wait_for(local, deadline.remaining()) if deadline is not None else local)
+                STATS.incr("fallbacks")
+                return text
+            except Exception as local_error:
+                return json.dumps({"error": f"{e} ({local_error or type(local_error).__name__})",
+                                   "unavailable": True})
+
+    def call(self, tool_name: str, arguments: dict, deadline: Optional[Deadline] = None) -> str:
+        return self.pool.run(self._call_safe(tool_name, arguments, deadline))
+
+    def submit(self, tool_name: str, arguments: dict,
+               deadline: Optional[Deadline] = None) -> concurrent.futures.Future:
+        """Pornește apelul pe bucla de fundal fără să-l aștepte (rezultat: JSON text)."""
+        return self.pool.submit(self._call_safe(tool_name, arguments, deadline))
 
     async def _list_tools(self):
-        async with stdio_client(self.server_params) as (read, write):
-            async with ClientSession(read, write) as session:
-                await session.initialize()
-                return await session.list_tools()
+        if not self.breaker.allow():
+            STATS.incr("short_circuits")
+            raise MCPUnavailable("circuit deschis: serverul MCP este nesănătos")
+        try:
+            listing = await asyncio.wait_for(self.pool.list_tools(), DEFAULT_TOOL_TIMEOUT_S)
+        except Exception:
+            self.breaker.record_failure()
+            raise
+        self.breaker.record_success()
+        return listing
 
     def list_tools(self):
         try:
-            return asyncio.run(self._list_tools())
+            return self.pool.run(self._list_tools())
         except Exception:
             return []
 
+    def stats(self) -> dict:
+        """Contoarele clientului: pool, breaker, reziliență și cache."""
+        return {
+            "pool": self.pool.stats(),
+            "breaker": self.breaker.state,
+            "resilience": STATS.snapshot(),
+            "cache": self.cache.stats() if self.cache is not None else None,
+        }
+
+
+# ─── Cache pentru descoperirea uneltelor ──────────────────────────────────────
+
+class ToolDiscoveryCache:
+    """Ține lista de unelte MCP deja convertită în formatul de tools OpenAI.
+
+    Lista e revalidată doar după expirarea TTL-ului sau când serverul anunță
+    `tools/list_changed`. La revalidare, amprenta (hash pe nume + inputSchema)
+    decide dacă lista trebuie reconstruită; dacă serverul nu răspunde, rămâne
+    în uz ultima listă bună.
+    """
+
+    def __init__(self, ttl: float = DISCOVERY_TTL_S):
+        self.ttl = ttl
+        self.version = 0            # crește la fiecare schimbare reală a setului de unelte
+        self._tools: Optional[list] = None
+        self._fingerprint: Optional[str] = None
+        self._fetched_at = 0.0
+        self._lock = threading.Lock()
+        self._watched: set = set()
+
+    @staticmethod
+    def fingerprint(mcp_tools) -> str:
+        h = hashlib.sha256()
+        for t in sorted(mcp_tools, key=lambda t: t.name):
+            h.update(t.name.encode())
+            h.update(json.dumps(t.inputSchema or {}, sort_keys=True).encode())
+        return h.hexdigest()
+
+    @staticmethod
+    def to_openai(mcp_tools) -> list:
+        return [{
+            "type": "function",
+            "function": {
+                "name": t.name,
+                "description": (t.description or "").strip(),
+                "parameters": t.inputSchema or {"type": "object", "properties": {}},
+            },
+        } for t in mcp_tools]
+
+    def invalidate(self) -> None:
+        """Forțează revalidarea la următoarea cerere (lista veche rămâne de rezervă)."""
+        self._fetched_at = 0.0
+
+    def get(self, mcp: "MCPClient") -> Optional[list]:
+        """Lista de unelte OpenAI, sau None dacă nu a putut fi descoperită niciodată."""
+        pool = getattr(mcp, "pool", None)
+        if pool is not None and id(pool) not in self._watched:
+            pool.on_tools_changed(self.invalidate)
+            self._watched.add(id(pool))
+
+        if self._tools is not None and time.monotonic() - self._fetched_at < self.ttl:
+            return self._tools
+
+        mcp_tools = getattr(mcp.list_tools(), "tools", [])
+        with self._lock:
+            if mcp_tools:
+                fp = self.fingerprint(mcp_tools)
+                if fp != self._fingerprint:
+                    self._tools = self.to_openai(mcp_tools)
+                    self._fingerprint = fp
+                    self.version += 1
+                self._fetched_at = time.monotonic()
+            return self._tools
+
+    def names(self, mcp: "MCPClient") -> list:
+        return [t["function"]["name"] for t in self.get(mcp) or []]
+
+
+# O singură instanță per proces: toate sesiunile Streamlit văd același server.
+TOOL_CACHE = ToolDiscoveryCache()
+
 
 # ─── Instrumente specializate (clienți MCP, pentru calea deterministă / fallback) ───────
 
@@ -72,9 +285,9 @@ class ValidationTool:
     def __init__(self):
         self.mcp = MCPClient()
 
-    def run(self, cnp: str) -> dict:
+    def run(self, cnp: str, deadline: Optional[Deadline] = None) -> dict:
         print(f"🔍 [ValidationTool] Verific CNP: {cnp}")
-        return json.loads(self.mcp.call("verify_cnp", {"cnp": cnp}))
+        return json.loads(self.mcp.call("verify_cnp", {"cnp": cnp}, deadline))
 
 
 class VehicleTool:
@@ -83,9 +296,9 @@ class VehicleTool:
     def __init__(self):
         self.mcp = MCPClient()
 
-    def run(self, vin: str) -> dict:
+    def run(self, vin: str, deadline: Optional[Deadline] = None) -> dict:
         print(f"🚗 [VehicleTool] Verific VIN: {vin}")
-        return json.loads(self.mcp.call("check_vehicle_status", {"vin": vin}))
+        return json.loads(self.mcp.call("check_vehicle_status", {"vin": vin}, deadline))
 
 
 class DocumentTool:
@@ -94,9 +307,9 @@ class DocumentTool:
     def __init__(self):
         self.mcp = MCPClient()
 
-    def run(self, service_type: str) -> dict:
+    def run(self, service_type: str, deadline: Optional[Deadline] = None) -> dict:
         print(f"📋 [DocumentTool] Documente pentru: {service_type}")
-        return json.loads(self.mcp.call("check_required_documents", {"service_type": service_type}))
+        return json.loads(self.mcp.call("check_required_documents", {"service_type": service_type}, deadline))
 
 
 class AppointmentTool:
@@ -133,6 +346,7 @@ class Orchestrator:
 
     def __init__(self):
         self.mcp = MCPClient()
+        self.tool_cache = TOOL_CACHE
         # Instrumentele sunt folosite de calea deterministă (fallback).
         self.validation_tool = ValidationTool()
         self.vehicle_tool = VehicleTool()
@@ -141,30 +355,49 @@ class Orchestrator:
         self._trace: list = []
 
     # ── Punct de intrare: încearcă agentic, cade pe determinist ──────────────
-    def dispatch(self, extracted: dict, service_key: str, client: Optional[OpenAI] = None) -> dict:
+    def dispatch(self, extracted: dict, service_key: str, client: Optional[OpenAI] = None,
+                 deadline: Optional[Deadline] = None) -> dict:
         """
         Întoarce un dict de îmbogățiri (enrichments) cu chei canonice consumate
         de restul aplicației: cnp_validation, block_cnp, cnp_error, vin_check,
         block_vin, documents, docs_fetched (+ opțional appointments, timing).
         Cheia `tool_trace` conține urma apelurilor de instrumente, pentru jurnal.
+        `deadline` este bugetul rămas al turei; fiecare apel MCP îl respectă.
         """
         self._trace = []        # repornim urma la fiecare cerere
-        if client is not None:
-            try:
-                enrichments = self._dispatch_agentic(extracted, service_key, client)
-                enrichments["tool_trace"] = self._trace
-                return enrichments
-            except Exception as e:
-                print(f"⚠️ [Orchestrator] Calea agentică a eșuat ({e}); fallback determinist.")
-                self._trace = []  # urma parțială nu mai e relevantă pe calea de rezervă
-        enrichments = self._dispatch_deterministic(extracted, service_key)
-        enrichments["tool_trace"] = self._trace
-        return enrichments
+        # Apelurile pornite speculativ de calea agentică; dacă ea eșuează, calea
+        # deterministă le preia rezultatele în loc să le retrimită.
+        in_flight: dict = {}
+        try:
+            if client is not None and not self.mcp.healthy:
+                print("⚠️ [Orchestrator] Circuit MCP deschis; trec direct pe calea deterministă.")
+            elif client is not None:
+                try:
+                    enrichments = self._dispatch_agentic(extracted, service_key, client, deadline, in_flight)
+                    enrichments["tool_trace"] = self._trace
+                    return enrichments
+                except Exception as e:
+                    print(f"⚠️ [Orchestrator] Calea agentică a eșuat ({e}); fallback determinist.")
+                    self._trace = []  # urma parțială nu mai e relevantă pe calea de rezervă
+            enrichments = self._dispatch_deterministic(extracted, service_key, deadline, in_flight)
+            enrichments["tool_trace"] = self._trace
+            return enrichments
+        finally:
+            for future in in_flight.values():
+                future.cancel()             # nefolosite: nu mai ocupă serverul MCP
 
     # ── Calea AGENTICĂ: modelul alege uneltele ───────────────────────────────
-    def _dispatch_agentic(self, extracted: dict, service_key: str, client: OpenAI) -> dict:
+    def _dispatch_agentic(self, extracted: dict, service_key: str, client: OpenAI,
+                          deadline: Optional[Deadline] = None, in_flight: Optional[dict] = None) -> dict:
         tools = self._discover_tools()
 
+        # Verificările garantate (CNP, VIN, documente) depind doar de `extracted` și
+        # `service_key`, nu de alegerile modelului: le pornim speculativ, în paralel
+        # cu completarea LLM, iar alegerile identice ale modelului le refolosesc.
+        in_flight = {} if in_flight is None else in_flight
+        for name, args in self._safety_calls(extracted, service_key, {}):
+            self._submit(in_flight, name, args, deadline)
+
         sys_prompt = (
             "Ești creierul de orchestrare al unui agent pentru servicii publice. "
             "Pe baza datelor extrase de la cetățean, decide ce unelte de registru/verificare "
@@ -186,6 +419,7 @@ class Orchestrator:
             tools=tools,
             tool_choice="auto",
             temperature=0,
+            **({"timeout": deadline.remaining()} if deadline is not None else {}),
         )
 
         enrichments: dict = {}
@@ -193,44 +427,64 @@ class Orchestrator:
         print(f"🧠 [Orchestrator] Modelul a ales {len(tool_calls)} unelte: "
               f"{[tc.function.name for tc in tool_calls]}")
 
+        calls = []
         for tc in tool_calls:
             if tc.type != "function":
                 continue  # ignoră tool-call-uri custom; folosim doar function calls
-            name = tc.function.name
             try:
                 args = json.loads(tc.function.arguments or "{}")
             except json.JSONDecodeError:
                 args = {}
-            raw = self.mcp.call(name, args)            # execuție REALĂ prin MCP
-            result = json.loads(raw)
-            self._record(name, result, source="model")  # instrument ales de model
-            self._fold(name, result, enrichments)
+            calls.append((tc.function.name, args))
+
+        # Execuție REALĂ prin MCP, concurentă; rezultatele sunt pliate în ordinea
+        # aleasă de model, deci `enrichments` rămâne determinist.
+        self._collect(calls, in_flight, enrichments, source="model", deadline=deadline)
 
         # Strat determinist de siguranță: garantează verificările critice.
-        self._safety_sweep(extracted, service_key, enrichments)
+        self._safety_sweep(extracted, service_key, enrichments, deadline, in_flight)
         return enrichments
 
-    def _safety_sweep(self, extracted: dict, service_key: str, enrichments: dict) -> None:
+    def _safety_sweep(self, extracted: dict, service_key: str, enrichments: dict,
+                      deadline: Optional[Deadline] = None, in_flight: Optional[dict] = None) -> None:
         """Indiferent ce a decis modelul, CNP/VIN/documente trebuie verificate."""
+        self._collect(self._safety_calls(extracted, service_key, enrichments),
+                      {} if in_flight is None else in_flight,
+                      enrichments, source="safety", deadline=deadline)
+
+    @staticmethod
+    def _safety_calls(extracted: dict, service_key: str, enrichments: dict) -> list:
+        """Verificările critice încă neacoperite de `enrichments`, ca [(unealtă, argumente)]."""
+        calls = []
         cnp_key = next((k for k in extracted if "CNP" in k.upper()), None)
         if cnp_key and "cnp_validation" not in enrichments:
-            raw = self.mcp.call("verify_cnp", {"cnp": extracted[cnp_key]})
-            result = json.loads(raw)
-            self._record("verify_cnp", result, source="safety")
-            self._fold("verify_cnp", result, enrichments)
+            calls.append(("verify_cnp", {"cnp": extracted[cnp_key]}))
 
         vin_key = next((k for k in extracted if k.upper() == "VIN"), None)
         if vin_key and "vin_check" not in enrichments:
-            raw = self.mcp.call("check_vehicle_status", {"vin": extracted[vin_key]})
-            result = json.loads(raw)
-            self._record("check_vehicle_status", result, source="safety")
-            self._fold("check_vehicle_status", result, enrichments)
+            calls.append(("check_vehicle_status", {"vin": extracted[vin_key]}))
 
         if not enrichments.get("docs_fetched"):
-            raw = self.mcp.call("check_required_documents", {"service_type": service_key})
-            result = json.loads(raw)
-            self._record("check_required_documents", result, source="safety")
-            self._fold("check_required_documents", result, enrichments)
+            calls.append(("check_required_documents", {"service_type": service_key}))
+        return calls
+
+    def _submit(self, in_flight: dict, tool_name: str, arguments: dict,
+                deadline: Optional[Deadline] = None) -> concurrent.futures.Future:
+        """Pornește apelul, sau refolosește unul identic deja în curs (aceeași cheie)."""
+        key = cache_key(tool_name, arguments)
+        future = in_flight.get(key)
+        if future is None:
+            future = in_flight[key] = self.mcp.submit(tool_name, arguments, deadline)
+        return future
+
+    def _collect(self, calls: list, in_flight: dict, enrichments: dict, source: str,
+                 deadline: Optional[Deadline] = None) -> None:
+        """Rulează concurent apelurile și le pliază în `enrichments`, în ordinea listei."""
+        futures = [self._submit(in_flight, name, args, deadline) for name, args in calls]
+        for (name, _), future in zip(calls, futures):
+            result = json.loads(future.result())
+            self._record(name, result, source=source)
+            self._fold(name, result, enrichments)
 
     def _record(self, tool_name: str, result: dict, source: str) -> None:
         """Adaugă un apel de instrument în urma de execuție, pentru jurnalul în timp real.
@@ -242,6 +496,11 @@ class Orchestrator:
 
     def _fold(self, tool_name: str, result: dict, enrichments: dict) -> None:
         """Mapează rezultatul oricărei unelte în cheile canonice citite în aval."""
+        if result.get("unavailable"):
+            # Registrul nu a putut fi consultat deloc: nu e un verdict despre date,
+            # deci nu blocăm nimic; app.py vede doar lipsa cheii de validare.
+            enrichments.setdefault("unavailable_tools", []).append(tool_name)
+            return
         if tool_name == "verify_cnp":
             enrichments["cnp_validation"] = result
             if not result.get("valid"):
@@ -261,19 +520,9 @@ class Orchestrator:
 
     # ── Descoperire dinamică a uneltelor din serverul MCP ─────────────────────
     def _discover_tools(self) -> list:
-        """Convertește uneltele MCP în formatul de tools OpenAI. Cade pe schema statică."""
+        """Uneltele MCP în formatul de tools OpenAI, din cache. Cade pe schema statică."""
         try:
-            listing = self.mcp.list_tools()
-            tools = []
-            for t in getattr(listing, "tools", []):
-                tools.append({
-                    "type": "function",
-                    "function": {
-                        "name": t.name,
-                        "description": (t.description or "").strip(),
-                        "parameters": t.inputSchema or {"type": "object", "properties": {}},
-                    },
-                })
+            tools = self.tool_cache.get(self.mcp)
             if tools:
                 return tools
         except Exception as e:
@@ -306,31 +555,37 @@ class Orchestrator:
     ]
 
     # ── Calea DETERMINISTĂ ─────────────────────
-    def _dispatch_deterministic(self, extracted: dict, service_key: str) -> dict:
+    def _dispatch_deterministic(self, extracted: dict, service_key: str,
+                                deadline: Optional[Deadline] = None, in_flight: Optional[dict] = None) -> dict:
         enrichments: dict = {}
+        in_flight = {} if in_flight is None else in_flight
+
+        def run(tool_name: str, arguments: dict, tool_run) -> None:
+            # Un apel identic pornit speculativ de calea agentică e așteptat, nu retrimis;
+            # doar dacă acela a eșuat, instrumentul îl repetă.
+            future = in_flight.pop(cache_key(tool_name, arguments), None)
+            try:
+                result = json.loads(future.result()) if future is not None else None
+            except Exception:
+                result = None
+            if result is None:
+                result = tool_run()
+            self._record(tool_name, result, source="fallback")
+            self._fold(tool_name, result, enrichments)
 
         cnp_key = next((k for k in extracted if k.upper() == "CNP" or "CNP" in k.upper()), None)
         if cnp_key:
-            val_result = self.validation_tool.run(extracted[cnp_key])
-            self._record("verify_cnp", val_result, source="fallback")
-            enrichments["cnp_validation"] = val_result
-            if not val_result.get("valid"):
-                enrichments["block_cnp"] = True
-                enrichments["cnp_error"] = val_result.get("error", "Invalid CNP")
+            cnp = extracted[cnp_key]
+            run("verify_cnp", {"cnp": cnp}, lambda: self.validation_tool.run(cnp, deadline))
 
         vin_key = next((k for k in extracted if k.upper() == "VIN"), None)
         if vin_key:
-            vin_result = self.vehicle_tool.run(extracted[vin_key])
-            self._record("check_vehicle_status", vin_result, source="fallback")
-            enrichments["vin_check"] = vin_result
-            if vin_result.get("found") and vin_result["data"].get("status") == "Furat":
-                enrichments["block_vin"] = True
+            vin = extracted[vin_key]
+            run("check_vehicle_status", {"vin": vin}, lambda: self.vehicle_tool.run(vin, deadline))
 
         if not enrichments.get("docs_fetched"):
-            doc_result = self.document_tool.run(service_key)
-            self._record("check_required_documents", doc_result, source="fallback")
-            enrichments["documents"] = doc_result.get("required_documents", [])
-            enrichments["docs_fetched"] = True
+            run("check_required_documents", {"service_type": service_key},
+                lambda: self.document_tool.run(service_key, deadline))
 
         return enrichments
 
@@ -354,12 +609,14 @@ class UniversalAgent:
 
     def get_mcp_tools_summary(self) -> str:
         """Întoarce un rezumat al instrumentelor MCP disponibile."""
-        tools = self.mcp_client.list_tools()
-        if not tools:
+        names = self.orchestrator.tool_cache.names(self.mcp_client)
+        if not names:
             return "Instrumentele MCP nu sunt disponibile."
-        return ", ".join([t.name for t in getattr(tools, "tools", [])])
+        return ", ".join(names)
 
     def think(self, history: list, current_data: dict, service_config: dict, service_key: str = "") -> dict:
+        # Bugetul end-to-end al turei, transmis fiecărui apel MCP.
+        deadline = Deadline(TURN_BUDGET_S)
         required_fields = service_config["required_fields"]
         service_name = service_config["name"]
         missing_fields = {k: v for k, v in required_fields.items() if not current_data.get(k)}
@@ -403,6 +660,7 @@ class UniversalAgent:
                 messages=messages,
                 temperature=0.1,
                 response_format={"type": "json_object"},
+                timeout=deadline.remaining(),
             )
             parsed = json.loads(res.choices[0].message.content)
         except Exception as e:
@@ -419,7 +677,8 @@ class UniversalAgent:
         # ── Orchestrare agentică a sub-uneltelor ────────────────────────────
         enrichments = {}
         if extracted:
-            enrichments = self.orchestrator.dispatch(extracted, service_key, client=self.client)
+            enrichments = self.orchestrator.dispatch(extracted, service_key, client=self.client,
+                                                     deadline=deadline)
 
         # ── Gestionare blocaje ──────────────────────────────────────────────
         if enrichments.get("block_cnp"):
@@ -0,0 +1,62 @@
+# src/cnp.py — Validarea vectorizată a CNP-urilor (NumPy)
+#
+# verify_cnp validează un singur CNP: regex, sumă de control ponderată în
+# Python și calendar.monthrange. Pentru extrase de registru și dosare cu sute
+# de identificatori, validate_cnps face aceleași verificări, în aceeași ordine,
+# pe o matrice (n, 13) de cifre: un produs matrice-vector pentru suma de
+# control și o tabelă de zile pe lună (cu ani bisecți) pentru data nașterii.
+
+import re
+
+import numpy as np
+
+CNP_WEIGHTS = np.array([2, 7, 9, 1, 4, 6, 3, 5, 8, 2, 7, 9], dtype=np.int64)
+_CNP_RE = re.compile(r"^\d{13}$")
+
+# Secolul nașterii după prima cifră (0 și 9 sunt respinse înainte de a conta).
+_CENTURY = np.array([0, 1900, 1900, 1800, 1800, 2000, 2000, 1900, 1900, 0], dtype=np.int64)
+_DAYS_IN_MONTH = np.array([0, 31, 28, 31, 30, 31, 30, 31, 31, 30, 31, 30, 31], dtype=np.int64)
+
+# Coduri de rezultat, în ordinea în care verify_cnp aplică verificările.
+CNP_OK, BAD_FORMAT, BAD_CHECKSUM, BAD_GENDER, BAD_MONTH, BAD_DAY = range(6)
+
+
+def _ascii_digits(cnp: str) -> str:
+    # `\d` acceptă și cifre Unicode (ex. arabe); int() le convertește la fel ca verify_cnp.
+    return cnp if cnp.isascii() else "".join(str(int(ch)) for ch in cnp)
+
+
+def validate_cnps(cnps: list) -> tuple:
+    """Validează o listă de CNP-uri (deja curățate de spații).
+
+    Întoarce (codes, fields): codes[i] e unul dintre CNP_OK / BAD_*, iar
+    fields[i] = [prima cifră, an, lună, zi], necesare mesajelor de eroare și
+    decodării CNP-urilor valide.
+    """
+    n = len(cnps)
+    codes = np.full(n, BAD_FORMAT, dtype=np.int8)
+    fields = np.zeros((n, 4), dtype=np.int64)
+    index = [i for i, cnp in enumerate(cnps) if _CNP_RE.match(cnp)]
+    if not index:
+        return codes, fields
+
+    raw = "".join(_ascii_digits(cnps[i]) for i in index).encode("ascii")
+    digits = (np.frombuffer(raw, dtype=np.uint8).reshape(-1, 13) - ord("0")).astype(np.int64)
+
+    checksum = digits[:, :12] @ CNP_WEIGHTS % 11
+    expected = np.where(checksum == 10, 1, checksum)
+    gender = digits[:, 0]
+    year = _CENTURY[gender] + digits[:, 1] * 10 + digits[:, 2]
+    month = digits[:, 3] * 10 + digits[:, 4]
+    day = digits[:, 5] * 10 + digits[:, 6]
+    leap = (year % 4 == 0) & ((year % 100 != 0) | (year % 400 == 0))
+    max_day = _DAYS_IN_MONTH[np.clip(month, 0, 12)] + ((month == 2) & leap)
+
+    codes[index] = np.select(
+        [expected != digits[:, 12], (gender < 1) | (gender > 8),
+         (month < 1) | (month > 12), (day < 1) | (day > max_day)],
+        [BAD_CHECKSUM, BAD_GENDER, BAD_MONTH, BAD_DAY],
+        CNP_OK,
+    )
+    fields[index] = np.stack([gender, year, month, day], axis=1)
+    return codes, fields
@@ -1,18 +1,127 @@
 # src/database.py — Modul de bază de date SQLite pentru Civil Servant Agent
 import sqlite3
-import json
 import os
+import re
+import math
+import time
+import asyncio
+import unicodedata
+import threading
+from pathlib import Path
+from concurrent.futures import ThreadPoolExecutor
+from collections.abc import Mapping
 
 DB_PATH = os.path.join(os.path.dirname(__file__), "..", "civil_servant.db")
 
+# Tabelele de referință ale căror modificări invalidează cache-urile (versiune per tabel).
+VERSIONED_TABLES = (
+    "services", "service_fields", "citizens", "vehicles",
+    "appointments", "required_documents", "processing_times",
+)
 
-def get_connection():
-    conn = sqlite3.connect(DB_PATH)
+
+# Reglaje aplicate fiecărei conexiuni persistente.
+# WAL: cititorii (serverul MCP) nu mai blochează scriitorul (seiful din Streamlit) și invers.
+SQLITE_PRAGMAS = (
+    "PRAGMA journal_mode = WAL",
+    "PRAGMA synchronous = NORMAL",       # sigur în WAL; fsync doar la checkpoint
+    "PRAGMA foreign_keys = ON",
+    f"PRAGMA mmap_size = {int(os.getenv('SQLITE_MMAP_SIZE', str(64 * 1024 * 1024)))}",
+    f"PRAGMA cache_size = -{int(os.getenv('SQLITE_CACHE_KB', '16384'))}",
+    "PRAGMA temp_store = MEMORY",
+)
+# Instrucțiuni preparate păstrate calde per conexiune.
+CACHED_STATEMENTS = 256
+
+
+class PooledConnection(sqlite3.Connection):
+    """Conexiune refolosită de toate apelurile din același fir.
+
+    `close()` o eliberează, nu o închide: tranzacția neconfirmată este anulată
+    (exact ce ar fi făcut închiderea), iar conexiunea rămâne deschisă, cu
+    cache-ul de pagini și instrucțiunile preparate calde, pentru apelul următor.
+    """
+
+    # Dicționarele instantaneului compact ({tip: {cod: valoare}}); None = schema TEXT.
+    registry_codes = None
+    # Proveniența instantaneului (baza sursă, {tabel: versiune}); None = necunoscută.
+    registry_source = None
+    registry_versions = None
+    registry_checked_at = float("-inf")
+    registry_stale = False
+
+    def close(self) -> None:
+        if self.in_transaction:
+            self.rollback()
+
+    def discard(self) -> None:
+        """Închide efectiv conexiunea."""
+        super().close()
+
+
+_local = threading.local()
+
+
+def _open_connection(path: str) -> PooledConnection:
+    conn = sqlite3.connect(path, timeout=10, factory=PooledConnection,
+                           cached_statements=CACHED_STATEMENTS)
     conn.row_factory = sqlite3.Row
-    conn.execute("PRAGMA foreign_keys = ON")
+    for pragma in SQLITE_PRAGMAS:
+        conn.execute(pragma)
     return conn
 
 
+def get_connection() -> PooledConnection:
+    """Conexiunea persistentă a firului curent (una per fir, per proces, per fișier)."""
+    key = (os.getpid(), DB_PATH)
+    conn = getattr(_local, "conn", None)
+    if conn is None or _local.key != key:
+        # După fork sau la schimbarea DB_PATH, conexiunea veche nu mai e a noastră.
+        conn = _local.conn = _open_connection(DB_PATH)
+        _local.key = key
+    return conn
+
+
+def close_connection() -> None:
+    """Închide conexiunile persistente ale firului curent (următorul apel le redeschide)."""
+    for name in ("conn", "registry"):
+        conn = getattr(_local, name, None)
+        if conn is not None:
+            setattr(_local, name, None)
+            conn.discard()
+
+
+_VERSION_EVENTS = ("INSERT", "UPDATE", "DELETE")
+
+
+def create_version_triggers(cursor, table: str) -> None:
+    """Triggerele care cresc `table_versions[table]` la orice scriere în tabelă."""
+    for event in _VERSION_EVENTS:
+        cursor.execute(f"""
+            CREATE TRIGGER IF NOT EXISTS trg_{table}_{event.lower()}_version
+            AFTER {event} ON {table}
+            BEGIN
+                INSERT INTO table_versions (name, version) VALUES ('{table}', 1)
+                ON CONFLICT(name) DO UPDATE SET version = version + 1;
+            END
+        """)
+
+
+def drop_version_triggers(cursor, table: str) -> None:
+    """Opusul lui create_version_triggers (pentru importuri în masă)."""
+    for event in _VERSION_EVENTS:
+        cursor.execute(f"DROP TRIGGER IF EXISTS trg_{table}_{event.lower()}_version")
+
+
+def bump_table_version(cursor, table: str) -> None:
+    """Crește manual versiunea unei tabele (o singură dată, după un import în masă)."""
+    cursor.execute(
+        "INSERT INTO table_versions (name, version) VALUES (?, 1) "
+        "ON CONFLICT(name) DO UPDATE SET version = version + 1",
+        (table,),
+    )
+
+
 def init_db():
     conn = get_connection()
     cursor = conn.cursor()
@@ -119,10 +228,187 @@ def init_db():
         )
     """)
 
+    # ── Versiuni per tabel (invalidarea cache-urilor la modificări) ────────
+    cursor.execute("""
+        CREATE TABLE IF NOT EXISTS table_versions (
+            name TEXT PRIMARY KEY,
+            version INTEGER NOT NULL DEFAULT 0
+        )
+    """)
+    for table in VERSIONED_TABLES:
+        create_version_triggers(cursor, table)
+
     conn.commit()
+    migrate(conn)
     conn.close()
 
 
+# Căutare full-text: fără diacritice în index și în interogări („adresă" = „adresa").
+FTS_TOKENIZER = "unicode61 remove_diacritics 2"
+
+
+# ── Migrări de schemă ──────────────────────────────────────────────────────
+# Aplicate în ordine, o singură dată; `PRAGMA user_version` reține ultima
+# migrare aplicată. Nu se modifică o migrare publicată: se adaugă una nouă.
+MIGRATIONS = [
+    # 1 — indecși acoperitori pentru căutările din seif (la fiecare rerun Streamlit)
+    #     și pentru listele ordonate de documente / câmpuri ale unui serviciu.
+    (
+        "CREATE INDEX IF NOT EXISTS idx_vault_documents_folder ON vault_documents(folder)",
+        "CREATE INDEX IF NOT EXISTS idx_vault_documents_name ON vault_documents(name)",
+        "CREATE INDEX IF NOT EXISTS idx_required_documents_service"
+        " ON required_documents(service_key, doc_order, document_name)",
+        "CREATE INDEX IF NOT EXISTS idx_service_fields_service"
+        " ON service_fields(service_key, field_order, field_key, field_label)",
+    ),
+    # 2 — câmpurile documentelor din seif, normalizate: un rând per câmp, în locul
+    #     blobului fields_json. Indexul (field_key, field_value, doc_id) acoperă
+    #     proveniența și servește și căutările doar după field_key (prefix).
+    (
+        """CREATE TABLE IF NOT EXISTS vault_document_fields (
+            doc_id INTEGER NOT NULL REFERENCES vault_documents(id) ON DELETE CASCADE,
+            field_key TEXT NOT NULL,
+            field_value TEXT,
+            UNIQUE(doc_id, field_key)
+        )""",
+        "CREATE INDEX IF NOT EXISTS idx_vault_document_fields_kv"
+        " ON vault_document_fields(field_key, field_value, doc_id)",
+        """INSERT OR REPLACE INTO vault_document_fields (doc_id, field_key, field_value)
+           SELECT d.id, j.key, j.value FROM vault_documents d, json_each(d.fields_json) j
+           ORDER BY d.id, j.id""",
+        "ALTER TABLE vault_documents DROP COLUMN fields_json",
+    ),
+    # 3 — seif partiționat pe proprietar (cetățean / sesiune): datele existente
+    #     devin ale proprietarului implicit ('local' = DEFAULT_OWNER), iar toți
+    #     indecșii încep cu `owner`, deci o citire costă O(rândurile acelui proprietar).
+    (
+        """CREATE TABLE vault_fields_v3 (
+            owner TEXT NOT NULL DEFAULT 'local',
+            field_key TEXT NOT NULL,
+            field_value TEXT NOT NULL,
+            PRIMARY KEY (owner, field_key)
+        )""",
+        "INSERT INTO vault_fields_v3 SELECT 'local', field_key, field_value FROM vault_fields",
+        "DROP TABLE vault_fields",
+        "ALTER TABLE vault_fields_v3 RENAME TO vault_fields",
+        "ALTER TABLE vault_documents ADD COLUMN owner TEXT NOT NULL DEFAULT 'local'",
+        "DROP INDEX IF EXISTS idx_vault_documents_folder",
+        "DROP INDEX IF EXISTS idx_vault_documents_name",
+        "CREATE INDEX idx_vault_documents_owner_folder ON vault_documents(owner, folder)",
+        "CREATE INDEX idx_vault_documents_owner_name ON vault_documents(owner, name)",
+        "CREATE INDEX idx_vault_documents_owner_id ON vault_documents(owner, id)",
+        "ALTER TABLE vault_document_fields ADD COLUMN owner TEXT NOT NULL DEFAULT 'local'",
+        """UPDATE vault_document_fields SET owner =
+           (SELECT owner FROM vault_documents d WHERE d.id = vault_document_fields.doc_id)""",
+        "DROP INDEX IF EXISTS idx_vault_document_fields_kv",
+        "CREATE INDEX idx_vault_document_fields_owner_kv"
+        " ON vault_document_fields(owner, field_key, field_value, doc_id)",
+    ),
+    # 4 — căutare full-text (FTS5). vault_search: un rând per document din seif
+    #     (nume, tip, câmpurile extrase ca text „cheie valoare", proprietarul
+    #     neindexat, doar pentru filtrare), cu rowid = id-ul
+    #     documentului, scris de save_vault_document / save_vault_scan și șters de
+    #     trigger. required_documents_fts: index „external content" peste catalog.
+    (
+        f"""CREATE VIRTUAL TABLE vault_search USING fts5(
+            name, doc_type, fields, owner UNINDEXED, tokenize='{FTS_TOKENIZER}', prefix='3'
+        )""",
+        """INSERT INTO vault_search (rowid, name, doc_type, fields, owner)
+           SELECT d.id, d.name, d.doc_type,
+                  (SELECT group_concat(f.field_key || ' ' || ifnull(f.field_value, ''), char(10))
+                   FROM vault_document_fields f WHERE f.doc_id = d.id), d.owner
+           FROM vault_documents d""",
+        """CREATE TRIGGER vault_search_delete AFTER DELETE ON vault_documents BEGIN
+            DELETE FROM vault_search WHERE rowid = old.id;
+        END""",
+        f"""CREATE VIRTUAL TABLE required_documents_fts USING fts5(
+            document_name, content='required_documents', content_rowid='id', tokenize='{FTS_TOKENIZER}'
+        )""",
+        """CREATE TRIGGER required_documents_fts_insert AFTER INSERT ON required_documents BEGIN
+            INSERT INTO required_documents_fts (rowid, document_name) VALUES (new.id, new.document_name);
+        END""",
+        """CREATE TRIGGER required_documents_fts_delete AFTER DELETE ON required_documents BEGIN
+            INSERT INTO required_documents_fts (required_documents_fts, rowid, document_name)
+            VALUES ('delete', old.id, old.document_name);
+        END""",
+        """CREATE TRIGGER required_documents_fts_update AFTER UPDATE ON required_documents BEGIN
+            INSERT INTO required_documents_fts (required_documents_fts, rowid, document_name)
+            VALUES ('delete', old.id, old.document_name);
+            INSERT INTO required_documents_fts (rowid, document_name) VALUES (new.id, new.document_name);
+        END""",
+        "INSERT INTO required_documents_fts (required_documents_fts) VALUES ('rebuild')",
+    ),
+    # 5 — vault_search separat pe proprietari în index: coloana owner devine
+    #     indexată și conține un singur token exact, 'o' + hex(proprietar)
+    #     (vezi _owner_token), pe care căutarea îl cere în MATCH. Astfel FTS5
+    #     intersectează listele termenilor cu documentele proprietarului, în loc
+    #     să filtreze după potrivirile tuturor.
+    (
+        "DROP TRIGGER vault_search_delete",
+        "DROP TABLE vault_search",
+        f"""CREATE VIRTUAL TABLE vault_search USING fts5(
+            name, doc_type, fields, owner, tokenize='{FTS_TOKENIZER}', prefix='3'
+        )""",
+        """INSERT INTO vault_search (rowid, name, doc_type, fields, owner)
+           SELECT d.id, d.name, d.doc_type,
+                  (SELECT group_concat(f.field_key || ' ' || ifnull(f.field_value, ''), char(10))
+                   FROM vault_document_fields f WHERE f.doc_id = d.id), 'o' || lower(hex(d.owner))
+           FROM vault_documents d""",
+        """CREATE TRIGGER vault_search_delete AFTER DELETE ON vault_documents BEGIN
+            DELETE FROM vault_search WHERE rowid = old.id;
+        END""",
+    ),
+]
+
+
+def migrate(conn) -> int:
+    """Aduce schema la ultima versiune; întoarce versiunea finală."""
+    version = conn.execute("PRAGMA user_version").fetchone()[0]
+    while version < len(MIGRATIONS):
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            # Recitit sub lacăt: alt proces poate fi aplicat deja migrarea.
+            version = conn.execute("PRAGMA user_version").fetchone()[0]
+            if version < len(MIGRATIONS):
+                for statement in MIGRATIONS[version]:
+                    conn.execute(statement)
+                version += 1
+                conn.execute(f"PRAGMA user_version = {version}")
+            conn.commit()
+        except Exception:
+            conn.rollback()
+            raise
+    return version
+
+
+# ── Pornirea procesului ────────────────────────────────────────────────────
+# Modulul nu mai atinge baza la import (fiecare proces copil al serverului MCP
+# îl importă). Punctele de intrare (app.py, mcp_server.main, registry_loader,
+# testele) apelează ensure_schema() o dată; pe o schemă curentă costul este o
+# singură citire `PRAGMA user_version`.
+SCHEMA_VERSION = len(MIGRATIONS)
+
+_schema_lock = threading.Lock()
+_schema_ready: set = set()               # {(pid, DB_PATH)} deja verificate
+
+
+def ensure_schema() -> int:
+    """Creează, migrează și populează baza doar dacă schema nu e la zi."""
+    key = (os.getpid(), DB_PATH)
+    if key in _schema_ready:
+        return SCHEMA_VERSION
+    with _schema_lock:
+        if key not in _schema_ready:
+            conn = get_connection()
+            version = conn.execute("PRAGMA user_version").fetchone()[0]
+            conn.close()
+            if version < SCHEMA_VERSION:
+                init_db()
+                seed_db()
+            _schema_ready.add(key)
+    return SCHEMA_VERSION
+
+
 def seed_db():
     conn = get_connection()
     cursor = conn.cursor()
@@ -324,58 +610,297 @@ def seed_db():
 
 # ── Funcții de acces la date ────────────────────────────────────────────────
 
-def get_all_services() -> dict:
+class FrozenDict(dict):
+    """dict imuabil: instantaneele partajate de tot procesul nu pot fi modificate din greșeală."""
+
+    def _readonly(self, *args, **kwargs):
+        raise TypeError("Registrul de servicii este doar pentru citire.")
+
+    __setitem__ = __delitem__ = __ior__ = _readonly
+    clear = pop = popitem = setdefault = update = _readonly
+
+    def __reduce__(self):
+        return type(self), (dict(self),)
+
+
+# Tabelele din care e construit registrul de servicii; o scriere în oricare îl reîncarcă.
+SERVICE_REGISTRY_TABLES = ("services", "service_fields", "required_documents", "processing_times")
+
+
+def _load_services() -> FrozenDict:
+    """Citește registrul cu o singură interogare (servicii + câmpuri, prin JOIN)."""
     conn = get_connection()
-    cursor = conn.cursor()
-    cursor.execute("SELECT * FROM services ORDER BY key")
-    services = {}
-    for row in cursor.fetchall():
-        svc_key = row["key"]
-        cursor2 = conn.cursor()
-        cursor2.execute(
-            "SELECT field_key, field_label FROM service_fields WHERE service_key = ? ORDER BY field_order",
-            (svc_key,)
-        )
-        req_fields = {r["field_key"]: r["field_label"] for r in cursor2.fetchall()}
-        services[svc_key] = {
-            "name": row["name"],
-            "icon": row["icon"],
-            "description": row["description"],
-            "template_file": row["template_file"],
-            "pdf_enabled": bool(row["pdf_enabled"]),
-            "estimated_time": row["estimated_time"],
-            "required_fields": req_fields,
-        }
+    rows = conn.execute("""
+        SELECT s.*, f.field_key, f.field_label
+        FROM services s
+        LEFT JOIN service_fields f ON f.service_key = s.key
+        ORDER BY s.key, f.field_order, f.id
+    """).fetchall()
     conn.close()
-    return services
+
+    services, fields = {}, {}
+    for row in rows:
+        svc_key = row["key"]
+        if svc_key not in services:
+            fields[svc_key] = {}
+            services[svc_key] = {
+                "name": row["name"],
+                "icon": row["icon"],
+                "description": row["description"],
+                "template_file": row["template_file"],
+                "pdf_enabled": bool(row["pdf_enabled"]),
+                "estimated_time": row["estimated_time"],
+            }
+        if row["field_key"] is not None:
+            fields[svc_key][row["field_key"]] = row["field_label"]
+    return FrozenDict({
+        key: FrozenDict(svc, required_fields=FrozenDict(fields[key]))
+        for key, svc in services.items()
+    })
+
+
+class ServiceRegistryCache:
+    """Instantaneul imuabil al registrului, partajat de proces.
+
+    Se reîncarcă doar când se schimbă versiunea uneia dintre
+    SERVICE_REGISTRY_TABLES (vezi get_table_versions).
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._state: tuple = (None, None)       # (versiuni, instantaneu), înlocuite atomic
+        self.loads = 0
+
+    def _current_versions(self) -> tuple:
+        versions = get_table_versions()
+        return tuple(versions.get(t, 0) for t in SERVICE_REGISTRY_TABLES)
+
+    def get(self) -> FrozenDict:
+        versions = self._current_versions()
+        loaded_versions, snapshot = self._state
+        if snapshot is not None and versions == loaded_versions:
+            return snapshot
+        with self._lock:
+            loaded_versions, snapshot = self._state
+            if snapshot is None or versions != loaded_versions:
+                snapshot = _load_services()
+                self._state = (versions, snapshot)
+                self.loads += 1
+            return snapshot
+
+    def invalidate(self) -> None:
+        self._state = (None, None)
+
+
+_service_registry = ServiceRegistryCache()
+
+
+def get_all_services() -> dict:
+    """Toate serviciile (dict de dict-uri, doar pentru citire), din instantaneul partajat."""
+    return _service_registry.get()
 
 
 def get_service(key: str) -> dict | None:
-    all_svcs = get_all_services()
-    return all_svcs.get(key)
+    return _service_registry.get().get(key)
+
+
+# ── Instantaneul registrelor (citizens / vehicles) ────────────────────────
+# Registrele se schimbă doar la importul unui extras, dar împart baza cu
+# scrierile din seif. `python -m src.registry_loader publish` le copiază într-un
+# fișier separat, imuabil, înlocuit atomic (os.replace) la fiecare publicare.
+# Cât timp fișierul există, căutările îl deschid cu `mode=ro&immutable=1`:
+# fără lacăte, fără WAL, pagini citite prin mmap din cache-ul sistemului.
+REGISTRY_SNAPSHOT_PATH = os.getenv(
+    "REGISTRY_SNAPSHOT_PATH", os.path.join(os.path.dirname(__file__), "..", "registry_snapshot.db"))
+REGISTRY_MMAP_SIZE = int(os.getenv("REGISTRY_MMAP_SIZE", str(1024 * 1024 * 1024)))
+# La câte secunde verifică un fir dacă instantaneul a rămas în urma registrelor din baza principală.
+REGISTRY_STALE_CHECK_S = float(os.getenv("REGISTRY_STALE_CHECK_S", "5"))
+REGISTRY_TABLES = ("citizens", "vehicles")
+
+# Formatul instantaneului: "text" copiază tabelele așa cum sunt în baza
+# principală; "compact" le rescrie STRICT, WITHOUT ROWID, cu CNP-ul ca INTEGER
+# (cheia citizens și owner_cnp) și statusurile, mărcile, modelele și
+# localitățile ca coduri mici dintr-un dicționar (registry_codes). Județul
+# (JJ) face deja parte din CNP, deci nu are coloană proprie.
+# Vezi benchmarks/bench_registry_layout.py.
+REGISTRY_LAYOUT = os.getenv("REGISTRY_LAYOUT", "text")
+REGISTRY_LAYOUTS = ("text", "compact")
+COMPACT_REGISTRY_SCHEMA = (
+    """CREATE TABLE registry_codes (
+        kind TEXT NOT NULL,
+        code INTEGER NOT NULL,
+        value TEXT NOT NULL,
+        PRIMARY KEY (kind, code)
+    ) STRICT, WITHOUT ROWID""",
+    """CREATE TABLE citizens (
+        cnp INTEGER PRIMARY KEY,
+        name TEXT NOT NULL,
+        dob TEXT NOT NULL,
+        status INTEGER NOT NULL,
+        street TEXT,
+        locality INTEGER
+    ) STRICT, WITHOUT ROWID""",
+    # owner_cnp e ANY: INTEGER pentru un CNP de 13 cifre, textul original altfel.
+    """CREATE TABLE vehicles (
+        vin TEXT PRIMARY KEY,
+        make INTEGER NOT NULL,
+        model INTEGER NOT NULL,
+        year INTEGER NOT NULL,
+        status INTEGER NOT NULL,
+        owner_cnp ANY
+    ) STRICT, WITHOUT ROWID""",
+)
+
+
+def cnp_key(cnp) -> int | None:
+    """CNP-ul ca cheie INTEGER a registrului compact; None dacă nu are exact 13 cifre."""
+    if isinstance(cnp, str) and len(cnp) == 13 and cnp.isascii() and cnp.isdigit():
+        return int(cnp)
+    return None
+
+
+def _cnp_text(value):
+    return f"{value:013d}" if isinstance(value, int) else value
+
+
+def _load_registry_codes(conn) -> dict | None:
+    if not conn.execute("SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'registry_codes'").fetchone():
+        return None
+    codes = {}
+    for kind, code, value in conn.execute("SELECT kind, code, value FROM registry_codes"):
+        codes.setdefault(kind, {})[code] = value
+    return codes
+
+
+def _open_snapshot(path: str) -> PooledConnection:
+    uri = Path(path).resolve().as_uri() + "?mode=ro&immutable=1"
+    conn = sqlite3.connect(uri, uri=True, factory=PooledConnection, cached_statements=CACHED_STATEMENTS)
+    conn.row_factory = sqlite3.Row
+    conn.execute(f"PRAGMA mmap_size = {REGISTRY_MMAP_SIZE}")
+    conn.registry_codes = _load_registry_codes(conn)
+    if conn.execute("SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'snapshot_source'").fetchone():
+        rows = conn.execute("SELECT table_name, version, db_path FROM snapshot_source").fetchall()
+        conn.registry_versions = {r["table_name"]: r["version"] for r in rows}
+        conn.registry_source = rows[0]["db_path"] if rows else None
+    return conn
+
+
+def _check_snapshot(conn: PooledConnection) -> None:
+    """Semnalează (o dată per instantaneu deschis) un instantaneu care nu mai
+    reflectă registrele din baza principală: publicat din altă bază, sau urmat
+    de un import fără --publish. Căutările îl folosesc în continuare până la
+    republicare, dar divergența nu mai trece neobservată.
+    """
+    if conn.registry_versions is None or conn.registry_stale:
+        return
+    if conn.registry_source != os.path.realpath(DB_PATH):
+        reason = f"a fost publicat din {conn.registry_source}, nu din {os.path.realpath(DB_PATH)}"
+    else:
+        versions = get_table_versions()
+        behind = [t for t, v in conn.registry_versions.items() if versions.get(t, 0) > v]
+        if not behind:
+            return
+        reason = f"e mai vechi decât {', '.join(behind)} din baza principală"
+    conn.registry_stale = True
+    print(f"⚠️ [Database] Instantaneul registrelor {REGISTRY_SNAPSHOT_PATH} {reason}; "
+          f"republicați-l cu `python -m src.registry_loader publish`.")
+
+
+def get_registry_connection() -> PooledConnection:
+    """Conexiunea pentru căutările în registre: instantaneul publicat, altfel baza principală.
+
+    Un instantaneu republicat are alt inode; conexiunea firului se redeschide
+    la prima căutare de după înlocuire (cea veche citea fișierul anterior, intact).
+    La cel mult REGISTRY_STALE_CHECK_S secunde se verifică și că instantaneul
+    nu a rămas în urma bazei principale (vezi _check_snapshot).
+    """
+    try:
+        stat = os.stat(REGISTRY_SNAPSHOT_PATH)
+    except FileNotFoundError:
+        return get_connection()
+    key = (os.getpid(), REGISTRY_SNAPSHOT_PATH, stat.st_ino, stat.st_mtime_ns)
+    conn = getattr(_local, "registry", None)
+    if conn is None or _local.registry_key != key:
+        if conn is not None and _local.registry_key[0] == os.getpid():
+            conn.discard()
+        conn = _local.registry = _open_snapshot(REGISTRY_SNAPSHOT_PATH)
+        _local.registry_key = key
+    now = time.monotonic()
+    if now - conn.registry_checked_at >= REGISTRY_STALE_CHECK_S:
+        conn.registry_checked_at = now
+        _check_snapshot(conn)
+    return conn
+
+
+def _registry_keys(conn, cnps: list) -> list:
+    """Cheile de căutare pentru schema conexiunii (CNP-urile invalide nu pot exista în compact)."""
+    if conn.registry_codes is None:
+        return list(cnps)
+    return [k for k in map(cnp_key, cnps) if k is not None]
+
+
+def _citizen(row, codes) -> dict:
+    if codes is None:
+        return {"name": row["name"], "dob": row["dob"], "status": row["status"], "address": row["address"]}
+    street, locality = row["street"], row["locality"]
+    address = street if locality is None else f"{street}, {codes['locality'][locality]}"
+    return {"name": row["name"], "dob": row["dob"], "status": codes["citizen_status"][row["status"]],
+            "address": address}
+
+
+def _vehicle(row, codes) -> dict:
+    if codes is None:
+        return {"make": row["make"], "model": row["model"], "year": row["year"],
+                "status": row["status"], "owner_cnp": row["owner_cnp"]}
+    return {"make": codes["make"][row["make"]], "model": codes["model"][row["model"]], "year": row["year"],
+            "status": codes["vehicle_status"][row["status"]], "owner_cnp": _cnp_text(row["owner_cnp"])}
 
 
 def get_citizen(cnp: str) -> dict | None:
-    conn = get_connection()
-    cursor = conn.cursor()
-    cursor.execute("SELECT * FROM citizens WHERE cnp = ?", (cnp,))
-    row = cursor.fetchone()
+    conn = get_registry_connection()
+    keys = _registry_keys(conn, [cnp])
+    row = conn.execute("SELECT * FROM citizens WHERE cnp = ?", keys).fetchone() if keys else None
     conn.close()
-    if row:
-        return {"name": row["name"], "dob": row["dob"], "status": row["status"], "address": row["address"]}
-    return None
+    return _citizen(row, conn.registry_codes) if row else None
 
 
 def get_vehicle(vin: str) -> dict | None:
-    conn = get_connection()
+    conn = get_registry_connection()
     cursor = conn.cursor()
     cursor.execute("SELECT * FROM vehicles WHERE vin = ?", (vin,))
     row = cursor.fetchone()
     conn.close()
-    if row:
-        return {"make": row["make"], "model": row["model"], "year": row["year"],
-                "status": row["status"], "owner_cnp": row["owner_cnp"]}
-    return None
+    return _vehicle(row, conn.registry_codes) if row else None
+
+
+# Câte valori intră într-un singur `IN (...)` (sub limita de parametri SQLite).
+IN_CHUNK_SIZE = 500
+
+
+def _select_in(query: str, values: list, conn=None) -> list:
+    """Rulează `query` (cu un `{}` pentru lista de parametri) pe bucăți de IN_CHUNK_SIZE."""
+    values = list(dict.fromkeys(values))
+    rows = []
+    conn = conn or get_connection()
+    for i in range(0, len(values), IN_CHUNK_SIZE):
+        chunk = values[i:i + IN_CHUNK_SIZE]
+        rows.extend(conn.execute(query.format(",".join("?" * len(chunk))), chunk).fetchall())
+    conn.close()
+    return rows
+
+
+def get_citizens(cnps: list) -> dict:
+    """Varianta în lot a get_citizen: {cnp: cetățean} doar pentru CNP-urile găsite."""
+    conn = get_registry_connection()
+    rows = _select_in("SELECT * FROM citizens WHERE cnp IN ({})", _registry_keys(conn, cnps), conn)
+    return {_cnp_text(row["cnp"]): _citizen(row, conn.registry_codes) for row in rows}
+
+
+def get_vehicles(vins: list) -> dict:
+    """Varianta în lot a get_vehicle: {vin: vehicul} doar pentru VIN-urile găsite."""
+    conn = get_registry_connection()
+    rows = _select_in("SELECT * FROM vehicles WHERE vin IN ({})", vins, conn)
+    return {row["vin"]: _vehicle(row, conn.registry_codes) for row in rows}
 
 
 def get_appointments(limit: int = 5) -> list:
@@ -410,113 +935,544 @@ def get_processing_time(service_key: str) -> dict:
     return {"standard": "Necunoscut", "urgent": "Necunoscut"}
 
 
+# ── Acces asincron (uneltele serverului MCP) ───────────────────────────────
+# Accesorii de mai sus blochează firul apelant cât timp SQLite citește de pe
+# disc. Variantele `a*` îi rulează pe un executor cu cel mult
+# DB_EXECUTOR_WORKERS fire; fiecare fir are conexiunea lui (get_connection e
+# per-fir), deci o singură buclă asyncio poate suprapune multe căutări, iar
+# cererile peste limită așteaptă la coada executorului, nu pe buclă.
+DB_EXECUTOR_WORKERS = int(os.getenv("DB_EXECUTOR_WORKERS", "8"))
+
+_executor_lock = threading.Lock()
+_executor: tuple = (None, None)          # (pid, executor)
+
+
+def get_executor() -> ThreadPoolExecutor:
+    """Executorul de citiri al procesului (recreat după fork)."""
+    global _executor
+    with _executor_lock:
+        pid, executor = _executor
+        if executor is None or pid != os.getpid():
+            executor = ThreadPoolExecutor(max_workers=DB_EXECUTOR_WORKERS, thread_name_prefix="db")
+            _executor = (os.getpid(), executor)
+        return executor
+
+
+def shutdown_executor() -> None:
+    global _executor
+    with _executor_lock:
+        pid, executor = _executor
+        _executor = (None, None)
+    if executor is not None and pid == os.getpid():
+        executor.shutdown(wait=True)
+
+
+async def run_in_executor(fn, *args):
+    """Rulează accesorul sincron `fn(*args)` pe executorul de citiri."""
+    return await asyncio.get_running_loop().run_in_executor(get_executor(), fn, *args)
+
+
+async def aget_citizen(cnp: str) -> dict | None:
+    return await run_in_executor(get_citizen, cnp)
+
+
+async def aget_vehicle(vin: str) -> dict | None:
+    return await run_in_executor(get_vehicle, vin)
+
+
+async def aget_citizens(cnps: list) -> dict:
+    return await run_in_executor(get_citizens, cnps)
+
+
+async def aget_vehicles(vins: list) -> dict:
+    return await run_in_executor(get_vehicles, vins)
+
+
+async def aget_appointments(limit: int = 5) -> list:
+    return await run_in_executor(get_appointments, limit)
+
+
+async def aget_required_documents(service_key: str) -> list:
+    return await run_in_executor(get_required_documents, service_key)
+
+
+async def aget_processing_time(service_key: str) -> dict:
+    return await run_in_executor(get_processing_time, service_key)
+
+
+# ── Versiuni de tabele (detectarea ieftină a modificărilor) ────────────────
+
+class TableVersionTracker:
+    """Întoarce versiunile tabelelor de referință fără a le citi la fiecare apel.
+
+    `PRAGMA data_version` se schimbă doar când altă conexiune a confirmat o
+    scriere; abia atunci se recitește `table_versions`. Conexiunea proprie nu
+    scrie niciodată, deci orice modificare (din acest proces sau din altul)
+    este observată.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._conn = None
+        self._path = None
+        self._data_version = None
+        self._versions: dict = {}
+
+    def versions(self) -> dict:
+        with self._lock:
+            if self._conn is None or self._path != DB_PATH:
+                # Prima cerere, sau DB_PATH a fost schimbat (import / benchmark pe altă bază).
+                if self._conn is not None:
+                    self._conn.close()
+                self._conn = sqlite3.connect(DB_PATH, check_same_thread=False)
+                self._path, self._data_version = DB_PATH, None
+            data_version = self._conn.execute("PRAGMA data_version").fetchone()[0]
+            if data_version != self._data_version:
+                rows = self._conn.execute("SELECT name, version FROM table_versions").fetchall()
+                self._versions = dict(rows)
+                self._data_version = data_version
+            return self._versions
+
+
+_version_tracker = TableVersionTracker()
+
+
+def get_table_versions() -> dict:
+    """{tabel: versiune} pentru VERSIONED_TABLES; o tabelă nemodificată lipsește (versiunea 0)."""
+    return _version_tracker.versions()
+
+
 # ── Vault persistence ──────────────────────────────────────────────────────
 
-def save_vault_field(key: str, value: str):
+# Câte documente intră într-un apel executemany la salvarea unei scanări.
+VAULT_BATCH_SIZE = int(os.getenv("VAULT_BATCH_SIZE", "500"))
+
+# Proprietarul implicit al seifului: o instalare locală, cu un singur cetățean.
+DEFAULT_OWNER = "local"
+
+_VAULT_FIELD_SQL = "INSERT OR REPLACE INTO vault_fields (owner, field_key, field_value) VALUES (?, ?, ?)"
+_VAULT_DOCUMENT_SQL = """INSERT INTO vault_documents (owner, name, rel, doc_type, icon, field_count, source, folder)
+           VALUES (?, ?, ?, ?, ?, ?, ?, ?)"""
+_VAULT_DOCUMENT_FIELD_SQL = """INSERT OR REPLACE INTO vault_document_fields (owner, doc_id, field_key, field_value)
+           VALUES (?, ?, ?, ?)"""
+_VAULT_SEARCH_SQL = "INSERT INTO vault_search (rowid, name, doc_type, fields, owner) VALUES (?, ?, ?, ?, ?)"
+
+
+def save_vault_field(key: str, value: str, owner: str = DEFAULT_OWNER):
     conn = get_connection()
-    conn.execute(
-        "INSERT OR REPLACE INTO vault_fields (field_key, field_value) VALUES (?, ?)",
-        (key, value)
-    )
+    conn.execute(_VAULT_FIELD_SQL, (owner, key, value))
     conn.commit()
     conn.close()
 
 
-def save_vault_fields(fields: dict):
+def save_vault_fields(fields: dict, owner: str = DEFAULT_OWNER):
     conn = get_connection()
-    for k, v in fields.items():
-        conn.execute(
-            "INSERT OR REPLACE INTO vault_fields (field_key, field_value) VALUES (?, ?)",
-            (k, str(v))
-        )
+    conn.executemany(_VAULT_FIELD_SQL, ((owner, k, str(v)) for k, v in fields.items()))
     conn.commit()
     conn.close()
 
 
-def get_vault_fields() -> dict:
+def get_vault_fields(owner: str = DEFAULT_OWNER) -> dict:
     conn = get_connection()
     cursor = conn.cursor()
-    cursor.execute("SELECT field_key, field_value FROM vault_fields")
+    cursor.execute("SELECT field_key, field_value FROM vault_fields WHERE owner = ?", (owner,))
     result = {r["field_key"]: r["field_value"] for r in cursor.fetchall()}
     conn.close()
     return result
 
 
-def clear_vault():
+def clear_vault(owner: str = DEFAULT_OWNER):
+    """Golește seiful unui singur proprietar."""
     conn = get_connection()
-    conn.execute("DELETE FROM vault_fields")
-    conn.execute("DELETE FROM vault_documents")
+    conn.execute("DELETE FROM vault_fields WHERE owner = ?", (owner,))
+    conn.execute("DELETE FROM vault_documents WHERE owner = ?", (owner,))   # câmpurile: ON DELETE CASCADE
     conn.commit()
     conn.close()
 
 
-def save_vault_document(doc: dict):
-    conn = get_connection()
-    conn.execute(
-        """INSERT INTO vault_documents (name, rel, doc_type, icon, fields_json, field_count, source, folder)
-           VALUES (?, ?, ?, ?, ?, ?, ?, ?)""",
-        (
-            doc.get("name", ""),
-            doc.get("rel", ""),
-            doc.get("type", "general"),
-            doc.get("icon", "📄"),
-            json.dumps(doc.get("fields", {}), ensure_ascii=False),
-            doc.get("count", 0),
-            doc.get("source", "single"),
-            doc.get("folder"),
-        )
+def _vault_document_row(doc: dict, owner: str) -> tuple:
+    return (
+        owner,
+        doc.get("name", ""),
+        doc.get("rel", ""),
+        doc.get("type", "general"),
+        doc.get("icon", "📄"),
+        doc.get("count", 0),
+        doc.get("source", "single"),
+        doc.get("folder"),
     )
+
+
+def _vault_document_field_rows(doc_id: int, fields: dict, owner: str) -> list:
+    return [(owner, doc_id, k, str(v)) for k, v in fields.items()]
+
+
+def _owner_token(owner: str) -> str:
+    """Proprietarul ca token FTS5 unic și exact (niciun proprietar nu e prefixul altuia)."""
+    return "o" + owner.encode().hex()
+
+
+def _vault_search_row(doc_id: int, doc: dict, owner: str) -> tuple:
+    """Rândul din indexul full-text: câmpurile documentului ca text „cheie valoare"."""
+    text = "\n".join(f"{k} {v}" for k, v in doc.get("fields", {}).items())
+    return doc_id, doc.get("name", ""), doc.get("type", "general"), text, _owner_token(owner)
+
+
+def _insert_vault_document(conn, doc: dict, owner: str) -> int:
+    doc_id = conn.execute(_VAULT_DOCUMENT_SQL, _vault_document_row(doc, owner)).lastrowid
+    conn.executemany(_VAULT_DOCUMENT_FIELD_SQL,
+                     _vault_document_field_rows(doc_id, doc.get("fields", {}), owner))
+    conn.execute(_VAULT_SEARCH_SQL, _vault_search_row(doc_id, doc, owner))
+    return doc_id
+
+
+def save_vault_document(doc: dict, owner: str = DEFAULT_OWNER):
+    conn = get_connection()
+    _insert_vault_document(conn, doc, owner)
     conn.commit()
     conn.close()
 
 
-def get_vault_documents() -> list:
+def save_vault_writes(writes: list) -> None:
+    """Aplică într-o singură tranzacție scrierile amânate de src/vault_writer.py.
+
+    Fiecare element e ("fields", owner, {cheie: valoare}) sau
+    ("document", owner, document). La eroare nu se scrie nimic.
+    """
+    conn = get_connection()
+    try:
+        for kind, owner, payload in writes:
+            if kind == "fields":
+                conn.executemany(_VAULT_FIELD_SQL, ((owner, k, str(v)) for k, v in payload.items()))
+            else:
+                _insert_vault_document(conn, payload, owner)
+        conn.commit()
+    finally:
+        conn.close()
+
+
+def save_vault_scan(fields: dict, documents, batch_size: int = VAULT_BATCH_SIZE,
+                    owner: str = DEFAULT_OWNER) -> int:
+    """Salvează rezultatul unei scanări (câmpuri + documente) într-o singură tranzacție.
+
+    `documents` poate fi și un generator: rândurile sunt scrise cu executemany
+    în loturi de `batch_size`, deci memoria rămâne mărginită la scanări mari,
+    iar commit-ul (un singur fsync) vine abia la final. La eroare nu se scrie nimic.
+    Întoarce numărul de documente salvate.
+    """
+    conn = get_connection()
+    saved = 0
+
+    def flush(batch):
+        conn.executemany(_VAULT_DOCUMENT_SQL, [_vault_document_row(d, owner) for d in batch])
+        # Tranzacția ține lacătul de scriere, deci id-urile (AUTOINCREMENT) lotului
+        # sunt consecutive și se termină la last_insert_rowid().
+        first_id = conn.execute("SELECT last_insert_rowid()").fetchone()[0] - len(batch) + 1
+        conn.executemany(_VAULT_DOCUMENT_FIELD_SQL, [
+            row for i, d in enumerate(batch)
+            for row in _vault_document_field_rows(first_id + i, d.get("fields", {}), owner)
+        ])
+        conn.executemany(_VAULT_SEARCH_SQL, [_vault_search_row(first_id + i, d, owner) for i, d in enumerate(batch)])
+        return len(batch)
+
+    try:
+        conn.executemany(_VAULT_FIELD_SQL, ((owner, k, str(v)) for k, v in fields.items()))
+        batch = []
+        for doc in documents:
+            batch.append(doc)
+            if len(batch) >= batch_size:
+                saved += flush(batch)
+                batch = []
+        if batch:
+            saved += flush(batch)
+        conn.commit()
+    finally:
+        conn.close()
+    return saved
+
+
+class _FieldsBatch:
+    """Câmpurile unei pagini de documente din seif, citite împreună (un `IN (...)`
+    pe bucăți de IN_CHUNK_SIZE) la primul acces la oricare dintre ele."""
+
+    __slots__ = ("doc_ids", "_fields")
+
+    def __init__(self, doc_ids: list):
+        self.doc_ids = doc_ids
+        self._fields = None
+
+    def load(self) -> dict:
+        if self._fields is None:
+            fields = {doc_id: {} for doc_id in self.doc_ids}
+            for r in _select_in("SELECT doc_id, field_key, field_value FROM vault_document_fields"
+                                " WHERE doc_id IN ({}) ORDER BY rowid", self.doc_ids):
+                fields[r[0]][r[1]] = r[2]
+            self._fields = fields
+        return self._fields
+
+
+class LazyFields(Mapping):
+    """Câmpurile unui document din seif, citite din vault_document_fields abia la primul acces.
+
+    Documentele din aceeași listă (get_vault_documents, find_vault_documents,
+    search_vault) împart un _FieldsBatch: primul acces le citește pe toate.
+    """
+
+    __slots__ = ("doc_id", "_fields", "_batch")
+
+    def __init__(self, doc_id: int, batch: _FieldsBatch | None = None):
+        self.doc_id = doc_id
+        self._fields = None
+        self._batch = batch
+
+    def _load(self) -> dict:
+        if self._fields is None:
+            if self._batch is not None:
+                self._fields = self._batch.load()[self.doc_id]
+                self._batch = None
+            else:
+                conn = get_connection()
+                self._fields = {r[0]: r[1] for r in conn.execute(
+                    "SELECT field_key, field_value FROM vault_document_fields WHERE doc_id = ? ORDER BY rowid",
+                    (self.doc_id,),
+                )}
+                conn.close()
+        return self._fields
+
+    def __getitem__(self, key):
+        return self._load()[key]
+
+    def __iter__(self):
+        return iter(self._load())
+
+    def __len__(self):
+        return len(self._load())
+
+    def __repr__(self):
+        return f"LazyFields({self._load()!r})"
+
+
+def _vault_document(r, batch: _FieldsBatch | None = None) -> dict:
+    return {
+        "id": r["id"],
+        "name": r["name"],
+        "rel": r["rel"],
+        "type": r["doc_type"],
+        "icon": r["icon"],
+        "fields": LazyFields(r["id"], batch),
+        "count": r["field_count"],
+        "source": r["source"],
+        "folder": r["folder"],
+    }
+
+
+def _vault_documents(rows) -> list:
+    """Documentele unei pagini de rânduri, cu câmpurile citite împreună (fără N+1)."""
+    batch = _FieldsBatch([r["id"] for r in rows])
+    return [_vault_document(r, batch) for r in rows]
+
+
+def get_vault_documents(owner: str = DEFAULT_OWNER) -> list:
     conn = get_connection()
     cursor = conn.cursor()
-    cursor.execute("SELECT * FROM vault_documents ORDER BY id")
-    docs = []
-    for r in cursor.fetchall():
-        docs.append({
-            "id": r["id"],
-            "name": r["name"],
-            "rel": r["rel"],
-            "type": r["doc_type"],
-            "icon": r["icon"],
-            "fields": json.loads(r["fields_json"]),
-            "count": r["field_count"],
-            "source": r["source"],
-            "folder": r["folder"],
-        })
+    cursor.execute("SELECT * FROM vault_documents WHERE owner = ? ORDER BY id", (owner,))
+    docs = _vault_documents(cursor.fetchall())
     conn.close()
     return docs
 
 
-def delete_vault_documents_by_folder(folder: str):
+def find_vault_documents(field_key: str, field_value: str | None = None,
+                         owner: str = DEFAULT_OWNER) -> list:
+    """Documentele din care provine un câmp (opțional cu o anumită valoare), prin index."""
+    conn = get_connection()
+    query = """SELECT d.* FROM vault_documents d
+               WHERE d.id IN (SELECT doc_id FROM vault_document_fields
+                              WHERE owner = ? AND field_key = ?{})
+               ORDER BY d.id"""
+    if field_value is None:
+        rows = conn.execute(query.format(""), (owner, field_key)).fetchall()
+    else:
+        rows = conn.execute(query.format(" AND field_value = ?"),
+                            (owner, field_key, str(field_value))).fetchall()
+    conn.close()
+    return _vault_documents(rows)
+
+
+SEARCH_LIMIT = 20
+# Peste atâtea potriviri, scorul de relevanță (calculat pe fiecare rând
+# potrivit) ar depăși câteva zeci de ms: rezultatele vin atunci în ordinea
+# scanării, cele mai noi întâi.
+SEARCH_RANK_MAX = int(os.getenv("SEARCH_RANK_MAX", "5000"))
+_SEARCH_TOKEN_RE = re.compile(r"\w+")
+_FTS_TOKEN_RE = re.compile(r"[^\W_]+")
+_COMBINING_RE = re.compile("[\u0300-\u036f]")
+# Parametrii funcției bm25 din FTS5.
+_BM25_K1, _BM25_B = 1.2, 0.75
+
+
+def _search_terms(query: str) -> list:
+    """Textul liber al utilizatorului ca termeni FTS5 siguri: (termen, tokeni, prefix).
+
+    Fiecare cuvânt devine un termen între ghilimele (fără sintaxă FTS); cele de
+    cel puțin 3 litere sunt căutate și ca prefix.
+    """
+    terms = []
+    for word in _SEARCH_TOKEN_RE.findall(query):
+        prefix = len(word) >= 3
+        terms.append((f'"{word}"*' if prefix else f'"{word}"', _fts_tokens(word), prefix))
+    return terms
+
+
+def _fts_queries(terms: list) -> list:
+    """Interogările FTS5, de la stricta la largă: întâi toate cuvintele (AND),
+    apoi, dacă nu se găsește nimic, oricare dintre ele (OR)."""
+    fts = [term for term, _, _ in terms]
+    if not fts:
+        return []
+    return [" ".join(fts)] + ([" OR ".join(fts)] if len(fts) > 1 else [])
+
+
+def _fts_tokens(text: str) -> list:
+    """Tokenii unui text ca în FTS_TOKENIZER: litere și cifre, mici, fără diacritice."""
+    text = text.lower()
+    if not text.isascii():
+        text = _COMBINING_RE.sub("", unicodedata.normalize("NFD", text))
+    return _FTS_TOKEN_RE.findall(text)
+
+
+def _phrase_count(tokens: list, phrase: list, prefix: bool) -> int:
+    """De câte ori apare fraza în tokens (ultimul token, opțional, ca prefix)."""
+    head, last, n = phrase[:-1], phrase[-1], len(phrase)
+    if n == 1:
+        return sum(1 for t in tokens if t.startswith(last)) if prefix else tokens.count(last)
+    return sum(1 for i in range(len(tokens) - n + 1)
+               if tokens[i:i + n - 1] == head
+               and (tokens[i + n - 1].startswith(last) if prefix else tokens[i + n - 1] == last))
+
+
+def _search(conn, table: str, queries: list, select: str, join: str, limit: int) -> list:
+    """Primele `limit` rânduri pentru prima interogare din `queries` care găsește ceva.
+
+    Potrivirile se numără doar până la SEARCH_RANK_MAX + 1.
+    """
+    for match in queries:
+        hits = conn.execute(f"""SELECT COUNT(*) FROM (
+            SELECT 1 FROM {table} WHERE {table} MATCH ? LIMIT {SEARCH_RANK_MAX + 1})""",
+            (match,)).fetchone()[0]
+        if not hits:
+            continue
+        ranked = hits <= SEARCH_RANK_MAX
+        return conn.execute(f"""
+            SELECT {select}, s.score FROM (
+                SELECT rowid, {"rank" if ranked else "NULL"} AS score FROM {table}
+                WHERE {table} MATCH ?
+                ORDER BY {"rank" if ranked else "rowid DESC"} LIMIT ?
+            ) s JOIN {join} ON t.id = s.rowid
+            ORDER BY {"s.score" if ranked else "s.rowid DESC"}
+        """, (match, limit)).fetchall()
+    return []
+
+
+def _owner_bm25(conn, hits: list, terms: list, scope: str, owner: str) -> dict:
+    """Scorul bm25 al rândurilor (rowid, name, doc_type, fields) din hits, negativ
+    ca rank-ul din FTS5 (mai mic = mai relevant).
+
+    bm25 din FTS5 folosește statisticile întregului index, deci documentele altor
+    proprietari ar schimba ordinea. Aici numărul de documente și câte dintre ele
+    conțin fiecare termen sunt ale proprietarului, iar lungimea medie este cea a
+    documentelor găsite.
+    """
+    total = conn.execute("SELECT COUNT(*) FROM vault_documents WHERE owner = ?", (owner,)).fetchone()[0]
+    docs = {row[0]: [_fts_tokens(col or "") for col in row[1:]] for row in hits}
+    lengths = {doc_id: sum(map(len, cols)) for doc_id, cols in docs.items()}
+    average = sum(lengths.values()) / len(lengths) or 1
+    scores = dict.fromkeys(docs, 0.0)
+    for term, tokens, prefix in terms:
+        if not tokens:
+            continue
+        # Termenul din cel puțin jumătate din documente are deja idf minim.
+        found = conn.execute(f"""SELECT COUNT(*) FROM (SELECT 1 FROM vault_search
+            WHERE vault_search MATCH ? LIMIT {total // 2 + 1})""", (scope + term,)).fetchone()[0]
+        idf = max(math.log((total - found + 0.5) / (found + 0.5)), 1e-6)
+        for doc_id, cols in docs.items():
+            tf = sum(_phrase_count(col, tokens, prefix) for col in cols)
+            if tf:
+                norm = _BM25_K1 * (1 - _BM25_B + _BM25_B * lengths[doc_id] / average)
+                scores[doc_id] -= idf * tf * (_BM25_K1 + 1) / (tf + norm)
+    return scores
+
+
+def _search_owner_vault(conn, terms: list, owner: str, limit: int) -> list:
+    """Primele `limit` documente ale proprietarului, ca (rând, scor), pentru prima
+    interogare care găsește ceva.
+
+    Tokenul proprietarului face parte din MATCH: FTS5 intersectează listele
+    termenilor cu documentele lui, iar numărarea, alegerea interogării și
+    ordonarea nu văd documentele altor proprietari.
+    """
+    scope = f'owner : "{_owner_token(owner)}" AND {{name doc_type fields}} : '
+    for query in _fts_queries(terms):
+        match = f"{scope}({query})"
+        hits = conn.execute(f"""SELECT COUNT(*) FROM (
+            SELECT 1 FROM vault_search WHERE vault_search MATCH ? LIMIT {SEARCH_RANK_MAX + 1})""",
+            (match,)).fetchone()[0]
+        if not hits:
+            continue
+        if hits > SEARCH_RANK_MAX:
+            ids = [r[0] for r in conn.execute(
+                "SELECT rowid FROM vault_search WHERE vault_search MATCH ? ORDER BY rowid DESC LIMIT ?",
+                (match, limit))]
+            scores = dict.fromkeys(ids)
+        else:
+            rows = conn.execute("SELECT rowid, name, doc_type, fields FROM vault_search "
+                                "WHERE vault_search MATCH ?", (match,)).fetchall()
+            scores = _owner_bm25(conn, rows, terms, scope, owner)
+            ids = sorted(scores, key=lambda doc_id: (scores[doc_id], -doc_id))[:limit]
+        rows = {r["id"]: r for r in conn.execute(
+            f"SELECT * FROM vault_documents WHERE id IN ({','.join('?' * len(ids))})", ids)}
+        return [(rows[doc_id], scores[doc_id]) for doc_id in ids if doc_id in rows]
+    return []
+
+
+def search_vault(query: str, limit: int = SEARCH_LIMIT, owner: str = DEFAULT_OWNER) -> dict:
+    """Căutare full-text în seiful proprietarului (nume de fișier, tip, câmpuri
+    extrase) și în cataloagele de documente necesare, ordonată după relevanță (bm25).
+
+    Întoarce {"documents": [document din seif + "score"],
+              "required_documents": [{"service", "document", "score"}]}.
+    """
+    terms = _search_terms(query)
     conn = get_connection()
-    conn.execute("DELETE FROM vault_documents WHERE folder = ?", (folder,))
+    hits = _search_owner_vault(conn, terms, owner, limit)
+    documents = [dict(doc, score=score) for doc, (_, score) in zip(_vault_documents([r for r, _ in hits]), hits)]
+    required = [{"service": r["service_key"], "document": r["document_name"], "score": r["score"]}
+                for r in _search(conn, "required_documents_fts", _fts_queries(terms),
+                                 "t.service_key, t.document_name", "required_documents t", limit)]
+    conn.close()
+    return {"documents": documents, "required_documents": required}
+
+
+def delete_vault_documents_by_folder(folder: str, owner: str = DEFAULT_OWNER):
+    conn = get_connection()
+    conn.execute("DELETE FROM vault_documents WHERE owner = ? AND folder = ?", (owner, folder))
     conn.commit()
     conn.close()
 
 
-def is_folder_scanned(folder: str) -> bool:
+def is_folder_scanned(folder: str, owner: str = DEFAULT_OWNER) -> bool:
     conn = get_connection()
     cursor = conn.cursor()
-    cursor.execute("SELECT COUNT(*) FROM vault_documents WHERE folder = ?", (folder,))
+    cursor.execute("SELECT COUNT(*) FROM vault_documents WHERE owner = ? AND folder = ?", (owner, folder))
     count = cursor.fetchone()[0]
     conn.close()
     return count > 0
 
 
-def is_file_in_vault(filename: str) -> bool:
+def is_file_in_vault(filename: str, owner: str = DEFAULT_OWNER) -> bool:
     conn = get_connection()
     cursor = conn.cursor()
-    cursor.execute("SELECT COUNT(*) FROM vault_documents WHERE name = ?", (filename,))
+    cursor.execute("SELECT COUNT(*) FROM vault_documents WHERE owner = ? AND name = ?", (owner, filename))
     count = cursor.fetchone()[0]
     conn.close()
     return count > 0
 
-
-
-# ── Inițializare automată ──────────────────────────────────────────────────
-init_db()
-seed_db()
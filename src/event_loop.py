@@ -0,0 +1,108 @@
+# src/event_loop.py — Bucla asyncio de fundal, partajată de tot procesul
+#
+# Scriptul Streamlit e sincron. În loc de `asyncio.run(...)` pe fiecare apel
+# (o buclă nouă creată și distrusă de fiecare dată, fără resurse async care să
+# supraviețuiască între apeluri), procesul are o singură buclă de lungă durată
+# într-un fir dedicat. Codul sincron îi trimite corutine prin
+# `run_coroutine_threadsafe`:
+#   • run(coro)    — blochează până la rezultat (fațada sincronă);
+#   • submit(coro) — întoarce imediat un concurrent.futures.Future, pentru
+#                    lucrări pornite în avans și culese mai târziu.
+# Sesiunile MCP, clienții HTTP și task-urile de supervizare ale tuturor
+# pool-urilor trăiesc pe această buclă.
+
+import atexit
+import asyncio
+import threading
+import concurrent.futures
+from typing import Optional
+
+
+class BackgroundLoop:
+    """O buclă asyncio care rulează `run_forever` într-un fir daemon, pornită la prima cerere."""
+
+    def __init__(self, name: str = "mcp-loop"):
+        self.name = name
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._thread: Optional[threading.Thread] = None
+        self._lock = threading.Lock()
+
+    @property
+    def running(self) -> bool:
+        return self._loop is not None and self._loop.is_running()
+
+    def loop(self) -> asyncio.AbstractEventLoop:
+        """Bucla de fundal (o pornește dacă nu rulează încă)."""
+        with self._lock:
+            if self._loop is None:
+                started = threading.Event()
+                self._loop = asyncio.new_event_loop()
+                self._thread = threading.Thread(
+                    target=self._run_forever, args=(started,), name=self.name, daemon=True
+                )
+                self._thread.start()
+                started.wait()
+            return self._loop
+
+    def _run_forever(self, started: threading.Event) -> None:
+        asyncio.set_event_loop(self._loop)
+        self._loop.call_soon(started.set)
+        self._loop.run_forever()
+
+    def in_loop_thread(self) -> bool:
+        return self._thread is not None and threading.current_thread() is self._thread
+
+    def submit(self, coro) -> concurrent.futures.Future:
+        """Programează corutina pe bucla de fundal, fără să aștepte rezultatul."""
+        return asyncio.run_coroutine_threadsafe(coro, self.loop())
+
+    def run(self, coro, timeout: Optional[float] = None):
+        """Rulează corutina pe bucla de fundal și întoarce rezultatul (sincron)."""
+        if self.in_loop_thread():
+            coro.close()
+            raise RuntimeError("run() apelat din firul buclei de fundal: folosiți `await`.")
+        future = self.submit(coro)
+        try:
+            return future.result(timeout)
+        except concurrent.futures.TimeoutError:
+            future.cancel()
+            raise
+
+    def shutdown(self, timeout: float = 5.0) -> None:
+        """Anulează task-urile rămase și oprește bucla (o cerere ulterioară o repornește)."""
+        with self._lock:
+            loop, thread = self._loop, self._thread
+            self._loop = self._thread = None
+        if loop is None:
+            return
+
+        async def _cancel_pending():
+            tasks = [t for t in asyncio.all_tasks() if t is not asyncio.current_task()]
+            for task in tasks:
+                task.cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)
+
+        try:
+            asyncio.run_coroutine_threadsafe(_cancel_pending(), loop).result(timeout)
+        except Exception:
+            pass
+        loop.call_soon_threadsafe(loop.stop)
+        thread.join(timeout)
+        if not thread.is_alive():
+            loop.close()
+
+
+# Bucla partajată de proces.
+BACKGROUND_LOOP = BackgroundLoop()
+
+
+def submit(coro) -> concurrent.futures.Future:
+    return BACKGROUND_LOOP.submit(coro)
+
+
+def run(coro, timeout: Optional[float] = None):
+    return BACKGROUND_LOOP.run(coro, timeout)
+
+
+# Înregistrat înaintea închiderii pool-urilor, deci rulează după ea (atexit e LIFO).
+atexit.register(BACKGROUND_LOOP.shutdown)
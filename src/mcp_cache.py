@@ -0,0 +1,155 @@
+# src/mcp_cache.py — Cache de rezultate pentru uneltele MCP deterministe
+#
+# check_required_documents, estimate_processing_time și verify_cnp întorc
+# același răspuns pentru aceleași argumente cât timp tabelele din spate nu se
+# schimbă. Cache-ul stă în fața MCPClient.call: cheia este (unealtă, argumente
+# canonicalizate), fiecare unealtă are TTL-ul ei, iar o intrare e invalidată
+# imediat ce se schimbă versiunea uneia dintre tabelele de care depinde
+# (vezi database.get_table_versions). Capacitatea e limitată (LRU).
+# Versiunile se citesc cel mult o dată la VERSION_CHECK_S, în afara lacătului
+# cache-ului; MCPClient le citește pe executorul bazei (aversions), nu pe bucla
+# de evenimente. O scriere e deci observată după cel mult VERSION_CHECK_S.
+
+import os
+import json
+import time
+import threading
+from collections import OrderedDict
+from typing import Optional
+
+from src.database import get_table_versions, run_in_executor
+
+DEFAULT_MAX_ENTRIES = int(os.getenv("MCP_CACHE_SIZE", "1024"))
+VERSION_CHECK_S = float(os.getenv("MCP_CACHE_VERSION_CHECK_S", "0.25"))
+
+# unealtă -> (TTL în secunde, tabelele din care e calculat rezultatul).
+# Căutările în registru (verify_cnp, check_vehicle_status) au TTL scurt.
+CACHE_POLICY = {
+    "check_required_documents": (600.0, ("required_documents",)),
+    "estimate_processing_time": (600.0, ("processing_times",)),
+    "verify_cnp":               (30.0, ("citizens",)),
+    "check_vehicle_status":     (30.0, ("vehicles",)),
+}
+# Un CNP respins la validare (format, sumă de control, dată) nu depinde de nicio tabelă.
+FORMAT_FAILURE_TTL = 3600.0
+
+
+def cache_key(tool_name: str, arguments: dict) -> str:
+    """Cheie canonică: aceleași argumente în altă ordine dau aceeași cheie."""
+    return tool_name + ":" + json.dumps(arguments, sort_keys=True, ensure_ascii=False,
+                                        separators=(",", ":"))
+
+
+def _policy(tool_name: str, result: dict) -> Optional[tuple]:
+    """(TTL, tabele) pentru un rezultat, sau None dacă nu trebuie păstrat."""
+    if tool_name not in CACHE_POLICY:
+        return None
+    if "error" in result and "valid" not in result:
+        return None             # eroare de transport, nu un răspuns al uneltei
+    if tool_name == "verify_cnp" and not result.get("valid"):
+        return FORMAT_FAILURE_TTL, ()
+    return CACHE_POLICY[tool_name]
+
+
+class ResultCache:
+    """Cache LRU cu TTL per unealtă, invalidare la schimbarea tabelelor și contoare."""
+
+    def __init__(self, max_entries: int = DEFAULT_MAX_ENTRIES, version_check_s: float = VERSION_CHECK_S):
+        self.max_entries = max_entries
+        self.version_check_s = version_check_s
+        self._entries: OrderedDict = OrderedDict()   # cheie -> (text, expiră_la, versiuni)
+        self._lock = threading.Lock()
+        self._versions: tuple = (float("-inf"), {})  # (citite_la, {tabel: versiune})
+        self.hits = self.misses = self.evictions = self.invalidations = 0
+
+    @staticmethod
+    def cacheable(tool_name: str) -> bool:
+        return tool_name in CACHE_POLICY
+
+    def _versions_due(self) -> bool:
+        return time.monotonic() - self._versions[0] >= self.version_check_s
+
+    def versions(self) -> dict:
+        """Versiunile tabelelor, recitite din bază cel mult o dată la version_check_s (blocant)."""
+        if self._versions_due():
+            self._versions = (time.monotonic(), dict(get_table_versions()))
+        return self._versions[1]
+
+    async def aversions(self) -> dict:
+        """Ca versions(), dar citirea din bază rulează pe executorul bazei, nu pe buclă."""
+        if self._versions_due():
+            return await run_in_executor(self.versions)
+        return self._versions[1]
+
+    def get(self, tool_name: str, arguments: dict, versions: Optional[dict] = None) -> Optional[str]:
+        """Rezultatul din cache sau None. `versions` (din aversions) evită citirea blocantă."""
+        if not self.cacheable(tool_name):
+            return None
+        key = cache_key(tool_name, arguments)
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return None
+        text, expires_at, entry_versions = entry
+        stale = time.monotonic() >= expires_at
+        invalidated = False
+        if not stale and entry_versions:
+            # În afara lacătului: citirea versiunilor nu blochează celelalte fire.
+            current = self.versions() if versions is None else versions
+            stale = invalidated = any(current.get(t, 0) != v for t, v in entry_versions.items())
+        with self._lock:
+            if stale:
+                if self._entries.get(key) is entry:
+                    del self._entries[key]
+                if invalidated:
+                    self.invalidations += 1
+                self.misses += 1
+                return None
+            if key in self._entries:
+                self._entries.move_to_end(key)
+            self.hits += 1
+            return text
+
+    def snapshot(self) -> dict:
+        """Versiunile tabelelor, luate ÎNAINTE de apel: o scriere concurentă cu
+        apelul invalidează astfel rezultatul, în loc să fie mascată."""
+        return dict(self.versions())
+
+    def put(self, tool_name: str, arguments: dict, text: str,
+            versions: Optional[dict] = None) -> None:
+        try:
+            policy = _policy(tool_name, json.loads(text))
+        except (TypeError, ValueError):
+            return
+        if policy is None:
+            return
+        ttl, tables = policy
+        if versions is None:
+            versions = self.snapshot() if tables else {}
+        versions = {t: versions.get(t, 0) for t in tables}
+        key = cache_key(tool_name, arguments)
+        with self._lock:
+            self._entries[key] = (text, time.monotonic() + ttl, versions)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {
+                "entries": len(self._entries),
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "invalidations": self.invalidations,
+            }
+
+
+# Cache-ul partajat de toți clienții MCP din proces.
+RESULT_CACHE = ResultCache()
@@ -0,0 +1,409 @@
+# src/mcp_pool.py — Pool de sesiuni MCP persistente
+#
+# Până acum fiecare apel MCP pornea un proces `python src/mcp_server.py` nou,
+# făcea handshake-ul `initialize`, rula o singură unealtă și închidea totul.
+# Pool-ul ține N sesiuni „calde" (câte un proces server fiecare), pe bucla
+# asyncio de fundal partajată de proces (src/event_loop.py), astfel încât un
+# apel de unealtă costă un singur round-trip JSON-RPC.
+#
+# Sesiunile sunt multiplexate: o ClientSession acceptă cereri concurente (id-uri
+# JSON-RPC distincte), deci pool-ul nu „împrumută" exclusiv o sesiune, ci
+# rutează fiecare cerere spre workerul cu cele mai puține cereri în curs
+# (sau round-robin, MCP_ROUTING). Pe stdio fiecare sesiune e un proces server
+# separat, deci K workeri înseamnă K nuclee care servesc verify_cnp /
+# check_vehicle_status în paralel. Un supervizor verifică periodic workerii
+# inactivi prin ping și îi repornește pe cei căzuți.
+#
+# Transporturi (MCP_TRANSPORT):
+#   • stdio     — implicit; fiecare sesiune e un proces server separat (izolare).
+#   • inprocess — instanța FastMCP din src/mcp_server.py rulează pe bucla pool-ului,
+#                 conectată prin fluxuri în memorie: fără spawn, fără pipe-uri și
+#                 fără serializare JSON a mesajelor. Protocolul MCP (initialize,
+#                 list_tools, call_tool) rămâne neschimbat.
+#   • http / sse — daemonul partajat (`python src/mcp_server.py --transport
+#                 streamable-http`), la MCP_SERVER_URL, opțional pe socketul unix
+#                 MCP_SERVER_UDS: un singur server cald, cu conexiunile SQLite și
+#                 cache-urile lui, deservește toate sesiunile de pe mașină.
+
+import os
+import time
+import atexit
+import asyncio
+import itertools
+import threading
+from datetime import timedelta
+from contextlib import asynccontextmanager
+from typing import Callable, Optional
+
+import anyio
+import httpx
+from mcp import ClientSession, StdioServerParameters, types
+from mcp.client.stdio import stdio_client
+from mcp.client.sse import sse_client
+from mcp.client.streamable_http import streamable_http_client
+from mcp.shared.exceptions import McpError
+from mcp.shared.memory import create_client_server_memory_streams
+
+from src import event_loop
+from src.mcp_resilience import STATS
+
+# Transportul implicit: "stdio" (server în proces separat), "inprocess", "http" sau "sse".
+MCP_TRANSPORT = os.getenv("MCP_TRANSPORT", "stdio")
+# Adresa daemonului MCP partajat (transporturile http / sse).
+MCP_SERVER_URL = os.getenv("MCP_SERVER_URL", "http://127.0.0.1:8765/mcp")
+MCP_SERVER_UDS = os.getenv("MCP_SERVER_UDS") or None
+# Numărul de workeri (sesiuni calde) per server: implicit unul per nucleu, maxim 4.
+DEFAULT_POOL_SIZE = int(os.getenv("MCP_POOL_SIZE", str(min(os.cpu_count() or 1, 4))))
+# Politica de rutare: "least_outstanding" (implicit) sau "round_robin".
+MCP_ROUTING = os.getenv("MCP_ROUTING", "least_outstanding")
+# Cât de des verifică supervizorul workerii inactivi.
+SUPERVISE_INTERVAL_S = 10.0
+# O sesiune nefolosită mai mult de atât este verificată prin ping la următorul apel.
+HEALTH_CHECK_IDLE_S = 30.0
+# Limită pentru orice cerere JSON-RPC: un server mort nu trebuie să blocheze apelul.
+REQUEST_TIMEOUT_S = 30.0
+START_TIMEOUT_S = 20.0
+
+
+def _is_transport_error(exc: BaseException) -> bool:
+    """Eșec al conexiunii sau al sesiunii (flux închis, proces mort, socket
+    căzut), nu al unei singure cereri (timeout, eroare JSON-RPC a uneltei)."""
+    if isinstance(exc, McpError):
+        return exc.error.code == types.CONNECTION_CLOSED
+    return isinstance(exc, (anyio.ClosedResourceError, anyio.BrokenResourceError, anyio.EndOfStream,
+                            OSError, httpx.TransportError))
+
+
+class _PooledSession:
+    """O sesiune MCP de lungă durată. Trăiește într-un task propriu, pentru că
+    contextele `stdio_client` / `ClientSession` trebuie închise în task-ul
+    care le-a deschis."""
+
+    def __init__(self, connect: Callable, message_handler: Optional[Callable] = None):
+        self._connect = connect
+        self._message_handler = message_handler
+        self.session: Optional[ClientSession] = None
+        self.last_used = 0.0
+        self.starts = 0
+        self.in_flight = 0          # cereri în curs pe această sesiune
+        self.served = 0
+        self._task: Optional[asyncio.Task] = None
+        self._ready: Optional[asyncio.Event] = None
+        self._closing: Optional[asyncio.Event] = None
+        self._error: Optional[BaseException] = None
+
+    @property
+    def alive(self) -> bool:
+        return self.session is not None and self._task is not None and not self._task.done()
+
+    async def start(self) -> None:
+        self._ready, self._closing, self._error = asyncio.Event(), asyncio.Event(), None
+        self.starts += 1
+        self._task = asyncio.create_task(self._run())
+        await asyncio.wait_for(self._ready.wait(), START_TIMEOUT_S)
+        if self._error is not None:
+            raise self._error
+        self.last_used = time.monotonic()
+
+    async def _run(self) -> None:
+        try:
+            async with self._connect() as (read, write):
+                async with ClientSession(
+                    read, write,
+                    read_timeout_seconds=timedelta(seconds=REQUEST_TIMEOUT_S),
+                    message_handler=self._message_handler,
+                ) as session:
+                    await session.initialize()
+                    self.session = session
+                    self._ready.set()
+                    await self._closing.wait()
+        except Exception as e:
+            self._error = e
+        finally:
+            self.session = None
+            self._ready.set()
+
+    async def ping(self) -> bool:
+        try:
+            await asyncio.wait_for(self.session.send_ping(), 5)
+            return True
+        except Exception:
+            return False
+
+    async def close(self) -> None:
+        if self._task is None:
+            return
+        self._closing.set()
+        try:
+            await asyncio.wait_for(self._task, 5)
+        except Exception:
+            self._task.cancel()
+        self._task = None
+
+
+class MCPSessionPool:
+    """Pool de N sesiuni MCP calde, cu verificare de sănătate și repornire la eșec.
+
+    Metodele async rulează pe bucla de fundal a procesului; `run()` / `submit()`
+    sunt fațada sincronă folosită de codul Streamlit.
+    """
+
+    def __init__(self, connect: Callable, size: int = DEFAULT_POOL_SIZE,
+                 routing: str = MCP_ROUTING):
+        if routing not in ("least_outstanding", "round_robin"):
+            raise ValueError(f"Politică de rutare necunoscută: {routing!r}")
+        self._connect = connect
+        self.size = max(1, size)
+        self.routing = routing
+        self._slots = [_PooledSession(connect, self._on_message) for _ in range(self.size)]
+        self._tools_changed_listeners: list = []
+        self._rr = itertools.count()
+        self._opened = False
+        self._slot_locks: list = []
+        self._supervisor: Optional[asyncio.Task] = None
+
+    # ── Notificări de la server ──────────────────────────────────────────────
+    def on_tools_changed(self, callback: Callable) -> None:
+        """Înregistrează un callback apelat când serverul anunță `tools/list_changed`."""
+        if callback not in self._tools_changed_listeners:
+            self._tools_changed_listeners.append(callback)
+
+    async def _on_message(self, message) -> None:
+        if isinstance(message, types.ServerNotification) \
+                and isinstance(message.root, types.ToolListChangedNotification):
+            for callback in list(self._tools_changed_listeners):
+                callback()
+
+    # ── Fațada sincronă ──────────────────────────────────────────────────────
+    def run(self, coro):
+        """Rulează o corutină pe bucla de fundal și așteaptă rezultatul (sincron)."""
+        self._opened = True
+        return event_loop.run(coro)
+
+    def submit(self, coro):
+        """Pornește o corutină pe bucla de fundal; întoarce un concurrent.futures.Future."""
+        self._opened = True
+        return event_loop.submit(coro)
+
+    # ── Gestiunea sesiunilor ─────────────────────────────────────────────────
+    async def _ensure_slot(self, i: int) -> _PooledSession:
+        if not self._slot_locks:
+            self._slot_locks = [asyncio.Lock() for _ in self._slots]
+        slot = self._slots[i]
+        async with self._slot_locks[i]:
+            if slot.alive and time.monotonic() - slot.last_used > HEALTH_CHECK_IDLE_S:
+                if not await slot.ping():
+                    print(f"⚠️ [MCPSessionPool] Sesiunea {i} nu răspunde la ping; o repornesc.")
+                    await slot.close()
+            if not slot.alive:
+                await slot.close()
+                await slot.start()
+        return slot
+
+    async def start(self) -> None:
+        """Pornește toți workerii în paralel și supervizorul (idempotent)."""
+        if self._supervisor is None:
+            self._supervisor = asyncio.create_task(self._supervise())
+            await asyncio.gather(*(self._ensure_slot(i) for i in range(self.size)),
+                                 return_exceptions=True)
+
+    def _pick(self) -> int:
+        start = next(self._rr) % self.size
+        if self.routing == "round_robin":
+            return start
+        # Cel mai puțin ocupat worker; la egalitate, rotația evită să-l încărcăm mereu pe primul.
+        order = [(start + k) % self.size for k in range(self.size)]
+        return min(order, key=lambda i: self._slots[i].in_flight)
+
+    async def _acquire(self) -> tuple[int, _PooledSession]:
+        await self.start()
+        i = self._pick()
+        return i, await self._ensure_slot(i)
+
+    async def _restart(self, i: int) -> None:
+        # Sesiunea e doar închisă; următorul `_acquire` pe acest slot o repornește.
+        await self._slots[i].close()
+
+    async def _request(self, op: Callable):
+        """Rulează `op(session)` pe o sesiune caldă. Dacă sesiunea a căzut,
+        o repornește și reîncearcă o singură dată (uneltele registrului sunt
+        idempotente). O eroare a cererii însăși (timeout, eroare JSON-RPC) doar
+        se propagă: sesiunea e multiplexată, iar repornirea ar anula și
+        celelalte cereri în curs pe ea."""
+        for attempt in range(2):
+            i, slot = await self._acquire()
+            slot.in_flight += 1
+            try:
+                result = await op(slot.session)
+                slot.last_used = time.monotonic()
+                slot.served += 1
+                return result
+            except Exception as e:
+                if slot.alive and not _is_transport_error(e):
+                    raise
+                await self._restart(i)
+                if attempt:
+                    raise
+                STATS.incr("retries")
+            finally:
+                slot.in_flight -= 1
+
+    async def call_tool(self, tool_name: str, arguments: dict):
+        return await self._request(lambda s: s.call_tool(tool_name, arguments=arguments))
+
+    async def list_tools(self):
+        return await self._request(lambda s: s.list_tools())
+
+    # ── Supervizor ───────────────────────────────────────────────────────────
+    async def check_workers(self) -> int:
+        """Repornește workerii porniți deja care sunt morți sau nu răspund la ping.
+        Workerii ocupați sunt lăsați în pace: o cerere în curs dovedește că trăiesc."""
+        restarted = 0
+        for i, slot in enumerate(self._slots):
+            if slot.starts == 0 or slot.in_flight:
+                continue
+            if slot.alive and await slot.ping():
+                slot.last_used = time.monotonic()
+                continue
+            print(f"⚠️ [MCPSessionPool] Workerul {i} e căzut; îl repornesc.")
+            try:
+                async with self._slot_locks[i]:
+                    await slot.close()
+                    await slot.start()
+                restarted += 1
+            except Exception as e:
+                print(f"⚠️ [MCPSessionPool] Repornirea workerului {i} a eșuat: {e}")
+        return restarted
+
+    async def _supervise(self) -> None:
+        while True:
+            await asyncio.sleep(SUPERVISE_INTERVAL_S)
+            try:
+                await self.check_workers()
+            except Exception as e:
+                print(f"⚠️ [MCPSessionPool] Supervizorul a întâlnit o eroare: {e}")
+
+    def stats(self) -> dict:
+        return {
+            "size": self.size,
+            "routing": self.routing,
+            "alive": sum(1 for s in self._slots if s.alive),
+            "restarts": sum(max(0, s.starts - 1) for s in self._slots),
+            "workers": [
+                {"alive": s.alive, "in_flight": s.in_flight, "served": s.served, "starts": s.starts}
+                for s in self._slots
+            ],
+        }
+
+    async def _close_all(self) -> None:
+        if self._supervisor is not None:
+            self._supervisor.cancel()
+            self._supervisor = None
+        await asyncio.gather(*(s.close() for s in self._slots), return_exceptions=True)
+
+    def close(self) -> None:
+        """Oprește toate sesiunile pool-ului (bucla de fundal rămâne pentru ceilalți)."""
+        if not self._opened or not event_loop.BACKGROUND_LOOP.running:
+            return
+        try:
+            self.run(self._close_all())
+        finally:
+            self._opened = False
+            self._slot_locks = []
+
+
+# ─── Pool-uri partajate la nivel de proces ────────────────────────────────────
+
+_pools: dict = {}
+_pools_lock = threading.Lock()
+
+
+def stdio_connector(server_script: str) -> Callable:
+    """Fabrică de conexiuni stdio către `python <server_script>`."""
+    params = StdioServerParameters(command="python", args=[server_script])
+    return lambda: stdio_client(params)
+
+
+@asynccontextmanager
+async def _inprocess_streams():
+    # Import târziu: serverul (și baza de date) se încarcă doar dacă e cerut.
+    from src.mcp_server import mcp as fastmcp
+
+    server = fastmcp._mcp_server
+    async with create_client_server_memory_streams() as (client_streams, server_streams):
+        async with anyio.create_task_group() as tg:
+            tg.start_soon(lambda: server.run(
+                server_streams[0], server_streams[1], server.create_initialization_options()
+            ))
+            try:
+                yield client_streams
+            finally:
+                tg.cancel_scope.cancel()
+
+
+def inprocess_connector() -> Callable:
+    """Fabrică de conexiuni în memorie către instanța FastMCP din src/mcp_server.py."""
+    return _inprocess_streams
+
+
+def http_connector(url: str, uds: Optional[str] = None, transport: str = "http") -> Callable:
+    """Fabrică de conexiuni către daemonul MCP (streamable-HTTP sau SSE), prin TCP
+    sau prin socketul unix `uds`."""
+    def client_factory(headers=None, timeout=None, auth=None) -> httpx.AsyncClient:
+        return httpx.AsyncClient(
+            transport=httpx.AsyncHTTPTransport(uds=uds) if uds else None,
+            headers=headers, timeout=timeout or httpx.Timeout(30, read=300),
+            auth=auth, follow_redirects=True,
+        )
+
+    @asynccontextmanager
+    async def connect():
+        if transport == "sse":
+            async with sse_client(url, httpx_client_factory=client_factory) as (read, write):
+                yield read, write
+        else:
+            async with client_factory() as http_client:
+                async with streamable_http_client(url, http_client=http_client) \
+                        as (read, write, _session_id):
+                    yield read, write
+
+    return connect
+
+
+def get_pool(server_script: str, transport: Optional[str] = None,
+             size: Optional[int] = None, url: Optional[str] = None) -> MCPSessionPool:
+    """Întoarce pool-ul partajat pentru (transport, țintă), creat la prima cerere.
+
+    Ținta e scriptul serverului pentru stdio / inprocess și URL-ul daemonului
+    pentru http / sse.
+    """
+    transport = transport or MCP_TRANSPORT
+    target = (url or MCP_SERVER_URL) if transport in ("http", "sse") else server_script
+    with _pools_lock:
+        key = (transport, target)
+        pool = _pools.get(key)
+        if pool is None:
+            if transport == "stdio":
+                pool = MCPSessionPool(stdio_connector(server_script), size or DEFAULT_POOL_SIZE)
+            elif transport == "inprocess":
+                # Toate sesiunile ar împărți aceeași instanță de server: una ajunge.
+                pool = MCPSessionPool(inprocess_connector(), size or 1)
+            elif transport in ("http", "sse"):
+                # Sesiunile sunt multiplexate, iar daemonul e unul singur: una ajunge.
+                pool = MCPSessionPool(http_connector(target, MCP_SERVER_UDS, transport), size or 1)
+            else:
+                raise ValueError(f"Transport MCP necunoscut: {transport!r}")
+            _pools[key] = pool
+        return pool
+
+
+@atexit.register
+def close_pools() -> None:
+    with _pools_lock:
+        pools = list(_pools.values())
+        _pools.clear()
+    for pool in pools:
+        try:
+            pool.close()
+        except Exception:
+            pass
@@ -0,0 +1,150 @@
+# src/mcp_resilience.py — Termene, circuit breaker și contoare pentru apelurile MCP
+#
+# Un `stdio_client` blocat nu trebuie să blocheze scriptul Streamlit, iar o
+# eroare de transport nu trebuie confundată cu un CNP invalid. De aceea:
+#   • fiecare unealtă are un termen propriu (TOOL_TIMEOUTS), plafonat de bugetul
+#     rămas al turei `think()` (Deadline);
+#   • un circuit breaker per server oprește apelurile cât timp serverul e
+#     nesănătos — clientul trece direct pe calea deterministă locală;
+#   • căutările idempotente pot fi „hedged": dacă primul răspuns întârzie,
+#     se trimite o a doua cerere pe alt worker și câștigă primul răspuns.
+# Toate evenimentele sunt numărate în STATS.
+
+import os
+import time
+import threading
+
+# Termen implicit per unealtă (secunde) și excepțiile.
+DEFAULT_TOOL_TIMEOUT_S = float(os.getenv("MCP_TOOL_TIMEOUT", "5"))
+TOOL_TIMEOUTS = {
+    "verify_cnp": 3.0,
+    "check_vehicle_status": 3.0,
+    "check_required_documents": 3.0,
+    "estimate_processing_time": 3.0,
+}
+# Bugetul end-to-end al unei ture `think()` (LLM + toate apelurile MCP).
+TURN_BUDGET_S = float(os.getenv("THINK_BUDGET_S", "20"))
+
+# Unelte fără efecte secundare, pentru care o a doua cerere e inofensivă.
+IDEMPOTENT_TOOLS = frozenset({
+    "verify_cnp", "check_vehicle_status", "check_required_documents",
+    "estimate_processing_time", "get_available_appointments",
+    "verify_cnp_batch", "check_vehicles_batch",
+})
+# După cât timp fără răspuns se trimite cererea „hedged" (nesetat = dezactivat).
+HEDGE_AFTER_S = float(os.environ["MCP_HEDGE_AFTER_S"]) if os.getenv("MCP_HEDGE_AFTER_S") else None
+
+BREAKER_FAILURE_THRESHOLD = 5
+BREAKER_COOLDOWN_S = 15.0
+
+
+class MCPUnavailable(Exception):
+    """Serverul MCP nu a răspuns (termen depășit, circuit deschis, transport căzut)."""
+
+
+def tool_timeout(tool_name: str) -> float:
+    return TOOL_TIMEOUTS.get(tool_name, DEFAULT_TOOL_TIMEOUT_S)
+
+
+class Deadline:
+    """Bugetul de timp rămas al unei ture, transmis în jos fiecărui apel."""
+
+    def __init__(self, budget_s: float = TURN_BUDGET_S):
+        self.expires_at = time.monotonic() + budget_s
+
+    def remaining(self) -> float:
+        return max(0.0, self.expires_at - time.monotonic())
+
+    @property
+    def expired(self) -> bool:
+        return self.remaining() <= 0
+
+
+class ResilienceStats:
+    """Contoare de proces pentru timeout-uri, breaker, reîncercări și hedging."""
+
+    FIELDS = ("timeouts", "budget_exhausted", "failures", "breaker_trips",
+              "short_circuits", "retries", "hedges", "hedge_wins", "fallbacks")
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._counts = dict.fromkeys(self.FIELDS, 0)
+
+    def incr(self, name: str, n: int = 1) -> None:
+        with self._lock:
+            self._counts[name] += n
+
+    def snapshot(self) -> dict:
+        with self._lock:
+            return dict(self._counts)
+
+
+STATS = ResilienceStats()
+
+
+class CircuitBreaker:
+    """closed → (N eșecuri consecutive) → open → (cooldown) → half_open → o probă.
+
+    O probă reușită închide circuitul; una eșuată îl redeschide pentru încă un cooldown.
+    """
+
+    def __init__(self, failure_threshold: int = BREAKER_FAILURE_THRESHOLD,
+                 cooldown_s: float = BREAKER_COOLDOWN_S):
+        self.failure_threshold = failure_threshold
+        self.cooldown_s = cooldown_s
+        self.state = "closed"
+        self.failures = 0
+        self._opened_at = 0.0
+        self._probe_in_flight = False
+        self._lock = threading.Lock()
+
+    @property
+    def healthy(self) -> bool:
+        """Fals cât timp circuitul e deschis și cooldown-ul nu a expirat."""
+        with self._lock:
+            return self.state != "open" or time.monotonic() - self._opened_at >= self.cooldown_s
+
+    def allow(self) -> bool:
+        with self._lock:
+            if self.state == "closed":
+                return True
+            if self.state == "open":
+                if time.monotonic() - self._opened_at < self.cooldown_s:
+                    return False
+                self.state = "half_open"
+            if self._probe_in_flight:
+                return False
+            self._probe_in_flight = True
+            return True
+
+    def record_success(self) -> None:
+        with self._lock:
+            self.state, self.failures, self._probe_in_flight = "closed", 0, False
+
+    def release_probe(self) -> None:
+        """Proba a fost anulată fără verdict: următoarea cerere poate fi o probă nouă."""
+        with self._lock:
+            self._probe_in_flight = False
+
+    def record_failure(self) -> None:
+        with self._lock:
+            self.failures += 1
+            self._probe_in_flight = False
+            if self.state == "half_open" or self.failures >= self.failure_threshold:
+                if self.state != "open":
+                    STATS.incr("breaker_trips")
+                self.state = "open"
+                self._opened_at = time.monotonic()
+
+
+_breakers: dict = {}
+_breakers_lock = threading.Lock()
+
+
+def breaker_for(pool) -> CircuitBreaker:
+    """Breaker-ul partajat al unui pool (un server = o stare de sănătate)."""
+    with _breakers_lock:
+        breaker = _breakers.get(id(pool))
+        if breaker is None:
+            breaker = _breakers[id(pool)] = CircuitBreaker()
+        return breaker
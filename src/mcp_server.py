@@ -1,37 +1,88 @@
 # src/mcp_server.py — Server MCP cu instrumente multiple (date din SQLite)
+#
+# Moduri de rulare:
+#   python src/mcp_server.py                          — stdio (proces copil al clientului)
+#   python src/mcp_server.py --transport streamable-http [--port 8765 | --uds /tmp/mcp.sock]
+#       — daemon local, partajat de toate sesiunile și replicile aplicației de pe mașină
+#         (clientul: MCP_TRANSPORT=http, MCP_SERVER_URL, opțional MCP_SERVER_UDS).
+#
+# Uneltele sunt `async def`: citirile din registru rulează pe executorul de
+# citiri din src/database.py (aget_*), deci o cerere care așteaptă discul nu
+# blochează celelalte cereri ale aceluiași proces.
 import json
+import argparse
 import re
 import os
 import sys
 from datetime import datetime
 from mcp.server.fastmcp import FastMCP
 sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
-from src.database import get_citizen, get_vehicle, get_appointments, get_required_documents, get_processing_time
+from src.database import (
+    aget_citizen, aget_vehicle, aget_citizens, aget_vehicles,
+    aget_appointments, aget_required_documents, aget_processing_time,
+    ensure_schema,
+)
+from src.cnp import validate_cnps, CNP_OK, BAD_FORMAT, BAD_CHECKSUM, BAD_GENDER, BAD_MONTH, BAD_DAY
 
 mcp = FastMCP("RegistruCetateni")
 
 
+def _cnp_error(code: int, year: int = 0, month: int = 0, day: int = 0) -> dict:
+    """Răspunsul pentru un CNP respins, după codul verificării eșuate (vezi src/cnp.py)."""
+    if code == BAD_FORMAT:
+        error = "CNP-ul trebuie să conțină exact 13 cifre."
+    elif code == BAD_CHECKSUM:
+        error = "Sumă de control invalidă. Numărul nu respectă standardul național."
+    elif code == BAD_GENDER:
+        error = "CNP invalid: prima cifră trebuie să fie între 1 și 8."
+    elif code == BAD_MONTH:
+        error = f"CNP invalid: luna {month} nu există."
+    else:
+        error = f"CNP invalid: ziua {day} nu există în luna {month}/{year}."
+    return {"valid": False, "error": error}
+
+
+def _cnp_found(citizen: dict | None, gender_digit: int, year: int, month: int, day: int) -> dict:
+    """Răspunsul pentru un CNP valid: datele din registru sau metadatele decodate."""
+    if citizen:
+        return {"valid": True, "data": citizen}
+
+    # Decodare metadate pentru CNP-uri necunoscute
+    gender = "Masculin" if gender_digit in [1, 3, 5, 7] else "Feminin"
+    dob = f"{day:02d}/{month:02d}/{year}"
+
+    return {
+        "valid": True,
+        "data": {
+            "name": "Cetățean Necunoscut",
+            "dob": dob,
+            "gender": gender,
+            "status": "Nu figurează în registrul local — sumă de control validă",
+        },
+    }
+
+
 @mcp.tool()
-def verify_cnp(cnp: str) -> str:
+async def verify_cnp(cnp: str) -> str:
     """
     Verifică un Cod Numeric Personal (CNP) în registrul național.
     Validează formatul, suma de control și caută în baza de date.
     """
     cnp = cnp.strip()
     if not re.match(r"^\d{13}$", cnp):
-        return json.dumps({"valid": False, "error": "CNP-ul trebuie să conțină exact 13 cifre."})
+        return json.dumps(_cnp_error(BAD_FORMAT))
 
     # Verificare sumă de control
     weights = [2, 7, 9, 1, 4, 6, 3, 5, 8, 2, 7, 9]
     checksum = sum(int(cnp[i]) * weights[i] for i in range(12)) % 11
     expected_digit = 1 if checksum == 10 else checksum
     if int(cnp[12]) != expected_digit:
-        return json.dumps({"valid": False, "error": "Sumă de control invalidă. Numărul nu respectă standardul național."})
+        return json.dumps(_cnp_error(BAD_CHECKSUM))
 
     # Validare dată de naștere
     gender_digit = int(cnp[0])
     if gender_digit not in [1, 2, 3, 4, 5, 6, 7, 8]:
-        return json.dumps({"valid": False, "error": "CNP invalid: prima cifră trebuie să fie între 1 și 8."})
+        return json.dumps(_cnp_error(BAD_GENDER))
 
     century_map = {1: "19", 2: "19", 3: "18", 4: "18", 5: "20", 6: "20", 7: "19", 8: "19"}
     century = century_map[gender_digit]
@@ -41,53 +92,73 @@ def verify_cnp(cnp: str) -> str:
     day = int(cnp[5:7])
 
     if not (1 <= month <= 12):
-        return json.dumps({"valid": False, "error": f"CNP invalid: luna {month} nu există."})
+        return json.dumps(_cnp_error(BAD_MONTH, year, month, day))
 
     import calendar
     max_day = calendar.monthrange(year, month)[1]
     if not (1 <= day <= max_day):
-        return json.dumps({"valid": False, "error": f"CNP invalid: ziua {day} nu există în luna {month}/{year}."})
+        return json.dumps(_cnp_error(BAD_DAY, year, month, day))
 
     # Căutare în baza de date SQLite
-    citizen = get_citizen(cnp)
-    if citizen:
-        return json.dumps({"valid": True, "data": citizen})
+    return json.dumps(_cnp_found(await aget_citizen(cnp), gender_digit, year, month, day))
 
-    # Decodare metadate pentru CNP-uri necunoscute
-    gender = "Masculin" if gender_digit in [1, 3, 5, 7] else "Feminin"
-    dob = f"{day:02d}/{month:02d}/{year}"
 
-    return json.dumps({
-        "valid": True,
-        "data": {
-            "name": "Cetățean Necunoscut",
-            "dob": dob,
-            "gender": gender,
-            "status": "Nu figurează în registrul local — sumă de control validă",
-        },
-    })
+@mcp.tool()
+async def verify_cnp_batch(cnps: list[str]) -> str:
+    """
+    Verifică un lot de CNP-uri (ex. extras de registru, dosar de familie).
+    Fiecare rezultat este identic cu cel al verify_cnp pentru același CNP,
+    în ordinea listei primite.
+    """
+    cnps = [c.strip() for c in cnps]
+    codes, fields = validate_cnps(cnps)
+    registry = await aget_citizens([c for c, code in zip(cnps, codes) if code == CNP_OK])
+
+    results = []
+    for cnp, code, (gender_digit, year, month, day) in zip(cnps, codes.tolist(), fields.tolist()):
+        if code == CNP_OK:
+            results.append(_cnp_found(registry.get(cnp), gender_digit, year, month, day))
+        else:
+            results.append(_cnp_error(code, year, month, day))
+    return json.dumps({"count": len(results), "results": results})
 
 
 @mcp.tool()
-def check_vehicle_status(vin: str) -> str:
+async def check_vehicle_status(vin: str) -> str:
     """
     Caută un Număr de Identificare a Vehiculului (VIN) în registrul național.
     Returnează proprietarul, marca/modelul, anul și statusul legal.
     """
     vin = vin.strip().upper()
-    vehicle = get_vehicle(vin)
+    vehicle = await aget_vehicle(vin)
     if vehicle:
         return json.dumps({"found": True, "data": vehicle})
     return json.dumps({"found": False, "message": "VIN-ul nu a fost găsit în registru. Procedați cu verificare manuală."})
 
 
 @mcp.tool()
-def get_available_appointments(service_type: str) -> str:
+async def check_vehicles_batch(vins: list[str]) -> str:
+    """
+    Caută un lot de VIN-uri în registrul național de vehicule, cu o singură
+    interogare. Fiecare rezultat este identic cu cel al check_vehicle_status.
+    """
+    vins = [v.strip().upper() for v in vins]
+    registry = await aget_vehicles(vins)
+    results = [
+        {"found": True, "data": registry[vin]} if vin in registry
+        else {"found": False, "message": "VIN-ul nu a fost găsit în registru. Procedați cu verificare manuală."}
+        for vin in vins
+    ]
+    return json.dumps({"count": len(results), "results": results})
+
+
+@mcp.tool()
+async def get_available_appointments(service_type: str) -> str:
     """
     Obține programările disponibile pentru un serviciu guvernamental.
     Returnează o listă de date și ore disponibile la cel mai apropiat birou.
     """
-    slots = get_appointments(limit=5)
+    slots = await aget_appointments(limit=5)
     return json.dumps({
         "service": service_type,
         "available_slots": slots,
@@ -96,12 +167,12 @@ def get_available_appointments(service_type: str) -> str:
 
 
 @mcp.tool()
-def estimate_processing_time(service_type: str, is_urgent: bool = False) -> str:
+async def estimate_processing_time(service_type: str, is_urgent: bool = False) -> str:
     """
     Returnează timpul estimat de procesare pentru un tip de serviciu.
     Suportă procesare urgentă pentru gestionare accelerată.
     """
-    times = get_processing_time(service_type)
+    times = await aget_processing_time(service_type)
     mode = "urgent" if is_urgent else "standard"
     estimated = times["urgent"] if is_urgent else times["standard"]
     return json.dumps({
@@ -113,12 +184,12 @@ def estimate_processing_time(service_type: str, is_urgent: bool = False) -> str:
 
 
 @mcp.tool()
-def check_required_documents(service_type: str) -> str:
+async def check_required_documents(service_type: str) -> str:
     """
     Returnează lista oficială de documente fizice necesare pentru
     completarea unei cereri de serviciu guvernamental.
     """
-    docs = get_required_documents(service_type)
+    docs = await aget_required_documents(service_type)
     if not docs:
         docs = ["Vă rugăm contactați biroul local pentru lista de documente."]
     return json.dumps({
@@ -127,5 +198,27 @@ def check_required_documents(service_type: str) -> str:
     })
 
 
+def main(argv=None) -> None:
+    parser = argparse.ArgumentParser(description="Server MCP RegistruCetateni")
+    parser.add_argument("--transport", choices=["stdio", "streamable-http", "sse"], default="stdio")
+    parser.add_argument("--host", default="127.0.0.1", help="doar localhost: serverul nu are autentificare")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--uds", help="socket unix pe care ascultă daemonul (în loc de host/port)")
+    args = parser.parse_args(argv)
+    ensure_schema()
+
+    if args.transport == "stdio":
+        mcp.run()
+        return
+
+    mcp.settings.host, mcp.settings.port = args.host, args.port
+    if args.uds:
+        import uvicorn
+        app = mcp.streamable_http_app() if args.transport == "streamable-http" else mcp.sse_app()
+        uvicorn.run(app, uds=args.uds, log_level="warning")
+    else:
+        mcp.run(transport=args.transport)
+
+
 if __name__ == "__main__":
-    mcp.run()
+    main()
@@ -0,0 +1,501 @@
+# src/registry_loader.py — Import în masă al registrelor de cetățeni și vehicule
+#
+# seed_db pune în bază trei cetățeni și două vehicule; în producție tabelele
+# `citizens` și `vehicles` oglindesc registre naționale cu milioane de rânduri.
+# Importul citește extrase CSV sau NDJSON ca flux (memorie constantă: doar un
+# lot în memorie), validează fiecare lot (CNP-urile cu aceleași reguli ca
+# verify_cnp, vectorizat prin src/cnp.py) și scrie cu executemany, totul într-o
+# singură tranzacție. Pe durata importului indecșii secundari și triggerele de
+# versiune ale tabelei sunt scoși și recreați la final (o singură creștere de
+# versiune în loc de una per rând); un import întrerupt nu schimbă nimic.
+#
+#   python -m src.registry_loader load citizens extras.csv [--batch-size 50000]
+#   python -m src.registry_loader generate citizens 1000000 citizens.ndjson
+#   python -m src.registry_loader bench --rows 1000000 --db /tmp/bench.db
+#   python -m src.registry_loader publish   — registrele devin un instantaneu
+#       imuabil (REGISTRY_SNAPSHOT_PATH), citit de get_citizen / get_vehicle;
+#       cu --db, implicit registry_snapshot_<bază>.db, alături de baza țintă
+#   python -m src.registry_loader publish --layout compact   — același
+#       instantaneu, cu tabele STRICT, WITHOUT ROWID și chei INTEGER
+#
+# CSV: antet cu numele coloanelor (cnp,name,dob,status,address /
+# vin,make,model,year,status,owner_cnp). NDJSON: un obiect JSON per linie.
+
+import os
+import re
+import sys
+import csv
+import json
+import time
+import sqlite3
+import random
+import argparse
+import datetime
+from itertools import islice
+from typing import Iterable, Iterator, Optional
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+from src import database as db
+from src.cnp import validate_cnps, CNP_OK, CNP_WEIGHTS
+
+DEFAULT_BATCH_SIZE = 50_000
+
+# Coloanele fiecărui registru, în ordinea din INSERT.
+REGISTRY_COLUMNS = {
+    "citizens": ("cnp", "name", "dob", "status", "address"),
+    "vehicles": ("vin", "make", "model", "year", "status", "owner_cnp"),
+}
+# VIN: 17 caractere, fără I, O, Q (ISO 3779).
+_VIN_RE = re.compile(r"^[A-HJ-NPR-Z0-9]{17}$")
+
+
+# ── Citirea extraselor ─────────────────────────────────────────────────────
+
+def iter_records(path: str, fmt: Optional[str] = None) -> Iterator[dict]:
+    """Citește un extras CSV sau NDJSON rând cu rând (formatul după extensie)."""
+    fmt = fmt or ("csv" if path.lower().endswith(".csv") else "ndjson")
+    with open(path, encoding="utf-8", newline="") as f:
+        if fmt == "csv":
+            yield from csv.DictReader(f)
+        elif fmt == "ndjson":
+            for line in f:
+                if line.strip():
+                    yield json.loads(line)
+        else:
+            raise ValueError(f"Format necunoscut: {fmt!r} (csv sau ndjson)")
+
+
+def _citizen_rows(batch: list) -> tuple:
+    cnps = [str(r.get("cnp") or "").strip() for r in batch]
+    codes = validate_cnps(cnps)[0]
+    rows = [
+        (cnp, r.get("name") or "", r.get("dob") or "", r.get("status") or "", r.get("address"))
+        for cnp, code, r in zip(cnps, codes.tolist(), batch) if code == CNP_OK and r.get("name")
+    ]
+    return rows, len(batch) - len(rows)
+
+
+def _vehicle_rows(batch: list) -> tuple:
+    rows = []
+    for r in batch:
+        vin = str(r.get("vin") or "").strip().upper()
+        try:
+            year = int(r.get("year"))
+        except (TypeError, ValueError):
+            continue
+        if _VIN_RE.match(vin) and r.get("make"):
+            rows.append((vin, r["make"], r.get("model") or "", year, r.get("status") or "",
+                         r.get("owner_cnp") or None))
+    return rows, len(batch) - len(rows)
+
+
+_ROW_BUILDERS = {"citizens": _citizen_rows, "vehicles": _vehicle_rows}
+
+
+# ── Importul ───────────────────────────────────────────────────────────────
+
+def _secondary_indexes(conn, table: str) -> list:
+    """(nume, SQL) pentru indecșii creați explicit pe tabelă (nu cei de cheie primară)."""
+    return conn.execute(
+        "SELECT name, sql FROM sqlite_master WHERE type = 'index' AND tbl_name = ? AND sql IS NOT NULL",
+        (table,),
+    ).fetchall()
+
+
+def load_records(records: Iterable[dict], table: str,
+                 batch_size: int = DEFAULT_BATCH_SIZE, progress=None) -> dict:
+    """Importă `records` în `table` (citizens / vehicles), lot cu lot.
+
+    Rândurile invalide sunt sărite și numărate; un CNP / VIN deja existent este
+    înlocuit. `progress(loaded, rejected)` e apelat după fiecare lot. Importul
+    e atomic: la o excepție (sau oprirea procesului) tabela rămâne neschimbată.
+    Întoarce {table, loaded, rejected, seconds, rows_per_s}.
+    """
+    if table not in REGISTRY_COLUMNS:
+        raise ValueError(f"Registru necunoscut: {table!r}")
+    columns = REGISTRY_COLUMNS[table]
+    insert = (f"INSERT OR REPLACE INTO {table} ({', '.join(columns)}) "
+              f"VALUES ({', '.join('?' * len(columns))})")
+    build_rows = _ROW_BUILDERS[table]
+
+    conn = db.get_connection()
+    loaded = rejected = 0
+    start = time.perf_counter()
+    records = iter(records)
+    # Totul într-o singură tranzacție: un import eșuat sau oprit brusc nu lasă
+    # nici rânduri parțiale, nici tabela fără indecși și triggere de versiune.
+    conn.execute("BEGIN IMMEDIATE")
+    try:
+        indexes = _secondary_indexes(conn, table)
+        for name, _ in indexes:
+            conn.execute(f"DROP INDEX {name}")
+        db.drop_version_triggers(conn, table)
+        while True:
+            batch = list(islice(records, batch_size))
+            if not batch:
+                break
+            rows, bad = build_rows(batch)
+            conn.executemany(insert, rows)
+            loaded += len(rows)
+            rejected += bad
+            if progress:
+                progress(loaded, rejected)
+        # Indecșii se reconstruiesc o singură dată, pe datele complete.
+        for _, sql in indexes:
+            conn.execute(sql)
+        db.create_version_triggers(conn, table)
+        db.bump_table_version(conn, table)
+        conn.commit()
+    finally:
+        conn.close()                # anulează tranzacția dacă nu a fost confirmată
+
+    seconds = time.perf_counter() - start
+    return {
+        "table": table,
+        "loaded": loaded,
+        "rejected": rejected,
+        "seconds": round(seconds, 3),
+        "rows_per_s": int(loaded / seconds) if seconds > 0 else loaded,
+    }
+
+
+def load_file(path: str, table: str, fmt: Optional[str] = None,
+              batch_size: int = DEFAULT_BATCH_SIZE, progress=None) -> dict:
+    """Importă un extras CSV / NDJSON în `table`."""
+    return load_records(iter_records(path, fmt), table, batch_size, progress)
+
+
+# ── Publicarea instantaneului ──────────────────────────────────────────────
+
+# Rescrierea în schema compactă, în SQL. Adresa se împarte la ultimul „, ":
+# get_citizen o refă ca „stradă, localitate"; fără separator, adresa rămâne
+# întreagă în `street`. Cazul obișnuit (cel mult un separator) se rezolvă cu
+# instr; restul trece prin funcția registry_address (str.rpartition).
+_CNP_GLOB = "'" + "[0-9]" * 13 + "'"
+_FIRST = "instr(address, ', ')"
+_TAIL = f"substr(address, {_FIRST} + 2)"
+_STREET = (f"CASE WHEN {_FIRST} = 0 THEN address WHEN instr({_TAIL}, ', ') = 0 "
+           f"THEN substr(address, 1, {_FIRST} - 1) ELSE registry_address(address, 0) END")
+_LOCALITY = (f"CASE WHEN {_FIRST} = 0 THEN NULL WHEN instr({_TAIL}, ', ') = 0 "
+             f"THEN {_TAIL} ELSE registry_address(address, 1) END")
+
+
+def _split_address(address, part: int):
+    """Partea `part` a adresei: 0 = strada, 1 = localitatea (None fără „, ")."""
+    if address is None:
+        return None
+    street, sep, locality = address.rpartition(", ")
+    if not sep:
+        return None if part else address
+    return locality if part else street
+
+
+# (tip, tabelă, expresie): valorile codificate prin registry_codes.
+_DICTIONARY = (
+    ("citizen_status", "citizens", "status"),
+    ("locality", "citizens", _LOCALITY),
+    ("make", "vehicles", "make"),
+    ("model", "vehicles", "model"),
+    ("vehicle_status", "vehicles", "status"),
+)
+
+
+def _code(kind: str, expr: str) -> str:
+    return f"(SELECT code FROM temp.registry_dictionary WHERE kind = '{kind}' AND value = {expr})"
+
+
+def _copy_compact(out) -> None:
+    """Rescrie source.citizens / source.vehicles în schema compactă din `main`.
+
+    Rândurile se inserează în ordinea cheii primare, deci tabelele WITHOUT
+    ROWID cresc doar la final (pagini pline, fără despicări).
+    """
+    bad = out.execute(f"SELECT cnp FROM source.citizens WHERE cnp NOT GLOB {_CNP_GLOB} LIMIT 1").fetchone()
+    if bad:
+        raise ValueError(f"CNP invalid în registru, nu poate fi cheie INTEGER: {bad[0]!r}")
+    out.create_function("registry_address", 2, _split_address, deterministic=True)
+    for statement in db.COMPACT_REGISTRY_SCHEMA:
+        out.execute(statement)
+    out.execute("""CREATE TEMP TABLE registry_dictionary (
+        kind TEXT NOT NULL, value TEXT NOT NULL, code INTEGER NOT NULL, PRIMARY KEY (kind, value)
+    ) WITHOUT ROWID""")
+    for kind, table, expr in _DICTIONARY:
+        out.execute(f"""INSERT INTO temp.registry_dictionary (kind, value, code)
+                        SELECT ?, value, row_number() OVER (ORDER BY value)
+                        FROM (SELECT DISTINCT {expr} AS value FROM source.{table}) WHERE value IS NOT NULL""",
+                    (kind,))
+    out.execute(f"""INSERT INTO main.citizens (cnp, name, dob, status, street, locality)
+                    SELECT CAST(cnp AS INTEGER), name, dob, {_code('citizen_status', 'status')},
+                           {_STREET}, {_code('locality', _LOCALITY)}
+                    FROM source.citizens ORDER BY cnp""")
+    out.execute(f"""INSERT INTO main.vehicles (vin, make, model, year, status, owner_cnp)
+                    SELECT vin, {_code('make', 'make')}, {_code('model', 'model')}, year,
+                           {_code('vehicle_status', 'status')},
+                           CASE WHEN owner_cnp GLOB {_CNP_GLOB} THEN CAST(owner_cnp AS INTEGER)
+                                ELSE owner_cnp END
+                    FROM source.vehicles ORDER BY vin""")
+    out.execute("INSERT INTO main.registry_codes (kind, code, value) SELECT kind, code, value FROM temp.registry_dictionary")
+    out.execute("DROP TABLE temp.registry_dictionary")
+
+
+def _snapshot_source(path: str) -> Optional[str]:
+    """Baza din care a fost publicat instantaneul de la `path` (None: fișier absent sau fără proveniență)."""
+    if not os.path.exists(path):
+        return None
+    conn = sqlite3.connect(f"file:{path}?mode=ro", uri=True)
+    try:
+        row = conn.execute("SELECT db_path FROM snapshot_source LIMIT 1").fetchone()
+    except sqlite3.OperationalError:
+        row = None
+    finally:
+        conn.close()
+    return row[0] if row else None
+
+
+def publish_snapshot(path: Optional[str] = None, layout: Optional[str] = None) -> dict:
+    """Copiază registrele într-un fișier nou și îl pune atomic în locul celui vechi.
+
+    Fișierul se construiește alături (`<path>.tmp-<pid>`), într-o singură
+    tranzacție de citire, apoi os.replace îl publică: cititorii văd fie
+    instantaneul vechi, fie pe cel nou, niciodată unul parțial. Versiunile
+    registrelor cresc, deci cache-ul rezultatelor MCP nu mai servește
+    răspunsuri din instantaneul anterior. `layout` ("text" / "compact",
+    implicit REGISTRY_LAYOUT) alege schema instantaneului.
+    Întoarce {path, layout, citizens, vehicles, seconds}.
+    """
+    layout = layout or db.REGISTRY_LAYOUT
+    if layout not in db.REGISTRY_LAYOUTS:
+        raise ValueError(f"Format de instantaneu necunoscut: {layout!r}")
+    path = os.path.abspath(path or db.REGISTRY_SNAPSHOT_PATH)
+    source_path = os.path.realpath(db.DB_PATH)
+    other = _snapshot_source(path)
+    if other is not None and other != source_path:
+        raise ValueError(f"{path} este instantaneul bazei {other}, nu al {source_path}: "
+                         f"alegeți alt fișier (--out / REGISTRY_SNAPSHOT_PATH)")
+    tmp = f"{path}.tmp-{os.getpid()}"
+    if os.path.exists(tmp):
+        os.remove(tmp)
+
+    start = time.perf_counter()
+    source = db.get_connection()
+    report = {"path": path, "layout": layout}
+    out = sqlite3.connect(tmp, isolation_level=None)
+    try:
+        out.execute("PRAGMA journal_mode = OFF")      # fișier nepublicat încă: fără jurnal
+        out.execute("ATTACH DATABASE ? AS source", (os.path.abspath(db.DB_PATH),))
+        out.execute("BEGIN")
+        if layout == "compact":
+            _copy_compact(out)
+        for table in db.REGISTRY_TABLES:
+            if layout == "text":
+                ddl = source.execute("SELECT sql FROM sqlite_master WHERE type = 'table' AND name = ?",
+                                     (table,)).fetchone()[0]
+                out.execute(ddl)
+                out.execute(f"INSERT INTO main.{table} SELECT * FROM source.{table}")
+            for _, sql in _secondary_indexes(source, table):
+                out.execute(sql)
+            report[table] = out.execute(f"SELECT COUNT(*) FROM main.{table}").fetchone()[0]
+        # Proveniența: baza sursă și versiunile registrelor după creșterea de mai jos.
+        versions = dict(out.execute("SELECT name, version FROM source.table_versions").fetchall())
+        out.execute("""CREATE TABLE main.snapshot_source (
+            table_name TEXT PRIMARY KEY, version INTEGER NOT NULL, db_path TEXT NOT NULL) WITHOUT ROWID""")
+        out.executemany("INSERT INTO main.snapshot_source VALUES (?, ?, ?)",
+                        [(t, versions.get(t, 0) + 1, source_path) for t in db.REGISTRY_TABLES])
+        out.execute("COMMIT")
+        out.execute("DETACH DATABASE source")
+        out.execute("ANALYZE")
+        out.close()
+        os.replace(tmp, path)
+    except BaseException:
+        out.close()
+        if os.path.exists(tmp):
+            os.remove(tmp)
+        raise
+
+    cursor = source.cursor()
+    for table in db.REGISTRY_TABLES:
+        db.bump_table_version(cursor, table)
+    source.commit()
+    source.close()
+    report["seconds"] = time.perf_counter() - start
+    return report
+
+
+# ── Generator sintetic ─────────────────────────────────────────────────────
+
+_FIRST_NAMES = ["Ion", "Maria", "Andrei", "Elena", "Mihai", "Ioana", "Gheorghe", "Ana", "Vasile", "Cristina"]
+_LAST_NAMES = ["Popescu", "Ionescu", "Popa", "Dumitrescu", "Stan", "Stoica", "Gheorghe", "Rusu", "Munteanu", "Matei"]
+_CITIES = ["București", "Cluj-Napoca", "Timișoara", "Iași", "Constanța", "Brașov", "Craiova", "Galați"]
+_STATUSES = ["Fără cazier", "Fără cazier", "Fără cazier", "Amenzi în curs"]
+_MAKES = [("Dacia", "Logan"), ("Dacia", "Duster"), ("Renault", "Clio"), ("Volkswagen", "Golf"),
+          ("Ford", "Focus"), ("BMW", "320d"), ("Skoda", "Octavia"), ("Toyota", "Corolla")]
+_VEHICLE_STATUSES = ["Înregistrat"] * 19 + ["Furat"]
+_VIN_ALPHABET = "ABCDEFGHJKLMNPRSTUVWXYZ0123456789"
+_WMIS = ["UU1", "VF1", "WVW", "WBA", "TMB", "VF3", "WF0", "SB1"]
+
+_EPOCH = datetime.date(1930, 1, 1)
+_DAYS = (datetime.date(2005, 12, 31) - _EPOCH).days + 1
+_COUNTIES, _SERIALS = 52, 999
+
+
+def _weighted(digits: str, weights) -> int:
+    return sum(int(c) * int(w) for c, w in zip(digits, weights))
+
+
+_date_table: list = []
+
+
+def _dates() -> list:
+    """(aammzz, născut după 2000, suma ponderată a cifrelor datei) pentru fiecare zi."""
+    if not _date_table:
+        for d in range(_DAYS):
+            date = _EPOCH + datetime.timedelta(days=d)
+            yymmdd = f"{date:%y%m%d}"
+            _date_table.append((yymmdd, date.year >= 2000, _weighted(yymmdd, CNP_WEIGHTS[1:7])))
+    return _date_table
+
+
+_COUNTY_PART = [(f"{c + 1:02d}", _weighted(f"{c + 1:02d}", CNP_WEIGHTS[7:9])) for c in range(_COUNTIES)]
+_SERIAL_PART = [(f"{n + 1:03d}", _weighted(f"{n + 1:03d}", CNP_WEIGHTS[9:])) for n in range(_SERIALS)]
+
+
+def synthetic_cnp(i: int) -> str:
+    """Al i-lea CNP sintetic: valid (dată reală, sumă de control) și unic pentru i < ~1,4 mld."""
+    i, serial = divmod(i, _SERIALS)
+    i, county = divmod(i, _COUNTIES)
+    # 7919 e prim cu _DAYS: i -> zi e o bijecție, iar datele nu vin în ordine.
+    yymmdd, after_2000, date_sum = _dates()[(i % _DAYS) * 7919 % _DAYS]
+    jj, county_sum = _COUNTY_PART[county]
+    nnn, serial_sum = _SERIAL_PART[serial]
+    male = (county + serial) % 2 == 0
+    first = (5 if male else 6) if after_2000 else (1 if male else 2)
+    checksum = (first * 2 + date_sum + county_sum + serial_sum) % 11
+    return f"{first}{yymmdd}{jj}{nnn}{1 if checksum == 10 else checksum}"
+
+
+def synthetic_vin(i: int) -> str:
+    """Al i-lea VIN sintetic: 17 caractere fără I/O/Q, unic pentru i < 33^8."""
+    serial = ""
+    n = i
+    for _ in range(8):
+        n, r = divmod(n, len(_VIN_ALPHABET))
+        serial = _VIN_ALPHABET[r] + serial
+    return _WMIS[i % len(_WMIS)] + "SYNTH0" + serial
+
+
+def generate(table: str, n: int, seed: int = 0) -> Iterator[dict]:
+    """n înregistrări sintetice valide pentru `table`, generate leneș."""
+    rng = random.Random(seed)
+    if table == "citizens":
+        for i in range(n):
+            cnp = synthetic_cnp(i)
+            dob = f"{cnp[5:7]}/{cnp[3:5]}/{'19' if cnp[0] in '12' else '20'}{cnp[1:3]}"
+            yield {"cnp": cnp,
+                   "name": f"{rng.choice(_FIRST_NAMES)} {rng.choice(_LAST_NAMES)}",
+                   "dob": dob, "status": rng.choice(_STATUSES),
+                   "address": f"Str. Exemplu {rng.randint(1, 200)}, {rng.choice(_CITIES)}"}
+    elif table == "vehicles":
+        for i in range(n):
+            make, model = rng.choice(_MAKES)
+            yield {"vin": synthetic_vin(i), "make": make, "model": model,
+                   "year": rng.randint(1995, 2025), "status": rng.choice(_VEHICLE_STATUSES),
+                   "owner_cnp": synthetic_cnp(rng.randrange(max(n, 1)))}
+    else:
+        raise ValueError(f"Registru necunoscut: {table!r}")
+
+
+def write_extract(records: Iterable[dict], path: str, table: str) -> int:
+    """Scrie înregistrările ca CSV sau NDJSON (după extensie); întoarce numărul de rânduri."""
+    count = 0
+    with open(path, "w", encoding="utf-8", newline="") as f:
+        if path.lower().endswith(".csv"):
+            writer = csv.DictWriter(f, fieldnames=REGISTRY_COLUMNS[table])
+            writer.writeheader()
+            for count, record in enumerate(records, 1):
+                writer.writerow(record)
+        else:
+            for count, record in enumerate(records, 1):
+                f.write(json.dumps(record, ensure_ascii=False) + "\n")
+    return count
+
+
+# ── Linia de comandă ───────────────────────────────────────────────────────
+
+def _print_report(report: dict) -> None:
+    print(f"✅ [RegistryLoader] {report['table']}: {report['loaded']:,} rânduri importate, "
+          f"{report['rejected']:,} respinse, în {report['seconds']:.1f}s "
+          f"({report['rows_per_s']:,} rânduri/s)")
+
+
+def _print_snapshot(report: dict) -> None:
+    counts = ", ".join(f"{t}: {report[t]:,}" for t in db.REGISTRY_TABLES)
+    print(f"📦 [RegistryLoader] Instantaneu publicat în {report['path']} ({report['layout']}; {counts}), "
+          f"în {report['seconds']:.1f}s")
+
+
+def _progress(loaded: int, rejected: int) -> None:
+    print(f"📥 [RegistryLoader] {loaded:,} importate, {rejected:,} respinse…", file=sys.stderr)
+
+
+def main(argv=None) -> None:
+    parser = argparse.ArgumentParser(description="Import în masă pentru registrele citizens / vehicles")
+    parser.add_argument("--db", help="baza SQLite țintă (implicit civil_servant.db)")
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    p_load = sub.add_parser("load", help="importă un extras CSV / NDJSON")
+    p_load.add_argument("table", choices=sorted(REGISTRY_COLUMNS))
+    p_load.add_argument("path")
+    p_load.add_argument("--format", choices=["csv", "ndjson"])
+    p_load.add_argument("--batch-size", type=int, default=DEFAULT_BATCH_SIZE)
+    p_load.add_argument("--publish", action="store_true", help="publică apoi instantaneul registrelor")
+    p_load.add_argument("--layout", choices=db.REGISTRY_LAYOUTS, help="schema instantaneului publicat")
+
+    p_pub = sub.add_parser("publish", help="publică registrele ca instantaneu imuabil (citire fără lacăte)")
+    p_pub.add_argument("--out", help="fișierul instantaneului (implicit REGISTRY_SNAPSHOT_PATH)")
+    p_pub.add_argument("--layout", choices=db.REGISTRY_LAYOUTS,
+                       help="text (copie) sau compact (STRICT, WITHOUT ROWID; implicit REGISTRY_LAYOUT)")
+
+    p_gen = sub.add_parser("generate", help="scrie un extras sintetic valid")
+    p_gen.add_argument("table", choices=sorted(REGISTRY_COLUMNS))
+    p_gen.add_argument("rows", type=int)
+    p_gen.add_argument("path")
+    p_gen.add_argument("--seed", type=int, default=0)
+
+    p_bench = sub.add_parser("bench", help="generează și importă direct (fără fișier)")
+    p_bench.add_argument("--rows", type=int, default=1_000_000)
+    p_bench.add_argument("--table", choices=sorted(REGISTRY_COLUMNS), default="citizens")
+    p_bench.add_argument("--batch-size", type=int, default=DEFAULT_BATCH_SIZE)
+
+    args = parser.parse_args(argv)
+    if args.db:
+        target = os.path.abspath(args.db)
+        if (os.path.realpath(target) != os.path.realpath(db.DB_PATH)
+                and "REGISTRY_SNAPSHOT_PATH" not in os.environ):
+            # Altă bază decât a aplicației: instantaneul ei stă alături, nu îl înlocuiește pe cel servit.
+            stem = os.path.splitext(os.path.basename(target))[0]
+            db.REGISTRY_SNAPSHOT_PATH = os.path.join(os.path.dirname(target), f"registry_snapshot_{stem}.db")
+        db.DB_PATH = target
+    db.ensure_schema()
+
+    if args.command == "generate":
+        start = time.perf_counter()
+        count = write_extract(generate(args.table, args.rows, args.seed), args.path, args.table)
+        print(f"🧪 [RegistryLoader] {count:,} înregistrări {args.table} scrise în {args.path} "
+              f"({time.perf_counter() - start:.1f}s)")
+    elif args.command == "load":
+        _print_report(load_file(args.path, args.table, args.format, args.batch_size, _progress))
+        if args.publish:
+            _print_snapshot(publish_snapshot(layout=args.layout))
+        elif os.path.exists(db.REGISTRY_SNAPSHOT_PATH):
+            print(f"⚠️ [RegistryLoader] Căutările citesc încă instantaneul {db.REGISTRY_SNAPSHOT_PATH}, "
+                  f"fără acest import: publicați-l cu `publish` (sau `load --publish`).")
+    elif args.command == "publish":
+        _print_snapshot(publish_snapshot(args.out, args.layout))
+    else:
+        _print_report(load_records(generate(args.table, args.rows), args.table,
+                                   args.batch_size, _progress))
+
+
+if __name__ == "__main__":
+    main()
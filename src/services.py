@@ -1,7 +1,69 @@
 # src/services.py — Registrul de Servicii (date din SQLite)
+import os
+import time
+from collections.abc import Mapping
+
 from src.database import get_all_services
 
-# Încarcă serviciile din baza de date SQLite.
-# Structura returnată este identică cu cea anterioară (dict de dict-uri)
-# pentru compatibilitate cu restul aplicației.
-SERVICES = get_all_services()
+# Cât de des (secunde) verifică vederea dacă registrul s-a schimbat în SQLite.
+SERVICES_REFRESH_S = float(os.getenv("SERVICES_REFRESH_S", "1.0"))
+
+
+class ServiceRegistryView(Mapping):
+    """Vedere vie asupra registrului de servicii.
+
+    Se comportă ca dict-ul de dict-uri de dinainte (SERVICES[key], .items(),
+    `in`, len), dar o procedură adăugată sau o etichetă modificată în SQLite
+    apare fără repornirea aplicației. Citirile vin din instantaneul imuabil din
+    memorie; cel mult o dată la SERVICES_REFRESH_S se verifică versiunile
+    tabelelor (PRAGMA data_version), iar un instantaneu nou înlocuiește atomic
+    referința la cel vechi.
+    """
+
+    def __init__(self, refresh_s: float = SERVICES_REFRESH_S):
+        self.refresh_s = refresh_s
+        self._snapshot = None
+        self._checked_at = float("-inf")    # prima citire încarcă (nu importul modulului)
+
+    def snapshot(self) -> Mapping:
+        """Instantaneul curent; folosiți-l când aveți nevoie de o vedere consecventă."""
+        now = time.monotonic()
+        if now - self._checked_at >= self.refresh_s:
+            self._snapshot = get_all_services()
+            self._checked_at = now
+        return self._snapshot
+
+    def refresh(self) -> None:
+        """Forțează verificarea la următoarea citire."""
+        self._checked_at = float("-inf")
+
+    def __getitem__(self, key):
+        return self.snapshot()[key]
+
+    def __iter__(self):
+        return iter(self.snapshot())
+
+    def __len__(self):
+        return len(self.snapshot())
+
+    # O singură citire a instantaneului per parcurgere: o reîncărcare în timpul
+    # buclei nu amestecă serviciile din două versiuni.
+    def keys(self):
+        return self.snapshot().keys()
+
+    def items(self):
+        return self.snapshot().items()
+
+    def values(self):
+        return self.snapshot().values()
+
+    def get(self, key, default=None):
+        return self.snapshot().get(key, default)
+
+    def __repr__(self):
+        return f"ServiceRegistryView({list(self.snapshot())!r})"
+
+
+# Serviciile din baza de date SQLite. Structura este identică cu cea anterioară
+# (dict de dict-uri) pentru compatibilitate cu restul aplicației.
+SERVICES = ServiceRegistryView()
@@ -0,0 +1,155 @@
+# src/vault_writer.py — Scrieri amânate (write-behind) în seif
+#
+# Încărcarea fișierelor individuale din app.py salva fiecare document cu două
+# tranzacții sincrone (câmpurile, apoi documentul), deci rularea scriptului
+# Streamlit aștepta commit-ul pentru fiecare fișier. Acum scrierile intră
+# într-o coadă, iar un fir dedicat le grupează: prima scriere deschide o
+# fereastră de VAULT_WRITE_INTERVAL_S, tot ce sosește între timp (până la
+# VAULT_WRITE_BATCH scrieri) intră în aceeași tranzacție.
+#   • flush()  — barieră: revine după ce tot ce s-a pus în coadă înainte e
+#                confirmat (folosită de „Golește Seiful" și „Re-scanează"),
+#                cel mult VAULT_FLUSH_TIMEOUT_S; raportează doar scrierile
+#                pierdute ale proprietarului cerut;
+#   • close()  — flush + oprirea firului, înregistrat cu atexit, deci o
+#                oprire curată nu pierde scrieri din coadă.
+# Starea afișată vine din st.session_state, actualizată imediat; baza rămâne
+# în urmă cel mult o fereastră.
+
+import os
+import queue
+import atexit
+import sqlite3
+import threading
+import time
+from typing import Optional
+
+from src import database as db
+
+VAULT_WRITE_INTERVAL_S = float(os.getenv("VAULT_WRITE_INTERVAL_S", "0.2"))
+VAULT_WRITE_BATCH = int(os.getenv("VAULT_WRITE_BATCH", "500"))
+# Încercări pentru o tranzacție eșuată (ex. baza blocată de un import în masă).
+VAULT_WRITE_RETRIES = 3
+# Cât așteaptă implicit flush() (rularea Streamlit nu rămâne blocată la nesfârșit).
+VAULT_FLUSH_TIMEOUT_S = float(os.getenv("VAULT_FLUSH_TIMEOUT_S", "10"))
+
+
+class VaultWriter:
+    """Coada de scrieri în seif și firul care le confirmă în tranzacții grupate."""
+
+    def __init__(self, interval_s: float = VAULT_WRITE_INTERVAL_S,
+                 max_batch: int = VAULT_WRITE_BATCH, name: str = "vault-writer"):
+        self.interval_s = interval_s
+        self.max_batch = max_batch
+        self.name = name
+        self._queue: queue.Queue = queue.Queue()
+        self._thread: Optional[threading.Thread] = None
+        self._pid = None
+        self._lock = threading.Lock()
+        self._errors: dict = {}                 # {proprietar: ultima eroare neraportată}
+        self.transactions = self.writes = 0
+
+    def _enqueue(self, item: tuple) -> None:
+        """Pune o scriere în coadă sub lacătul lui close(): nu poate ajunge după
+        marcajul de oprire, într-o coadă pe care n-o mai golește nimeni."""
+        with self._lock:
+            if self._thread is None or self._pid != os.getpid():
+                # Fiecare fir are coada lui: după close() cel vechi o termină doar pe a sa,
+                # iar după fork firul și coada procesului părinte nu mai sunt ale noastre.
+                self._queue = queue.Queue()
+                self._thread = threading.Thread(target=self._run, args=(self._queue,),
+                                                name=self.name, daemon=True)
+                self._pid = os.getpid()
+                self._thread.start()
+            self._queue.put(item)
+
+    def save_fields(self, fields: dict, owner: str = db.DEFAULT_OWNER) -> None:
+        self._enqueue(("fields", owner, dict(fields)))
+
+    def save_document(self, doc: dict, owner: str = db.DEFAULT_OWNER) -> None:
+        self._enqueue(("document", owner, dict(doc, fields=dict(doc.get("fields", {})))))
+
+    def flush(self, timeout: Optional[float] = VAULT_FLUSH_TIMEOUT_S, owner: Optional[str] = None) -> None:
+        """Așteaptă confirmarea tuturor scrierilor puse în coadă până acum.
+
+        Ridică TimeoutError dacă bariera nu e atinsă la timp și RuntimeError
+        dacă o tranzacție de dinainte a pierdut scrieri ale lui `owner`
+        (None = ale oricărui proprietar).
+        """
+        done = threading.Event()
+        with self._lock:
+            running = self._thread is not None and self._pid == os.getpid()
+            if running:
+                self._queue.put(("barrier", done))
+        if running and not done.wait(timeout):
+            raise TimeoutError(f"Scrierile în seif nu au fost confirmate în {timeout}s")
+        with self._lock:
+            owners = list(self._errors) if owner is None else [owner]
+            errors = [e for e in (self._errors.pop(o, None) for o in owners) if e is not None]
+        if errors:
+            raise RuntimeError(f"Scrieri în seif pierdute: {errors[0]}") from errors[0]
+
+    def close(self, timeout: float = 10.0) -> None:
+        """Confirmă coada și oprește firul (o scriere ulterioară îl repornește)."""
+        with self._lock:
+            thread, self._thread = self._thread, None
+            if thread is None or self._pid != os.getpid():
+                return
+            self._queue.put(("stop", None))
+        thread.join(timeout)
+
+    def _run(self, jobs: queue.Queue) -> None:
+        while True:
+            batch = [jobs.get()]
+            deadline = time.monotonic() + self.interval_s
+            while batch[-1][0] not in ("barrier", "stop") and len(batch) < self.max_batch:
+                try:
+                    batch.append(jobs.get(timeout=max(0.0, deadline - time.monotonic())))
+                except queue.Empty:
+                    break
+            writes = [item for item in batch if item[0] in ("fields", "document")]
+            try:
+                if writes:
+                    self._commit(writes)
+            finally:
+                # Barierele se eliberează oricum: flush() nu așteaptă un fir mort.
+                for kind, payload in ((item[0], item[-1]) for item in batch):
+                    if kind == "barrier":
+                        payload.set()
+            if any(item[0] == "stop" for item in batch):
+                db.close_connection()
+                return
+
+    def _apply(self, writes: list) -> Optional[Exception]:
+        """O tranzacție, reîncercată doar pentru erori SQLite; întoarce eroarea finală."""
+        for attempt in range(VAULT_WRITE_RETRIES):
+            try:
+                db.save_vault_writes(writes)
+                self.transactions += 1
+                self.writes += len(writes)
+                return None
+            except sqlite3.Error as e:
+                error = e
+                time.sleep(0.1 * 2 ** attempt)
+            except Exception as e:              # date invalide: reîncercarea nu ajută
+                return e
+        return error
+
+    def _commit(self, writes: list) -> None:
+        error = self._apply(writes)
+        if error is None:
+            return
+        owners = list(dict.fromkeys(item[1] for item in writes))
+        if len(owners) > 1:
+            # Un lot eșuat se reia per proprietar: o sesiune nu pierde scrieri din cauza alteia.
+            for owner in owners:
+                self._commit([item for item in writes if item[1] == owner])
+            return
+        with self._lock:
+            self._errors[owners[0]] = error
+        print(f"❌ [VaultWriter] {len(writes)} scrieri în seif pierdute ({owners[0]}): {error}")
+
+
+# Coada partajată de proces (toate sesiunile Streamlit).
+VAULT_WRITER = VaultWriter()
+
+atexit.register(VAULT_WRITER.close)
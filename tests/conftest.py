@@ -0,0 +1,15 @@
+# tests/conftest.py — Pregătirea bazei de date pentru întreaga sesiune de teste
+import os
+import sys
+
+import pytest
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+from src import database as db
+
+
+@pytest.fixture(scope="session", autouse=True)
+def schema():
+    """Importul src.database nu mai creează baza; testele o pregătesc explicit, o dată."""
+    db.ensure_schema()
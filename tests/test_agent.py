@@ -0,0 +1,255 @@
+# tests/test_agent.py — Teste pentru orchestrator și cache-urile clientului MCP (fără apeluri API)
+import pytest
+import os
+import sys
+import json
+from types import SimpleNamespace as NS
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+from src.agent import ToolDiscoveryCache, Orchestrator, MCPClient
+
+
+def _tool(name, props):
+    return NS(name=name, description=f"Unealta {name}",
+              inputSchema={"type": "object", "properties": props})
+
+
+class FakeMCP:
+    """Client MCP fals care numără apelurile list_tools."""
+
+    def __init__(self, tools):
+        self.tools = tools
+        self.list_calls = 0
+
+    def list_tools(self):
+        self.list_calls += 1
+        return NS(tools=self.tools)
+
+
+class TestToolDiscoveryCache:
+    """Teste pentru cache-ul de descoperire a uneltelor."""
+
+    def test_converts_to_openai_format(self):
+        cache = ToolDiscoveryCache(ttl=60)
+        tools = cache.get(FakeMCP([_tool("verify_cnp", {"cnp": {"type": "string"}})]))
+        assert tools[0]["type"] == "function"
+        assert tools[0]["function"]["name"] == "verify_cnp"
+        assert "cnp" in tools[0]["function"]["parameters"]["properties"]
+
+    def test_cached_within_ttl(self):
+        cache = ToolDiscoveryCache(ttl=60)
+        mcp = FakeMCP([_tool("verify_cnp", {})])
+        first = cache.get(mcp)
+        second = cache.get(mcp)
+        assert first is second
+        assert mcp.list_calls == 1
+
+    def test_unchanged_fingerprint_keeps_version(self):
+        cache = ToolDiscoveryCache(ttl=0)
+        mcp = FakeMCP([_tool("verify_cnp", {})])
+        cache.get(mcp)
+        cache.get(mcp)
+        assert mcp.list_calls == 2
+        assert cache.version == 1
+
+    def test_changed_schema_rebuilds_list(self):
+        cache = ToolDiscoveryCache(ttl=60)
+        mcp = FakeMCP([_tool("verify_cnp", {})])
+        cache.get(mcp)
+        mcp.tools = [_tool("verify_cnp", {"cnp": {"type": "string"}})]
+        cache.invalidate()
+        tools = cache.get(mcp)
+        assert cache.version == 2
+        assert "cnp" in tools[0]["function"]["parameters"]["properties"]
+
+    def test_keeps_last_good_list_when_server_down(self):
+        cache = ToolDiscoveryCache(ttl=0)
+        mcp = FakeMCP([_tool("verify_cnp", {})])
+        cache.get(mcp)
+        mcp.tools = []
+        assert cache.names(mcp) == ["verify_cnp"]
+
+    def test_never_discovered_returns_none(self):
+        cache = ToolDiscoveryCache(ttl=60)
+        assert cache.get(FakeMCP([])) is None
+        assert cache.names(FakeMCP([])) == []
+
+
+def _tool_call(name, args):
+    return NS(type="function", function=NS(name=name, arguments=json.dumps(args)))
+
+
+class FakeOpenAI:
+    """Client OpenAI fals care întoarce mereu aceleași tool-calls."""
+
+    def __init__(self, tool_calls):
+        self.tool_calls = tool_calls
+        self.chat = NS(completions=NS(create=self._create))
+
+    def _create(self, **kwargs):
+        return NS(choices=[NS(message=NS(tool_calls=self.tool_calls))])
+
+
+@pytest.fixture
+def orchestrator():
+    orch = Orchestrator()
+    orch.mcp = MCPClient(transport="inprocess")
+    return orch
+
+
+class TestOrchestratorAgentic:
+    """Teste pentru calea agentică, cu serverul MCP rulat în proces."""
+
+    def test_model_calls_folded_in_order(self, orchestrator):
+        client = FakeOpenAI([
+            _tool_call("check_vehicle_status", {"vin": "VF1RFD00X56789012"}),
+            _tool_call("verify_cnp", {"cnp": "1900101123457"}),
+        ])
+        enr = orchestrator.dispatch({"CNP": "1900101123457", "VIN": "VF1RFD00X56789012"},
+                                    "vehicle_registration", client=client)
+        assert enr["block_vin"] is True
+        assert enr["cnp_validation"]["valid"] is True
+        assert [(c["tool"], c["source"]) for c in enr["tool_trace"]] == [
+            ("check_vehicle_status", "model"),
+            ("verify_cnp", "model"),
+            ("check_required_documents", "safety"),
+        ]
+
+    def test_safety_sweep_covers_skipped_checks(self, orchestrator):
+        enr = orchestrator.dispatch({"CNP": "123"}, "identity_card", client=FakeOpenAI([]))
+        assert enr["block_cnp"] is True
+        assert enr["docs_fetched"] is True
+        assert {c["source"] for c in enr["tool_trace"]} == {"safety"}
+
+    def test_safety_checks_start_before_llm(self, orchestrator):
+        events = []
+        submit = orchestrator.mcp.submit
+
+        def logging_submit(tool, args, deadline=None):
+            events.append(tool)
+            return submit(tool, args, deadline)
+
+        orchestrator.mcp.submit = logging_submit
+        client = FakeOpenAI([_tool_call("verify_cnp", {"cnp": "1900101123457"})])
+        create = client.chat.completions.create
+        client.chat.completions.create = lambda **kw: (events.append("llm"), create(**kw))[1]
+
+        enr = orchestrator.dispatch({"CNP": "1900101123457", "VIN": "VF1RFD00X56789012"},
+                                    "vehicle_registration", client=client)
+        # Verificările garantate pornesc înaintea LLM-ului; alegerea identică a
+        # modelului refolosește apelul speculativ în loc să-l repete.
+        assert events == ["verify_cnp", "check_vehicle_status", "check_required_documents", "llm"]
+        assert enr["block_vin"] is True
+        assert [(c["tool"], c["source"]) for c in enr["tool_trace"]] == [
+            ("verify_cnp", "model"),
+            ("check_vehicle_status", "safety"),
+            ("check_required_documents", "safety"),
+        ]
+
+    def test_model_pick_with_other_args_is_called(self, orchestrator):
+        client = FakeOpenAI([_tool_call("verify_cnp", {"cnp": "123"})])
+        enr = orchestrator.dispatch({"CNP": "1900101123457"}, "identity_card", client=client)
+        # Rezultatul modelului are prioritate; cel speculativ rămâne nefolosit.
+        assert enr["block_cnp"] is True
+        assert [c["tool"] for c in enr["tool_trace"]] == ["verify_cnp", "check_required_documents"]
+
+    def test_llm_failure_reuses_speculative_calls(self, orchestrator):
+        submitted = []
+        submit = orchestrator.mcp.submit
+
+        def logging_submit(tool, args, deadline=None):
+            submitted.append(tool)
+            return submit(tool, args, deadline)
+
+        def no_call(*args, **kwargs):
+            pytest.fail("calea deterministă a retrimis un apel deja pornit")
+
+        orchestrator.mcp.submit = logging_submit
+        for tool in (orchestrator.validation_tool, orchestrator.vehicle_tool, orchestrator.document_tool):
+            tool.mcp = NS(call=no_call)
+
+        def failing_llm(**kwargs):
+            raise TimeoutError("LLM indisponibil")
+
+        client = NS(chat=NS(completions=NS(create=failing_llm)))
+        enr = orchestrator.dispatch({"CNP": "1900101123457", "VIN": "VF1RFD00X56789012"},
+                                    "vehicle_registration", client=client)
+        assert submitted == ["verify_cnp", "check_vehicle_status", "check_required_documents"]
+        assert enr["block_vin"] is True and enr["docs_fetched"] is True
+        assert {c["source"] for c in enr["tool_trace"]} == {"fallback"}
+
+    def test_unused_speculative_calls_cancelled(self, orchestrator):
+        import concurrent.futures
+        pending = concurrent.futures.Future()          # apel speculativ care nu termină
+        submit = orchestrator.mcp.submit
+
+        def slow_submit(tool, args, deadline=None):
+            return pending if args == {"cnp": "1900101123457"} else submit(tool, args, deadline)
+
+        orchestrator.mcp.submit = slow_submit
+        client = FakeOpenAI([_tool_call("verify_cnp", {"cnp": "123"})])
+        enr = orchestrator.dispatch({"CNP": "1900101123457"}, "identity_card", client=client)
+        assert enr["block_cnp"] is True
+        assert pending.cancelled()
+
+    def test_failed_speculative_call_repeated_on_fallback(self, orchestrator):
+        import concurrent.futures
+        broken = concurrent.futures.Future()
+        broken.set_exception(ConnectionError("sesiune închisă"))
+        submit = orchestrator.mcp.submit
+        orchestrator.mcp.submit = lambda tool, args, deadline=None: (
+            broken if tool == "verify_cnp" else submit(tool, args, deadline))
+
+        def failing_llm(**kwargs):
+            raise TimeoutError("LLM indisponibil")
+
+        client = NS(chat=NS(completions=NS(create=failing_llm)))
+        enr = orchestrator.dispatch({"CNP": "1900101123457"}, "identity_card", client=client)
+        assert enr["cnp_validation"]["valid"] is True       # reluat de ValidationTool
+
+
+class TestConcurrentFolding:
+    """Apelurile identice concurente dintr-o tură împart o singură cerere MCP."""
+
+    @staticmethod
+    def _delayed(result: dict, delay: float = 0.1):
+        import threading
+        import concurrent.futures
+        future = concurrent.futures.Future()
+        threading.Timer(delay, future.set_result, [json.dumps(result)]).start()
+        return future
+
+    def test_identical_calls_share_one_request(self, orchestrator):
+        requests = []
+
+        def counting_submit(tool, args, deadline=None):
+            requests.append((tool, args))
+            return self._delayed({"valid": True, "data": {"name": "Ion Popescu"}} if tool == "verify_cnp"
+                                 else {"service": args.get("service_type"), "required_documents": ["CI"]})
+
+        orchestrator.mcp.submit = counting_submit
+        call = _tool_call("verify_cnp", {"cnp": "1900101123457"})
+        enr = orchestrator.dispatch({"CNP": "1900101123457"}, "identity_card", client=FakeOpenAI([call, call]))
+        assert [t for t, _ in requests].count("verify_cnp") == 1
+        model = [c for c in enr["tool_trace"] if c["source"] == "model"]
+        assert len(model) == 2 and model[0]["result"] == model[1]["result"]
+        assert enr["cnp_validation"]["valid"] is True
+
+    def test_failure_reaches_every_waiter(self, orchestrator):
+        requests = []
+
+        def failing_submit(tool, args, deadline=None):
+            requests.append(tool)
+            return self._delayed({"error": "verify_cnp nu a răspuns", "unavailable": True})
+
+        orchestrator.mcp.submit = failing_submit
+        call = _tool_call("verify_cnp", {"cnp": "1900101123457"})
+        enr = orchestrator.dispatch({"CNP": "1900101123457"}, "identity_card", client=FakeOpenAI([call, call]))
+        # Două alegeri ale modelului + safety sweep: trei așteptări, o singură cerere.
+        assert requests.count("verify_cnp") == 1
+        waiters = [c for c in enr["tool_trace"] if c["tool"] == "verify_cnp"]
+        assert [(c["source"], c["result"].get("unavailable")) for c in waiters] == [
+            ("model", True), ("model", True), ("safety", True)]
+        assert enr["unavailable_tools"].count("verify_cnp") == 3
+        assert "cnp_validation" not in enr and "block_cnp" not in enr
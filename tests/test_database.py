@@ -4,6 +4,7 @@ import os
 import sys
 import sqlite3
 import json
+import threading
 
 # Adaugam directorul radacina la path
 sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
@@ -14,8 +15,10 @@ from src.database import (
     get_appointments, get_required_documents, get_processing_time,
     save_vault_field, save_vault_fields, get_vault_fields, clear_vault,
     save_vault_document, get_vault_documents, delete_vault_documents_by_folder,
-    is_folder_scanned, is_file_in_vault, DB_PATH,
+    is_folder_scanned, is_file_in_vault, get_table_versions, DB_PATH,
+    close_connection, FrozenDict, save_vault_scan, find_vault_documents,
 )
+from src import database as db
 
 
 class TestDatabaseConnection:
@@ -36,6 +39,50 @@ class TestDatabaseConnection:
         assert os.path.exists(DB_PATH), "Fisierul bazei de date nu exista"
 
 
+class TestPersistentConnections:
+    """Teste pentru conexiunile persistente per fir."""
+
+    def test_same_connection_reused_in_thread(self):
+        conn = get_connection()
+        conn.close()
+        assert get_connection() is conn
+        assert conn.execute("SELECT 1").fetchone()[0] == 1
+
+    def test_each_thread_has_own_connection(self):
+        other = []
+        t = threading.Thread(target=lambda: other.append(get_connection()))
+        t.start()
+        t.join()
+        assert other[0] is not get_connection()
+
+    def test_wal_and_pragmas(self):
+        conn = get_connection()
+        assert conn.execute("PRAGMA journal_mode").fetchone()[0] == "wal"
+        assert conn.execute("PRAGMA synchronous").fetchone()[0] == 1     # NORMAL
+        assert conn.execute("PRAGMA foreign_keys").fetchone()[0] == 1
+
+    def test_close_rolls_back_uncommitted_write(self):
+        conn = get_connection()
+        conn.execute("INSERT INTO vault_fields (field_key, field_value) VALUES ('Tmp', 'x')")
+        conn.close()
+        assert "Tmp" not in get_vault_fields()
+
+    def test_reader_not_blocked_by_open_write(self):
+        conn = get_connection()
+        conn.execute("INSERT INTO vault_fields (field_key, field_value) VALUES ('Tmp', 'x')")
+        seen = []
+        t = threading.Thread(target=lambda: seen.append(get_citizen("1900101123457")))
+        t.start()
+        t.join(5)
+        conn.rollback()
+        assert seen and seen[0]["name"] == "Ion Popescu"
+
+    def test_close_connection_reopens(self):
+        conn = get_connection()
+        close_connection()
+        assert get_connection() is not conn
+
+
 class TestDatabaseSchema:
     """Teste pentru structura tabelelor."""
 
@@ -130,6 +177,64 @@ class TestServices:
         assert len(svc["required_fields"]) == 6
 
 
+class TestServiceRegistryCache:
+    """Teste pentru instantaneul partajat al registrului de servicii."""
+
+    def _rename_field(self, label):
+        conn = get_connection()
+        conn.execute(
+            "UPDATE service_fields SET field_label = ? WHERE service_key = 'identity_card' AND field_key = 'FirstName'",
+            (label,))
+        conn.commit()
+        conn.close()
+
+    def test_snapshot_shared_between_calls(self):
+        assert get_all_services() is get_all_services()
+        assert get_service("identity_card") is get_all_services()["identity_card"]
+
+    def test_snapshot_is_read_only(self):
+        svc = get_service("identity_card")
+        with pytest.raises(TypeError):
+            svc["name"] = "x"
+        with pytest.raises(TypeError):
+            svc["required_fields"].pop("CNP")
+        assert isinstance(svc, FrozenDict)
+
+    def test_snapshot_copyable(self):
+        import copy
+        import pickle
+        svc = get_service("identity_card")
+        assert copy.deepcopy(svc) == svc
+        assert pickle.loads(pickle.dumps(svc)) == svc
+
+    def test_reloaded_when_fields_change(self):
+        before = get_all_services()
+        try:
+            self._rename_field("Prenume (modificat)")
+            after = get_all_services()
+            assert after is not before
+            assert after["identity_card"]["required_fields"]["FirstName"] == "Prenume (modificat)"
+        finally:
+            self._rename_field("Prenume")
+        assert get_service("identity_card")["required_fields"]["FirstName"] == "Prenume"
+
+    def test_unrelated_writes_keep_snapshot(self):
+        before = get_all_services()
+        loads = db._service_registry.loads
+        conn = get_connection()
+        conn.execute("UPDATE appointments SET office = office WHERE id = 1")
+        conn.commit()
+        conn.close()
+        save_vault_field("LastName", "POPESCU")
+        clear_vault()
+        assert get_all_services() is before
+        assert db._service_registry.loads == loads
+
+    def test_field_order_preserved(self):
+        fields = list(get_service("identity_card")["required_fields"])
+        assert fields[:2] == ["LastName", "FirstName"]
+
+
 class TestCitizens:
     """Teste pentru registrul de cetateni."""
 
@@ -338,6 +443,277 @@ class TestVault:
         clear_vault()
 
 
+def _scan_docs(n, folder="/tmp/scan"):
+    return [{"name": f"doc{i}.pdf", "rel": f"sub/doc{i}.pdf", "type": "id_card",
+             "fields": {"CNP": str(i)}, "count": 1, "source": "folder", "folder": folder}
+            for i in range(n)]
+
+
+class TestVaultBulkWrites:
+    """Teste pentru salvarea în lot a rezultatului unei scanări."""
+
+    def setup_method(self):
+        clear_vault()
+
+    def teardown_method(self):
+        clear_vault()
+
+    def test_saves_fields_and_documents(self):
+        saved = save_vault_scan({"LastName": "POPESCU", "Age": 34}, _scan_docs(5), batch_size=2)
+        assert saved == 5
+        assert get_vault_fields() == {"LastName": "POPESCU", "Age": "34"}
+        docs = get_vault_documents()
+        assert [d["name"] for d in docs] == [f"doc{i}.pdf" for i in range(5)]
+        assert docs[0]["fields"] == {"CNP": "0"}
+        assert is_folder_scanned("/tmp/scan")
+
+    def test_accepts_generator(self):
+        assert save_vault_scan({}, (d for d in _scan_docs(3))) == 3
+
+    def test_failure_writes_nothing(self):
+        def docs():
+            yield from _scan_docs(3)
+            raise RuntimeError("fișier corupt")
+
+        with pytest.raises(RuntimeError):
+            save_vault_scan({"LastName": "POPESCU"}, docs(), batch_size=2)
+        assert get_vault_fields() == {}
+        assert get_vault_documents() == []
+
+    def test_single_commit(self):
+        conn = get_connection()
+        commits = []
+        conn.set_trace_callback(lambda sql: commits.append(sql) if sql.startswith("COMMIT") else None)
+        try:
+            save_vault_scan({"A": "1", "B": "2"}, _scan_docs(7), batch_size=3)
+        finally:
+            conn.set_trace_callback(None)
+        assert len(commits) == 1
+
+
+class TestVaultDocumentFields:
+    """Teste pentru câmpurile normalizate ale documentelor din seif."""
+
+    def setup_method(self):
+        clear_vault()
+
+    def teardown_method(self):
+        clear_vault()
+
+    def test_fields_loaded_lazily(self):
+        save_vault_document({"name": "ci.jpg", "fields": {"CNP": "1900101123457", "LastName": "POPESCU"}})
+        doc = get_vault_documents()[0]
+        assert doc["fields"]._fields is None
+        assert dict(doc["fields"]) == {"CNP": "1900101123457", "LastName": "POPESCU"}
+        assert list(doc["fields"]) == ["CNP", "LastName"]
+
+    def test_page_fields_loaded_in_one_query(self):
+        for i in range(30):
+            save_vault_document({"name": f"doc_{i}.jpg", "fields": {"CNP": f"19001011234{i:02d}", "Nr": str(i)}})
+        statements = []
+        conn = get_connection()
+        conn.set_trace_callback(statements.append)
+        try:
+            for docs in (get_vault_documents(), find_vault_documents("CNP"),
+                         db.search_vault("doc", limit=30)["documents"]):
+                before = len(statements)
+                assert sorted(int(dict(d["fields"])["Nr"]) for d in docs) == list(range(30))
+                fields_queries = [q for q in statements[before:] if "vault_document_fields" in q
+                                  and "doc_id" in q and "SELECT" in q]
+                assert len(fields_queries) == 1
+        finally:
+            conn.set_trace_callback(None)
+
+    def test_provenance_lookup(self):
+        save_vault_document({"name": "ci.jpg", "fields": {"CNP": "1900101123457"}})
+        save_vault_document({"name": "pasaport.pdf", "fields": {"CNP": "2950505987655"}})
+        save_vault_document({"name": "permis.jpg", "fields": {"LastName": "POPESCU"}})
+        assert [d["name"] for d in find_vault_documents("CNP", "1900101123457")] == ["ci.jpg"]
+        assert [d["name"] for d in find_vault_documents("CNP")] == ["ci.jpg", "pasaport.pdf"]
+        assert find_vault_documents("Address") == []
+
+    def test_provenance_uses_index(self):
+        conn = get_connection()
+        plan = " ".join(r[3] for r in conn.execute(
+            "EXPLAIN QUERY PLAN SELECT doc_id FROM vault_document_fields"
+            " WHERE owner = ? AND field_key = ? AND field_value = ?",
+            ("local", "CNP", "x")))
+        assert "COVERING INDEX idx_vault_document_fields_owner_kv" in plan
+
+    def test_deleting_documents_cascades(self):
+        save_vault_document({"name": "a.jpg", "fields": {"CNP": "1"}, "folder": "/f"})
+        delete_vault_documents_by_folder("/f")
+        conn = get_connection()
+        assert conn.execute("SELECT COUNT(*) FROM vault_document_fields").fetchone()[0] == 0
+
+    def test_legacy_json_blobs_migrated(self, tmp_path, monkeypatch):
+        monkeypatch.setattr(db, "DB_PATH", str(tmp_path / "legacy.db"))
+        try:
+            conn = get_connection()
+            conn.execute("""CREATE TABLE vault_documents (
+                id INTEGER PRIMARY KEY AUTOINCREMENT, name TEXT NOT NULL, rel TEXT NOT NULL,
+                doc_type TEXT NOT NULL DEFAULT 'general', icon TEXT NOT NULL DEFAULT '📄',
+                fields_json TEXT NOT NULL DEFAULT '{}', field_count INTEGER NOT NULL DEFAULT 0,
+                source TEXT NOT NULL DEFAULT 'single', folder TEXT)""")
+            conn.execute("INSERT INTO vault_documents (name, rel, fields_json) VALUES ('ci.jpg', 'ci.jpg', ?)",
+                         (json.dumps({"LastName": "POPESCU", "CNP": "1900101123457"}),))
+            conn.execute("PRAGMA user_version = 1")
+            conn.commit()
+            init_db()
+            doc = get_vault_documents()[0]
+            assert dict(doc["fields"]) == {"LastName": "POPESCU", "CNP": "1900101123457"}
+            assert list(doc["fields"]) == ["LastName", "CNP"]
+            columns = {r[1] for r in conn.execute("PRAGMA table_info(vault_documents)")}
+            assert "fields_json" not in columns
+        finally:
+            close_connection()
+
+
+class TestVaultOwners:
+    """Teste pentru izolarea seifului pe proprietari."""
+
+    def setup_method(self):
+        for owner in ("alice", "bob"):
+            clear_vault(owner=owner)
+
+    def teardown_method(self):
+        for owner in ("alice", "bob"):
+            clear_vault(owner=owner)
+
+    def test_fields_isolated(self):
+        save_vault_field("CNP", "1900101123457", owner="alice")
+        save_vault_field("CNP", "2950505987655", owner="bob")
+        assert get_vault_fields(owner="alice") == {"CNP": "1900101123457"}
+        assert get_vault_fields(owner="bob") == {"CNP": "2950505987655"}
+        assert "CNP" not in get_vault_fields()
+
+    def test_documents_isolated(self):
+        save_vault_document({"name": "ci.jpg", "fields": {"CNP": "1"}, "folder": "/f"}, owner="alice")
+        assert [d["name"] for d in get_vault_documents(owner="alice")] == ["ci.jpg"]
+        assert get_vault_documents(owner="bob") == []
+        assert is_folder_scanned("/f", owner="alice")
+        assert not is_folder_scanned("/f", owner="bob")
+        assert is_file_in_vault("ci.jpg", owner="alice")
+        assert not is_file_in_vault("ci.jpg", owner="bob")
+        assert find_vault_documents("CNP", "1", owner="bob") == []
+
+    def test_clear_only_touches_owner(self):
+        save_vault_scan({"CNP": "1"}, [{"name": "a.jpg", "fields": {"CNP": "1"}, "folder": "/f"}], owner="alice")
+        save_vault_scan({"CNP": "2"}, [{"name": "b.jpg", "fields": {"CNP": "2"}, "folder": "/f"}], owner="bob")
+        delete_vault_documents_by_folder("/f", owner="alice")
+        clear_vault(owner="alice")
+        assert get_vault_fields(owner="alice") == {}
+        assert get_vault_documents(owner="alice") == []
+        assert get_vault_fields(owner="bob") == {"CNP": "2"}
+        assert [d["name"] for d in find_vault_documents("CNP", "2", owner="bob")] == ["b.jpg"]
+
+
+class TestVaultSearch:
+    """Teste pentru căutarea full-text în seif și în catalogul de documente."""
+
+    def setup_method(self):
+        for owner in (db.DEFAULT_OWNER, "bob"):
+            clear_vault(owner=owner)
+        save_vault_document({"name": "ci_veche.jpg", "type": "id_card", "folder": "/acte",
+                             "fields": {"LastName": "POPESCU", "Address": "Str. Teiului 17, Brașov"}})
+        save_vault_document({"name": "pasaport.pdf", "type": "passport", "folder": "/acte",
+                             "fields": {"LastName": "POPESCU", "Address": "Bd. Unirii 3, București"}})
+
+    def teardown_method(self):
+        for owner in (db.DEFAULT_OWNER, "bob"):
+            clear_vault(owner=owner)
+
+    def _names(self, query, **kwargs):
+        return [d["name"] for d in db.search_vault(query, **kwargs)["documents"]]
+
+    def test_finds_field_values_without_diacritics(self):
+        assert self._names("teiului brasov") == ["ci_veche.jpg"]
+        assert self._names("Bucuresti") == ["pasaport.pdf"]
+
+    def test_finds_by_field_key_and_file_name(self):
+        assert set(self._names("address")) == {"ci_veche.jpg", "pasaport.pdf"}
+        assert self._names("pasaport") == ["pasaport.pdf"]
+        assert self._names("passport") == ["pasaport.pdf"]
+
+    def test_prefix_and_ranking(self):
+        # Niciun document nu conține toate cuvintele: se trece la OR, cel mai relevant primul.
+        assert self._names("adresa veche Teiul")[0] == "ci_veche.jpg"
+        result = db.search_vault("teiului")["documents"][0]
+        assert result["score"] < 0 and dict(result["fields"])["LastName"] == "POPESCU"
+
+    def test_unranked_when_too_many_hits(self, monkeypatch):
+        monkeypatch.setattr(db, "SEARCH_RANK_MAX", 0)
+        docs = db.search_vault("popescu")["documents"]
+        assert [d["name"] for d in docs] == ["pasaport.pdf", "ci_veche.jpg"]      # cele mai noi întâi
+        assert docs[0]["score"] is None
+
+    def test_owner_isolation(self):
+        save_vault_document({"name": "ci_bob.jpg", "fields": {"Address": "Str. Teiului 2"}}, owner="bob")
+        assert self._names("teiului") == ["ci_veche.jpg"]
+        assert self._names("teiului", owner="bob") == ["ci_bob.jpg"]
+        assert self._names("teiului", owner="bo") == []             # tokenul proprietarului e exact
+
+    def test_other_owner_matches_do_not_change_results(self, monkeypatch):
+        # bob are un document cu toate cuvintele; pentru 'local' se trece totuși la OR.
+        save_vault_document({"name": "bob.jpg", "fields": {"Address": "Str. Teiului 2, Sibiu"}}, owner="bob")
+        assert self._names("teiului sibiu") == ["ci_veche.jpg"]
+        assert self._names("teiului sibiu", owner="bob") == ["bob.jpg"]
+        # Pragul de ordonare după relevanță se aplică doar potrivirilor proprietarului.
+        monkeypatch.setattr(db, "SEARCH_RANK_MAX", 2)
+        for i in range(5):
+            save_vault_document({"name": f"bob_{i}.jpg", "fields": {"LastName": "POPESCU"}}, owner="bob")
+        assert all(d["score"] is not None for d in db.search_vault("popescu")["documents"])
+        assert all(d["score"] is None for d in db.search_vault("popescu", owner="bob")["documents"])
+
+    def test_other_owner_documents_do_not_change_ranking(self):
+        # Statisticile de relevanță (câte documente conțin un termen) sunt ale proprietarului.
+        clear_vault()
+        for name, note in (("one.pdf", "alpha alpha alpha"), ("two.pdf", "beta"),
+                           ("x.pdf", "gamma"), ("y.pdf", "gamma"), ("z.pdf", "gamma")):
+            save_vault_document({"name": name, "fields": {"Nota": note}})
+        before = self._names("alpha beta")
+        save_vault_scan({}, [{"name": f"b_{i}.pdf", "fields": {"Nota": "alpha"}} for i in range(30)], owner="bob")
+        assert before == ["one.pdf", "two.pdf"]
+        assert self._names("alpha beta") == before
+
+    def test_deleted_documents_leave_index(self):
+        delete_vault_documents_by_folder("/acte")
+        assert self._names("popescu") == []
+        assert get_connection().execute("SELECT COUNT(*) FROM vault_search").fetchone()[0] == 0
+
+    def test_bulk_scan_indexed(self):
+        save_vault_scan({}, [{"name": f"scan_{i}.pdf", "fields": {"CNP": f"19001011234{i:02d}"}}
+                             for i in range(30)], batch_size=7)
+        assert self._names("1900101123417") == ["scan_17.pdf"]
+
+    def test_required_documents_catalog(self):
+        hits = db.search_vault("certificat nastere")["required_documents"]
+        assert hits and all("naștere" in h["document"] for h in hits)
+        assert {"service", "document", "score"} <= set(hits[0])
+
+    def test_user_text_is_not_fts_syntax(self):
+        for query in ('"', "a OR (b", "NEAR(x y)", "*", "-teiului", "col:val"):
+            db.search_vault(query)
+        assert db.search_vault("   ") == {"documents": [], "required_documents": []}
+
+    def test_existing_documents_indexed_by_migration(self, tmp_path, monkeypatch):
+        monkeypatch.setattr(db, "DB_PATH", str(tmp_path / "v3.db"))
+        migrations = db.MIGRATIONS
+        try:
+            monkeypatch.setattr(db, "MIGRATIONS", migrations[:3])
+            init_db()
+            conn = get_connection()
+            doc_id = conn.execute("INSERT INTO vault_documents (name, rel) VALUES ('ci.jpg', 'ci.jpg')").lastrowid
+            conn.execute("INSERT INTO vault_document_fields (doc_id, field_key, field_value)"
+                         " VALUES (?, 'Address', 'Str. Teiului 17')", (doc_id,))
+            conn.commit()
+            monkeypatch.setattr(db, "MIGRATIONS", migrations)
+            db.migrate(conn)
+            assert self._names("teiului") == ["ci.jpg"]
+        finally:
+            close_connection()
+
+
 class TestServiceFieldsIntegrity:
     """Teste de integritate intre servicii si campurile lor."""
 
@@ -363,3 +739,109 @@ class TestServiceFieldsIntegrity:
         for key in services_with_cnp:
             assert "CNP" in all_svcs[key]["required_fields"], \
                 f"Serviciul '{key}' nu are campul CNP"
+
+
+class TestMigrations:
+    """Teste pentru migrările de schemă (PRAGMA user_version) și indecși."""
+
+    def _plan(self, sql, params=()):
+        conn = get_connection()
+        return " ".join(r[3] for r in conn.execute("EXPLAIN QUERY PLAN " + sql, params))
+
+    def test_schema_at_latest_version(self):
+        conn = get_connection()
+        assert conn.execute("PRAGMA user_version").fetchone()[0] == len(db.MIGRATIONS)
+
+    def test_migrate_is_idempotent(self):
+        assert db.migrate(get_connection()) == len(db.MIGRATIONS)
+
+    def test_fresh_database_migrated(self, tmp_path, monkeypatch):
+        monkeypatch.setattr(db, "DB_PATH", str(tmp_path / "fresh.db"))
+        try:
+            init_db()
+            conn = get_connection()
+            assert conn.execute("PRAGMA user_version").fetchone()[0] == len(db.MIGRATIONS)
+            names = {r[0] for r in conn.execute("SELECT name FROM sqlite_master WHERE type = 'index'")}
+            assert "idx_vault_documents_owner_folder" in names
+        finally:
+            close_connection()
+
+    def test_vault_lookups_use_covering_indexes(self):
+        assert "COVERING INDEX idx_vault_documents_owner_folder" in self._plan(
+            "SELECT COUNT(*) FROM vault_documents WHERE owner = ? AND folder = ?", ("local", "x"))
+        assert "COVERING INDEX idx_vault_documents_owner_name" in self._plan(
+            "SELECT COUNT(*) FROM vault_documents WHERE owner = ? AND name = ?", ("local", "x"))
+
+    def test_required_documents_use_covering_index(self):
+        plan = self._plan("SELECT document_name FROM required_documents WHERE service_key = ? ORDER BY doc_order",
+                          ("identity_card",))
+        assert "COVERING INDEX idx_required_documents_service" in plan
+        assert "TEMP B-TREE" not in plan
+
+
+class TestSchemaBootstrap:
+    """Teste pentru pornirea leneșă a schemei (ensure_schema)."""
+
+    def test_import_does_not_touch_database(self):
+        import subprocess
+        code = ("import sqlite3; calls = []; real = sqlite3.connect\n"
+                "sqlite3.connect = lambda *a, **k: calls.append(a) or real(*a, **k)\n"
+                "import src.database, src.services, src.mcp_server\n"
+                "print(len(calls))")
+        out = subprocess.run([sys.executable, "-c", code], capture_output=True, text=True, check=True,
+                             cwd=os.path.join(os.path.dirname(__file__), ".."))
+        assert out.stdout.strip() == "0"
+
+    def test_fresh_database_created_and_seeded(self, tmp_path, monkeypatch):
+        monkeypatch.setattr(db, "DB_PATH", str(tmp_path / "fresh.db"))
+        try:
+            assert db.ensure_schema() == db.SCHEMA_VERSION
+            assert get_connection().execute("PRAGMA user_version").fetchone()[0] == db.SCHEMA_VERSION
+            assert get_citizen("1900101123457")["name"] == "Ion Popescu"
+        finally:
+            close_connection()
+
+    def test_current_schema_does_no_work(self, monkeypatch):
+        def fail():
+            raise AssertionError("schema la zi: init_db nu trebuia apelat")
+        monkeypatch.setattr(db, "init_db", fail)
+        monkeypatch.setattr(db, "seed_db", fail)
+        monkeypatch.setattr(db, "_schema_ready", set())
+        assert db.ensure_schema() == db.SCHEMA_VERSION
+
+    def test_checked_once_per_process(self, monkeypatch):
+        db.ensure_schema()
+        monkeypatch.setattr(db, "get_connection", lambda: pytest.fail("verificare repetată"))
+        assert db.ensure_schema() == db.SCHEMA_VERSION
+
+    def test_outdated_schema_migrated(self, tmp_path, monkeypatch):
+        monkeypatch.setattr(db, "DB_PATH", str(tmp_path / "old.db"))
+        migrations = db.MIGRATIONS
+        try:
+            monkeypatch.setattr(db, "MIGRATIONS", migrations[:2])
+            init_db()                                   # bază creată de o versiune anterioară (v2)
+            monkeypatch.setattr(db, "MIGRATIONS", migrations)
+            assert db.ensure_schema() == db.SCHEMA_VERSION
+            conn = get_connection()
+            assert conn.execute("PRAGMA user_version").fetchone()[0] == db.SCHEMA_VERSION
+            assert "owner" in {r[1] for r in conn.execute("PRAGMA table_info(vault_documents)")}
+        finally:
+            close_connection()
+
+
+class TestTableVersions:
+    """Teste pentru versiunile de tabele folosite la invalidarea cache-urilor."""
+
+    def test_write_bumps_table_version(self):
+        before = get_table_versions().get("appointments", 0)
+        conn = get_connection()
+        conn.execute("UPDATE appointments SET office = office WHERE id = 1")
+        conn.commit()
+        conn.close()
+        assert get_table_versions()["appointments"] == before + 1
+
+    def test_vault_writes_do_not_bump_registry_versions(self):
+        before = dict(get_table_versions())
+        save_vault_field("LastName", "POPESCU")
+        clear_vault()
+        assert get_table_versions() == before
@@ -0,0 +1,88 @@
+# tests/test_event_loop.py — Teste pentru bucla asyncio de fundal
+import pytest
+import os
+import sys
+import asyncio
+import threading
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+from src import event_loop
+from src.event_loop import BackgroundLoop
+from src.mcp_pool import MCPSessionPool, inprocess_connector
+
+
+async def _current_loop():
+    return asyncio.get_running_loop()
+
+
+class TestBackgroundLoop:
+    """Teste pentru fațada sincronă peste bucla de lungă durată."""
+
+    def setup_method(self):
+        self.bg = BackgroundLoop(name="test-loop")
+
+    def teardown_method(self):
+        self.bg.shutdown()
+
+    def test_run_returns_result(self):
+        async def add(a, b):
+            await asyncio.sleep(0)
+            return a + b
+        assert self.bg.run(add(2, 3)) == 5
+
+    def test_loop_is_reused_between_calls(self):
+        assert self.bg.run(_current_loop()) is self.bg.run(_current_loop())
+
+    def test_runs_in_dedicated_thread(self):
+        async def thread_name():
+            return threading.current_thread().name
+        assert self.bg.run(thread_name()) == "test-loop"
+
+    def test_submit_runs_concurrently(self):
+        async def slow(x):
+            await asyncio.sleep(0.2)
+            return x
+        futures = [self.bg.submit(slow(i)) for i in range(5)]
+        assert [f.result(0.6) for f in futures] == list(range(5))
+
+    def test_exceptions_propagate(self):
+        async def boom():
+            raise KeyError("x")
+        with pytest.raises(KeyError):
+            self.bg.run(boom())
+
+    def test_run_from_loop_thread_rejected(self):
+        async def nested():
+            return self.bg.run(_current_loop())
+        with pytest.raises(RuntimeError):
+            self.bg.run(nested())
+
+    def test_restart_after_shutdown(self):
+        first = self.bg.run(_current_loop())
+        self.bg.shutdown()
+        assert self.bg.run(_current_loop()) is not first
+
+
+class TestSharedLoop:
+    """Toate pool-urile folosesc bucla de fundal a procesului."""
+
+    def test_pools_share_process_loop(self):
+        a = MCPSessionPool(inprocess_connector(), size=1)
+        b = MCPSessionPool(inprocess_connector(), size=1)
+        try:
+            assert a.run(_current_loop()) is b.run(_current_loop()) is event_loop.run(_current_loop())
+        finally:
+            a.close()
+            b.close()
+
+    def test_closing_pool_keeps_loop_alive(self):
+        pool = MCPSessionPool(inprocess_connector(), size=1)
+        pool.run(pool.list_tools())
+        pool.close()
+        assert event_loop.BACKGROUND_LOOP.running
+        other = MCPSessionPool(inprocess_connector(), size=1)
+        try:
+            assert other.run(other.list_tools()).tools
+        finally:
+            other.close()
@@ -0,0 +1,128 @@
+# tests/test_mcp_cache.py — Teste pentru cache-ul de rezultate MCP
+import pytest
+import os
+import sys
+import json
+import asyncio
+import threading
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+from src import mcp_cache
+from src.mcp_cache import ResultCache, cache_key
+from src.database import get_connection
+
+DOCS = json.dumps({"service": "identity_card", "required_documents": ["Buletin"]})
+TIMES = json.dumps({"service": "identity_card", "mode": "standard", "estimated_time": "3 zile"})
+
+
+def _touch(table, where):
+    """Modifică (fără efect real) o tabelă, ca să-i crească versiunea."""
+    conn = get_connection()
+    conn.execute(f"UPDATE {table} SET service_key = service_key WHERE {where}")
+    conn.commit()
+    conn.close()
+
+
+class TestCacheKey:
+    """Teste pentru canonicalizarea cheilor."""
+
+    def test_argument_order_ignored(self):
+        a = cache_key("estimate_processing_time", {"service_type": "x", "is_urgent": True})
+        b = cache_key("estimate_processing_time", {"is_urgent": True, "service_type": "x"})
+        assert a == b
+
+    def test_tool_name_part_of_key(self):
+        assert cache_key("a", {}) != cache_key("b", {})
+
+
+class TestResultCache:
+    """Teste pentru TTL, LRU, contoare și invalidare."""
+
+    def test_miss_then_hit(self):
+        cache = ResultCache()
+        args = {"service_type": "identity_card"}
+        assert cache.get("check_required_documents", args) is None
+        cache.put("check_required_documents", args, DOCS)
+        assert cache.get("check_required_documents", args) == DOCS
+        assert cache.stats()["hits"] == 1
+        assert cache.stats()["misses"] == 1
+
+    def test_uncacheable_tool_ignored(self):
+        cache = ResultCache()
+        cache.put("get_available_appointments", {"service_type": "x"}, "{}")
+        assert cache.get("get_available_appointments", {"service_type": "x"}) is None
+        assert cache.stats()["entries"] == 0
+
+    def test_transport_errors_not_cached(self):
+        cache = ResultCache()
+        cache.put("verify_cnp", {"cnp": "1"}, json.dumps({"error": "MCP connection failed"}))
+        assert cache.stats()["entries"] == 0
+
+    def test_ttl_expiry(self, monkeypatch):
+        monkeypatch.setitem(mcp_cache.CACHE_POLICY, "check_required_documents",
+                            (0.0, ("required_documents",)))
+        cache = ResultCache()
+        cache.put("check_required_documents", {"service_type": "x"}, DOCS)
+        assert cache.get("check_required_documents", {"service_type": "x"}) is None
+
+    def test_lru_eviction(self):
+        cache = ResultCache(max_entries=2)
+        for svc in ("a", "b"):
+            cache.put("check_required_documents", {"service_type": svc}, DOCS)
+        cache.get("check_required_documents", {"service_type": "a"})   # „a" devine recent
+        cache.put("check_required_documents", {"service_type": "c"}, DOCS)
+        assert cache.get("check_required_documents", {"service_type": "b"}) is None
+        assert cache.get("check_required_documents", {"service_type": "a"}) == DOCS
+        assert cache.stats()["evictions"] == 1
+
+    def test_invalidated_when_table_changes(self):
+        cache = ResultCache(version_check_s=0)
+        cache.put("estimate_processing_time", {"service_type": "identity_card"}, TIMES)
+        cache.put("check_required_documents", {"service_type": "identity_card"}, DOCS)
+        _touch("processing_times", "service_key = 'identity_card'")
+        assert cache.get("estimate_processing_time", {"service_type": "identity_card"}) is None
+        assert cache.get("check_required_documents", {"service_type": "identity_card"}) == DOCS
+        assert cache.stats()["invalidations"] == 1
+
+    def test_cnp_format_failure_survives_registry_change(self):
+        cache = ResultCache(version_check_s=0)
+        bad = json.dumps({"valid": False, "error": "CNP-ul trebuie să conțină exact 13 cifre."})
+        cache.put("verify_cnp", {"cnp": "123"}, bad)
+        conn = get_connection()
+        conn.execute("UPDATE citizens SET name = name WHERE cnp = '1900101123457'")
+        conn.commit()
+        conn.close()
+        assert cache.get("verify_cnp", {"cnp": "123"}) == bad
+
+
+class TestVersionChecks:
+    """Citirea versiunilor: rară, în afara lacătului și în afara buclei de evenimente."""
+
+    def _counting(self, monkeypatch, cache):
+        calls = []
+
+        def versions():
+            calls.append(threading.current_thread())
+            assert not cache._lock.locked()
+            return {"processing_times": 0}
+        monkeypatch.setattr(mcp_cache, "get_table_versions", versions)
+        return calls
+
+    def test_versions_throttled_and_read_outside_lock(self, monkeypatch):
+        cache = ResultCache(version_check_s=60)
+        calls = self._counting(monkeypatch, cache)
+        cache.put("estimate_processing_time", {"service_type": "identity_card"}, TIMES)
+        for _ in range(20):
+            assert cache.get("estimate_processing_time", {"service_type": "identity_card"}) == TIMES
+        assert len(calls) == 1
+
+    def test_async_versions_read_on_executor(self, monkeypatch):
+        cache = ResultCache(version_check_s=0)
+        calls = self._counting(monkeypatch, cache)
+
+        async def main():
+            await cache.aversions()
+            return threading.current_thread()
+        loop_thread = asyncio.run(main())
+        assert calls and calls[0] is not loop_thread
@@ -0,0 +1,201 @@
+# tests/test_mcp_pool.py — Teste pentru pool-ul de sesiuni MCP persistente
+import pytest
+import os
+import sys
+import json
+import time
+import socket
+import asyncio
+import subprocess
+
+import anyio
+import httpx
+from mcp.shared.exceptions import McpError
+from mcp.types import ErrorData
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+from src.mcp_pool import (
+    MCPSessionPool, stdio_connector, inprocess_connector, http_connector, get_pool,
+)
+
+SERVER_SCRIPT = os.path.join(os.path.dirname(__file__), "..", "src", "mcp_server.py")
+
+
+@pytest.fixture(scope="module")
+def pool():
+    p = MCPSessionPool(stdio_connector(SERVER_SCRIPT), size=2)
+    yield p
+    p.close()
+
+
+def _free_port():
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+
+def _call(pool, name, args):
+    result = pool.run(pool.call_tool(name, args))
+    return json.loads(result.content[0].text)
+
+
+class TestSessionPool:
+    """Teste pentru reutilizarea și repornirea sesiunilor."""
+
+    def test_call_tool_returns_result(self, pool):
+        result = _call(pool, "verify_cnp", {"cnp": "1900101123457"})
+        assert result["valid"] is True
+        assert result["data"]["name"] == "Ion Popescu"
+
+    def test_sessions_are_reused(self, pool):
+        for _ in range(6):
+            _call(pool, "check_vehicle_status", {"vin": "WBAWB73569P019296"})
+        stats = pool.stats()
+        assert stats["alive"] == 2
+        assert stats["restarts"] == 0
+
+    def test_list_tools(self, pool):
+        listing = pool.run(pool.list_tools())
+        names = {t.name for t in listing.tools}
+        assert {"verify_cnp", "check_vehicle_status", "check_required_documents"} <= names
+
+    def test_dead_session_is_restarted(self, pool):
+        _call(pool, "verify_cnp", {"cnp": "123"})
+        pool.run(pool._slots[0].close())
+        pool.run(pool._slots[1].close())
+        result = _call(pool, "verify_cnp", {"cnp": "123"})
+        assert result["valid"] is False
+        assert pool.stats()["restarts"] >= 1
+
+
+class TestWorkerSupervision:
+    """Teste pentru rutare și supervizarea workerilor."""
+
+    def test_concurrent_calls_spread_across_workers(self, pool):
+        async def burst():
+            return await asyncio.gather(*(
+                pool.call_tool("verify_cnp", {"cnp": "1900101123457"}) for _ in range(8)
+            ))
+        before = [w["served"] for w in pool.stats()["workers"]]
+        pool.run(burst())
+        after = [w["served"] for w in pool.stats()["workers"]]
+        assert all(a > b for a, b in zip(after, before))
+        assert sum(after) - sum(before) == 8
+
+    def test_supervisor_restarts_dead_worker(self, pool):
+        _call(pool, "verify_cnp", {"cnp": "123"})
+        pool.run(pool._slots[0].close())
+        assert pool.stats()["alive"] == 1
+        assert pool.run(pool.check_workers()) == 1
+        assert pool.stats()["alive"] == 2
+
+    def test_unknown_routing_rejected(self):
+        with pytest.raises(ValueError):
+            MCPSessionPool(inprocess_connector(), routing="random")
+
+
+class TestInProcessTransport:
+    """Teste pentru transportul în memorie (fără proces copil)."""
+
+    def setup_method(self):
+        self.pool = MCPSessionPool(inprocess_connector(), size=1)
+
+    def teardown_method(self):
+        self.pool.close()
+
+    def test_call_tool_in_process(self):
+        result = _call(self.pool, "check_vehicle_status", {"vin": "VF1RFD00X56789012"})
+        assert result["found"] is True
+        assert result["data"]["status"] == "Furat"
+
+    def test_discovery_in_process(self):
+        listing = self.pool.run(self.pool.list_tools())
+        tools = {t.name: t for t in listing.tools}
+        assert "verify_cnp" in tools
+        assert "cnp" in tools["verify_cnp"].inputSchema["properties"]
+
+    def test_request_error_keeps_session(self):
+        async def timed_out(session):
+            raise McpError(ErrorData(code=httpx.codes.REQUEST_TIMEOUT, message="Timed out"))
+
+        async def slow(session):
+            await asyncio.sleep(0.2)
+            return await session.call_tool("verify_cnp", {"cnp": "123"})
+
+        async def scenario():
+            in_flight = asyncio.ensure_future(self.pool._request(slow))
+            await asyncio.sleep(0.05)
+            with pytest.raises(McpError):
+                await self.pool._request(timed_out)
+            return await in_flight
+
+        # Cererea concurentă de pe aceeași sesiune nu este afectată.
+        result = self.pool.run(scenario())
+        assert json.loads(result.content[0].text)["valid"] is False
+        assert self.pool.stats()["restarts"] == 0
+
+    def test_transport_error_restarts_and_retries(self):
+        attempts = []
+
+        async def broken_once(session):
+            attempts.append(session)
+            if len(attempts) == 1:
+                raise anyio.ClosedResourceError()
+            return await session.call_tool("verify_cnp", {"cnp": "123"})
+
+        result = self.pool.run(self.pool._request(broken_once))
+        assert json.loads(result.content[0].text)["valid"] is False
+        assert self.pool.stats()["restarts"] == 1
+        assert attempts[0] is not attempts[1]
+
+    def test_shared_pool_per_transport(self):
+        assert get_pool("x.py", "inprocess") is get_pool("x.py", "inprocess")
+        with pytest.raises(ValueError):
+            get_pool("x.py", "carrier-pigeon")
+
+
+def _wait_for_daemon(pool, proc):
+    deadline = time.time() + 20
+    while True:
+        try:
+            return pool.run(pool.list_tools())
+        except Exception:
+            if time.time() > deadline or proc.poll() is not None:
+                raise
+            time.sleep(0.2)
+
+
+class TestSharedDaemon:
+    """Teste pentru daemonul MCP partajat (streamable-HTTP)."""
+
+    def _start(self, *extra):
+        return subprocess.Popen(
+            [sys.executable, SERVER_SCRIPT, "--transport", "streamable-http", *extra],
+            stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL,
+        )
+
+    def test_tcp_daemon(self):
+        port = _free_port()
+        proc = self._start("--port", str(port))
+        pool = MCPSessionPool(http_connector(f"http://127.0.0.1:{port}/mcp"), size=1)
+        try:
+            _wait_for_daemon(pool, proc)
+            result = _call(pool, "verify_cnp", {"cnp": "1900101123457"})
+            assert result["data"]["name"] == "Ion Popescu"
+        finally:
+            pool.close()
+            proc.terminate()
+            proc.wait(10)
+
+    def test_unix_socket_daemon(self, tmp_path):
+        sock = str(tmp_path / "mcp.sock")
+        proc = self._start("--uds", sock)
+        pool = MCPSessionPool(http_connector("http://127.0.0.1:8765/mcp", uds=sock), size=1)
+        try:
+            listing = _wait_for_daemon(pool, proc)
+            assert "check_vehicle_status" in {t.name for t in listing.tools}
+        finally:
+            pool.close()
+            proc.terminate()
+            proc.wait(10)
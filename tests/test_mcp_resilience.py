@@ -0,0 +1,173 @@
+# tests/test_mcp_resilience.py — Teste pentru termene, circuit breaker și hedging
+import pytest
+import os
+import sys
+import json
+import time
+import asyncio
+from types import SimpleNamespace as NS
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+from src.agent import MCPClient, Orchestrator
+from src import mcp_resilience
+from src.mcp_resilience import CircuitBreaker, Deadline, STATS
+
+
+class FakePool:
+    """Pool fals: fiecare apel durează cât îi spune lista `delays`."""
+
+    def __init__(self, delays, fail=False):
+        self.delays = list(delays)
+        self.fail = fail
+        self.calls = 0
+
+    def run(self, coro):
+        return asyncio.run(coro)
+
+    async def call_tool(self, tool_name, arguments):
+        self.calls += 1
+        delay = self.delays.pop(0) if self.delays else 0
+        await asyncio.sleep(delay)
+        if self.fail:
+            raise ConnectionError("server căzut")
+        return NS(content=[NS(text=json.dumps({"valid": True, "data": {"name": f"apel {self.calls}"}}))])
+
+
+def _client(pool, **kwargs):
+    client = MCPClient(transport="inprocess", cache=None, **kwargs)
+    client.pool = pool
+    client.breaker = CircuitBreaker(failure_threshold=2, cooldown_s=60)
+    return client
+
+
+class TestCircuitBreaker:
+    """Teste pentru tranzițiile circuit breaker-ului."""
+
+    def test_opens_after_threshold(self):
+        breaker = CircuitBreaker(failure_threshold=2, cooldown_s=60)
+        breaker.record_failure()
+        assert breaker.allow()
+        breaker.record_failure()
+        assert breaker.state == "open"
+        assert not breaker.allow()
+        assert not breaker.healthy
+
+    def test_half_open_single_probe(self):
+        breaker = CircuitBreaker(failure_threshold=1, cooldown_s=0)
+        breaker.record_failure()
+        assert breaker.allow()          # proba
+        assert not breaker.allow()      # a doua cerere așteaptă verdictul probei
+        breaker.record_success()
+        assert breaker.state == "closed"
+
+    def test_failed_probe_reopens(self):
+        breaker = CircuitBreaker(failure_threshold=1, cooldown_s=0)
+        breaker.record_failure()
+        breaker.allow()
+        breaker.record_failure()
+        assert breaker.state == "open"
+
+
+class TestDeadline:
+    """Teste pentru bugetul de timp al turei."""
+
+    def test_remaining_decreases(self):
+        deadline = Deadline(10)
+        assert 9 < deadline.remaining() <= 10
+        assert not deadline.expired
+
+    def test_expired_budget(self):
+        assert Deadline(0).expired
+
+
+class TestClientResilience:
+    """Teste pentru MCPClient: timeout, fallback local, breaker, hedging."""
+
+    def test_timeout_falls_back_to_local_evaluation(self, monkeypatch):
+        monkeypatch.setitem(mcp_resilience.TOOL_TIMEOUTS, "verify_cnp", 0.2)
+        before = STATS.snapshot()
+        client = _client(FakePool([10]))
+        start = time.monotonic()
+        result = json.loads(client.call("verify_cnp", {"cnp": "1900101123457"}, Deadline(5)))
+        assert time.monotonic() - start < 2
+        assert result["data"]["name"] == "Ion Popescu"     # evaluat local, nu „CNP invalid"
+        after = STATS.snapshot()
+        assert after["timeouts"] == before["timeouts"] + 1
+        assert after["fallbacks"] == before["fallbacks"] + 1
+
+    def test_no_local_fallback_after_budget_exhausted(self):
+        before = STATS.snapshot()
+        client = _client(FakePool([10]))
+        result = json.loads(client.call("verify_cnp", {"cnp": "1900101123457"}, Deadline(0.2)))
+        assert result["unavailable"] and "data" not in result
+        assert STATS.snapshot()["fallbacks"] == before["fallbacks"]
+
+    def test_local_fallback_only_dispatches_registered_tools(self, monkeypatch):
+        from src import mcp_server
+        monkeypatch.setattr(mcp_server, "ensure_schema", lambda: pytest.fail("atribut apelat local"))
+        client = _client(FakePool([], fail=True))
+        for name in ("ensure_schema", "main", "json"):
+            result = json.loads(client.call(name, {}))
+            assert result["unavailable"] and "Unknown tool" in result["error"]
+
+    def test_breaker_short_circuits(self):
+        client = _client(FakePool([], fail=True))
+        for _ in range(2):
+            client.call("check_vehicle_status", {"vin": "VF1RFD00X56789012"})
+        calls = client.pool.calls
+        result = json.loads(client.call("check_vehicle_status", {"vin": "VF1RFD00X56789012"}))
+        assert client.pool.calls == calls        # serverul nu mai e contactat
+        assert result["data"]["status"] == "Furat"
+        assert not client.healthy
+
+    def test_hedged_request_wins(self):
+        before = STATS.snapshot()
+        client = _client(FakePool([5, 0]), hedge_after=0.05)
+        result = json.loads(client.call("verify_cnp", {"cnp": "1900101123457"}))
+        assert result["data"]["name"] == "apel 2"
+        after = STATS.snapshot()
+        assert after["hedges"] == before["hedges"] + 1
+        assert after["hedge_wins"] == before["hedge_wins"] + 1
+
+    def test_fast_response_not_hedged(self):
+        client = _client(FakePool([0, 0]), hedge_after=1)
+        client.call("verify_cnp", {"cnp": "1900101123457"})
+        assert client.pool.calls == 1
+
+    def test_unhealthy_server_skips_agentic_path(self):
+        orch = Orchestrator()
+        orch.mcp = orch.validation_tool.mcp = orch.vehicle_tool.mcp = orch.document_tool.mcp = \
+            _client(FakePool([], fail=True))
+        orch.mcp.breaker.record_failure()
+        orch.mcp.breaker.record_failure()
+
+        class ExplodingOpenAI:
+            chat = NS(completions=NS(create=lambda **kw: pytest.fail("LLM apelat cu circuitul deschis")))
+
+        enr = orch.dispatch({"CNP": "1900101123457"}, "identity_card", client=ExplodingOpenAI())
+        assert enr["cnp_validation"]["valid"] is True
+        assert {c["source"] for c in enr["tool_trace"]} == {"fallback"}
+
+
+class TestCancelledProbe:
+    """O probă half-open anulată nu blochează circuitul."""
+
+    def test_cancelled_probe_released(self):
+        client = _client(FakePool([10, 0]))
+        client.breaker = CircuitBreaker(failure_threshold=1, cooldown_s=0)
+        client.breaker.record_failure()                 # open → half_open la următorul allow()
+
+        async def cancel_probe():
+            task = asyncio.ensure_future(client._call("verify_cnp", {"cnp": "1900101123457"}))
+            await asyncio.sleep(0.05)
+            task.cancel()
+            with pytest.raises(asyncio.CancelledError):
+                await task
+        asyncio.run(cancel_probe())
+
+        assert client.breaker.allow()                   # proba nouă e permisă
+        client.breaker.release_probe()
+        result = json.loads(client.call("verify_cnp", {"cnp": "1900101123457"}))
+        assert result["data"]["name"] == "apel 2"       # servit de server, nu local
+        assert client.breaker.state == "closed"
@@ -3,14 +3,27 @@ import pytest
 import os
 import sys
 import json
+import asyncio
+import threading
 
 sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
 
-from src.mcp_server import (
-    verify_cnp, check_vehicle_status,
-    get_available_appointments, estimate_processing_time,
-    check_required_documents,
-)
+from src import mcp_server
+from src import database as db
+
+
+def _sync(tool):
+    """Uneltele sunt `async def`; testele de mai jos le apelează sincron."""
+    return lambda *args, **kwargs: asyncio.run(tool(*args, **kwargs))
+
+
+verify_cnp = _sync(mcp_server.verify_cnp)
+verify_cnp_batch = _sync(mcp_server.verify_cnp_batch)
+check_vehicle_status = _sync(mcp_server.check_vehicle_status)
+check_vehicles_batch = _sync(mcp_server.check_vehicles_batch)
+get_available_appointments = _sync(mcp_server.get_available_appointments)
+estimate_processing_time = _sync(mcp_server.estimate_processing_time)
+check_required_documents = _sync(mcp_server.check_required_documents)
 
 
 class TestVerifyCNP:
@@ -79,6 +92,56 @@ class TestCheckVehicleStatus:
         assert result["found"] is True
 
 
+def _with_checksum(prefix12: str) -> str:
+    weights = [2, 7, 9, 1, 4, 6, 3, 5, 8, 2, 7, 9]
+    checksum = sum(int(prefix12[i]) * weights[i] for i in range(12)) % 11
+    return prefix12 + str(1 if checksum == 10 else checksum)
+
+
+class TestBatchTools:
+    """Teste pentru uneltele în lot: fiecare rezultat = rezultatul uneltei individuale."""
+
+    CNPS = [
+        "1900101123457", "2950505987655", "2850101018186", "  1900101123457  ",
+        "12345", "abcdefghijklm", "1900101123450", "1901301123455", "",
+        _with_checksum("000101123456"), _with_checksum("900101123456"),
+        _with_checksum("500229123456"), _with_checksum("500230123456"),   # 2000 e bisect
+        _with_checksum("100229123456"), _with_checksum("300229123456"),   # 1900, 1800 nu
+        _with_checksum("190043123456"), _with_checksum("190100123456"),
+        _with_checksum("190000123456"), _with_checksum("190431123456"),
+        "١٩٠٠١٠١١٢٣٤٥٧",                                                    # cifre arabe
+    ]
+
+    def test_cnp_batch_matches_single_tool(self):
+        batch = json.loads(verify_cnp_batch(self.CNPS))
+        assert batch["count"] == len(self.CNPS)
+        assert batch["results"] == [json.loads(verify_cnp(c)) for c in self.CNPS]
+
+    def test_cnp_batch_random_identifiers(self):
+        import random
+        rng = random.Random(7)
+        cnps = [_with_checksum("".join(rng.choice("0123456789") for _ in range(12)))
+                for _ in range(300)]
+        cnps += ["".join(rng.choice("0123456789") for _ in range(13)) for _ in range(300)]
+        batch = json.loads(verify_cnp_batch(cnps))["results"]
+        assert batch == [json.loads(verify_cnp(c)) for c in cnps]
+
+    def test_cnp_batch_empty(self):
+        assert json.loads(verify_cnp_batch([])) == {"count": 0, "results": []}
+
+    def test_vehicle_batch_matches_single_tool(self):
+        vins = ["WBAWB73569P019296", "VF1RFD00X56789012", "UNKNOWN123456789",
+                "wbawb73569p019296", " VF1RFD00X56789012 "]
+        batch = json.loads(check_vehicles_batch(vins))
+        assert batch["results"] == [json.loads(check_vehicle_status(v)) for v in vins]
+
+    def test_large_lookup_is_chunked(self, monkeypatch):
+        monkeypatch.setattr(db, "IN_CHUNK_SIZE", 2)
+        vins = ["WBAWB73569P019296", "VF1RFD00X56789012", "X", "Y", "Z"]
+        found = db.get_vehicles(vins)
+        assert set(found) == {"WBAWB73569P019296", "VF1RFD00X56789012"}
+
+
 class TestGetAvailableAppointments:
     """Teste pentru programari."""
 
@@ -135,3 +198,53 @@ class TestCheckRequiredDocuments:
         docs = result["required_documents"]
         assert len(docs) == 1
         assert "contacta" in docs[0].lower() or "biroul" in docs[0].lower()
+
+
+class TestSearchVault:
+    """Căutarea în seif nu e o unealtă MCP: proprietarul nu poate fi ales de model."""
+
+    def test_not_exposed_as_tool(self):
+        tools = asyncio.run(mcp_server.mcp.list_tools())
+        assert "search_vault" not in {t.name for t in tools}
+        assert not hasattr(mcp_server, "search_vault")
+
+
+class TestAsyncDataAccess:
+    """Teste pentru citirile asincrone de pe executorul bazei de date."""
+
+    def test_tools_are_coroutines(self):
+        import inspect
+        for name in ("verify_cnp", "verify_cnp_batch", "check_vehicle_status", "check_vehicles_batch",
+                     "get_available_appointments", "estimate_processing_time", "check_required_documents"):
+            assert inspect.iscoroutinefunction(getattr(mcp_server, name)), name
+
+    def test_reads_run_off_the_event_loop(self):
+        async def main():
+            loop_thread = threading.current_thread()
+            return loop_thread, await db.run_in_executor(threading.current_thread)
+        loop_thread, worker = asyncio.run(main())
+        assert worker is not loop_thread
+        assert worker.name.startswith("db")
+
+    def test_concurrent_lookups_overlap(self, monkeypatch):
+        # 8 citiri care țin discul 0.2s fiecare: secvențial 1.6s, suprapuse ~0.2s.
+        real_get_citizen = db.get_citizen
+
+        def slow_get_citizen(cnp):
+            threading.Event().wait(0.2)
+            return real_get_citizen(cnp)
+
+        monkeypatch.setattr(db, "get_citizen", slow_get_citizen)
+
+        async def main():
+            import time
+            start = time.perf_counter()
+            results = await asyncio.gather(*(mcp_server.verify_cnp("1900101123457") for _ in range(8)))
+            return results, time.perf_counter() - start
+
+        results, elapsed = asyncio.run(main())
+        assert all(json.loads(r)["data"]["name"] == "Ion Popescu" for r in results)
+        assert elapsed < 1.0
+
+    def test_executor_is_bounded(self):
+        assert db.get_executor()._max_workers == db.DB_EXECUTOR_WORKERS
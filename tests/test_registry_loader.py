@@ -0,0 +1,273 @@
+# tests/test_registry_loader.py — Teste pentru importul în masă al registrelor
+import pytest
+import os
+import sys
+import json
+import sqlite3
+import asyncio
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+from src import database as db
+from src import registry_loader as loader
+from src.mcp_server import verify_cnp
+
+
+@pytest.fixture
+def temp_db(tmp_path, monkeypatch):
+    """Bază temporară: importurile nu ating civil_servant.db."""
+    monkeypatch.setattr(db, "DB_PATH", str(tmp_path / "registry.db"))
+    monkeypatch.setattr(db, "REGISTRY_SNAPSHOT_PATH", str(tmp_path / "registry_snapshot.db"))
+    db.init_db()
+    yield tmp_path
+    db.close_connection()
+
+
+class TestSyntheticGenerator:
+    """Teste pentru generatorul de date sintetice."""
+
+    def test_cnps_valid_and_unique(self):
+        cnps = [loader.synthetic_cnp(i) for i in range(5000)]
+        assert len(set(cnps)) == len(cnps)
+        assert all(json.loads(asyncio.run(verify_cnp(c)))["valid"] for c in cnps[:500])
+
+    def test_vins_valid_and_unique(self):
+        vins = [loader.synthetic_vin(i) for i in range(5000)]
+        assert len(set(vins)) == len(vins)
+        assert all(loader._VIN_RE.match(v) for v in vins)
+
+    def test_generation_is_deterministic(self):
+        assert list(loader.generate("vehicles", 20, seed=3)) == list(loader.generate("vehicles", 20, seed=3))
+
+
+class TestRegistryLoad:
+    """Teste pentru importul din CSV / NDJSON."""
+
+    def test_csv_import_rejects_invalid_cnps(self, temp_db):
+        path = str(temp_db / "citizens.csv")
+        records = list(loader.generate("citizens", 10))
+        records += [
+            {"cnp": "1900101123450", "name": "Sumă greșită", "dob": "", "status": "", "address": ""},
+            {"cnp": "12345", "name": "Prea scurt", "dob": "", "status": "", "address": ""},
+        ]
+        loader.write_extract(records, path, "citizens")
+        report = loader.load_file(path, "citizens", batch_size=4)
+        assert (report["loaded"], report["rejected"]) == (10, 2)
+        assert db.get_citizen(records[0]["cnp"])["name"] == records[0]["name"]
+        assert db.get_citizen("1900101123450") is None
+
+    def test_ndjson_vehicle_import(self, temp_db):
+        path = str(temp_db / "vehicles.ndjson")
+        records = list(loader.generate("vehicles", 25))
+        records.append({"vin": "SCURT", "make": "X", "model": "Y", "year": 2000, "status": "", "owner_cnp": None})
+        loader.write_extract(records, path, "vehicles")
+        report = loader.load_file(path, "vehicles", batch_size=10)
+        assert (report["loaded"], report["rejected"]) == (25, 1)
+        assert db.get_vehicle(records[5]["vin"])["make"] == records[5]["make"]
+
+
+    def test_reimport_replaces_rows(self, temp_db):
+        conn = db.get_connection()
+        before = conn.execute("SELECT COUNT(*) FROM citizens").fetchone()[0]
+        loader.load_records(loader.generate("citizens", 50), "citizens")
+        loader.load_records(loader.generate("citizens", 50), "citizens")
+        assert conn.execute("SELECT COUNT(*) FROM citizens").fetchone()[0] == before + 50
+
+    def test_single_version_bump_and_triggers_restored(self, temp_db):
+        before = db.get_table_versions().get("citizens", 0)
+        loader.load_records(loader.generate("citizens", 30), "citizens", batch_size=7)
+        assert db.get_table_versions()["citizens"] == before + 1
+
+        conn = db.get_connection()
+        conn.execute("DELETE FROM citizens WHERE rowid IN (SELECT rowid FROM citizens LIMIT 1)")
+        conn.commit()
+        assert db.get_table_versions()["citizens"] == before + 2
+
+    def test_secondary_indexes_rebuilt(self, temp_db):
+        conn = db.get_connection()
+        conn.execute("CREATE INDEX idx_citizens_name ON citizens(name)")
+        conn.commit()
+        loader.load_records(loader.generate("citizens", 20), "citizens")
+        names = {r[0] for r in conn.execute("SELECT name FROM sqlite_master WHERE type = 'index'")}
+        assert "idx_citizens_name" in names
+
+    def test_failed_import_leaves_table_intact(self, temp_db):
+        conn = db.get_connection()
+        conn.execute("CREATE INDEX idx_citizens_name ON citizens(name)")
+        conn.commit()
+        before = conn.execute("SELECT COUNT(*) FROM citizens").fetchone()[0]
+        version = db.get_table_versions().get("citizens", 0)
+
+        def interrupted():
+            yield from loader.generate("citizens", 20)
+            raise OSError("extras trunchiat")
+        with pytest.raises(OSError):
+            loader.load_records(interrupted(), "citizens", batch_size=7)
+        conn = db.get_connection()
+        assert conn.execute("SELECT COUNT(*) FROM citizens").fetchone()[0] == before
+        names = {r[0] for r in conn.execute("SELECT name FROM sqlite_master WHERE type IN ('index', 'trigger')")}
+        assert {"idx_citizens_name", "trg_citizens_insert_version"} <= names
+        assert db.get_table_versions().get("citizens", 0) == version
+
+    def test_unknown_table_rejected(self, temp_db):
+        with pytest.raises(ValueError):
+            loader.load_records([], "passports")
+
+
+class TestRegistrySnapshot:
+    """Teste pentru instantaneul imuabil al registrelor."""
+
+    def _load(self, n=40):
+        records = list(loader.generate("citizens", n))
+        loader.load_records(records, "citizens")
+        return records
+
+    def test_falls_back_to_main_database(self, temp_db):
+        records = self._load()
+        assert db.get_registry_connection() is db.get_connection()
+        assert db.get_citizen(records[0]["cnp"])["name"] == records[0]["name"]
+
+    def test_lookups_served_from_snapshot(self, temp_db):
+        records = self._load()
+        report = loader.publish_snapshot()
+        assert report["citizens"] == 40
+        assert not [p for p in os.listdir(temp_db) if ".tmp-" in p]
+
+        conn = db.get_connection()
+        conn.execute("DELETE FROM citizens WHERE cnp = ?", (records[0]["cnp"],))
+        conn.commit()
+        # Baza principală s-a schimbat, instantaneul publicat nu.
+        assert db.get_citizen(records[0]["cnp"])["name"] == records[0]["name"]
+        assert records[0]["cnp"] in db.get_citizens([r["cnp"] for r in records])
+        assert json.loads(asyncio.run(verify_cnp(records[0]["cnp"])))["data"]["name"] == records[0]["name"]
+
+    def test_republish_swaps_snapshot(self, temp_db):
+        records = self._load()
+        loader.publish_snapshot()
+        assert db.get_citizen(records[0]["cnp"]) is not None
+        conn = db.get_connection()
+        conn.execute("DELETE FROM citizens WHERE cnp = ?", (records[0]["cnp"],))
+        conn.commit()
+        loader.publish_snapshot()
+        assert db.get_citizen(records[0]["cnp"]) is None
+        assert db.get_citizen(records[1]["cnp"]) is not None
+
+    def test_snapshot_is_read_only(self, temp_db):
+        self._load()
+        loader.publish_snapshot()
+        conn = db.get_registry_connection()
+        assert conn is not db.get_connection()
+        with pytest.raises(sqlite3.OperationalError):
+            conn.execute("DELETE FROM citizens")
+        assert conn.execute("PRAGMA journal_mode").fetchone()[0] != "wal"
+
+    def test_publish_bumps_registry_versions(self, temp_db):
+        self._load()
+        before = db.get_table_versions()
+        loader.publish_snapshot()
+        after = db.get_table_versions()
+        assert all(after[t] == before.get(t, 0) + 1 for t in db.REGISTRY_TABLES)
+
+    def test_cli_publish(self, temp_db, capsys):
+        self._load(10)
+        out = str(temp_db / "cli_snapshot.db")
+        loader.main(["--db", db.DB_PATH, "publish", "--out", out])
+        assert os.path.exists(out)
+        assert "Instantaneu publicat" in capsys.readouterr().out
+
+    def test_cli_other_database_publishes_beside_it(self, temp_db, monkeypatch, capsys):
+        monkeypatch.delenv("REGISTRY_SNAPSHOT_PATH", raising=False)
+        extract = str(temp_db / "citizens.ndjson")
+        loader.write_extract(loader.generate("citizens", 10), extract, "citizens")
+        loader.main(["--db", str(temp_db / "other.db"), "load", "citizens", extract, "--publish"])
+        assert os.path.exists(temp_db / "registry_snapshot_other.db")
+        assert not os.path.exists(temp_db / "registry_snapshot.db")     # instantaneul servit, neatins
+        assert "Instantaneu publicat" in capsys.readouterr().out
+
+    def test_publish_refuses_snapshot_of_other_database(self, temp_db, monkeypatch):
+        self._load()
+        loader.publish_snapshot()
+        monkeypatch.setattr(db, "DB_PATH", str(temp_db / "other.db"))
+        db.init_db()
+        with pytest.raises(ValueError, match="instantaneul bazei"):
+            loader.publish_snapshot()
+        assert loader.publish_snapshot(str(temp_db / "other_snapshot.db"))["citizens"] == 0
+
+    def test_stale_snapshot_is_reported_once(self, temp_db, monkeypatch, capsys):
+        monkeypatch.setattr(db, "REGISTRY_STALE_CHECK_S", 0)
+        records = self._load()
+        loader.publish_snapshot()
+        assert db.get_citizen(records[0]["cnp"]) is not None
+        assert "Instantaneul registrelor" not in capsys.readouterr().out
+        loader.load_records(loader.generate("citizens", 50), "citizens")      # import fără publicare
+        db.get_citizen(records[0]["cnp"])
+        db.get_citizen(records[1]["cnp"])
+        assert capsys.readouterr().out.count("e mai vechi decât citizens") == 1
+
+
+class TestCompactRegistry:
+    """Teste pentru instantaneul compact (STRICT, WITHOUT ROWID, chei INTEGER)."""
+
+    EDGE_CITIZENS = [
+        ("1900101123457", "Ion Popescu", "01/01/1990", "Fără cazier", "Str. Florilor 12, București"),
+        ("2950505987655", "Maria Ionescu", "05/05/1995", "Amenzi în curs", None),
+        ("1850320556786", "Gheorghe Dumitrescu", "20/03/1985", "Fără cazier", "Fără virgulă"),
+        ("5010101123450", "Ana Pop", "01/01/2001", "Fără cazier", "Bl. A, Sc. 2, Iași"),
+    ]
+    EDGE_VEHICLES = [
+        ("WBAWB73569P019296", "BMW", "320d", 2009, "Înregistrat", "1900101123457"),
+        ("VF1RFD00X56789012", "Renault", "Megane", 2015, "Furat", None),
+        ("UU1SYNTH000000042", "Dacia", "Logan", 2020, "Înregistrat", "STRĂIN-123"),
+    ]
+
+    def _load(self):
+        loader.load_records(loader.generate("citizens", 200), "citizens")
+        loader.load_records(loader.generate("vehicles", 100), "vehicles")
+        conn = db.get_connection()
+        conn.executemany("INSERT OR REPLACE INTO citizens VALUES (?,?,?,?,?)", self.EDGE_CITIZENS)
+        conn.executemany("INSERT OR REPLACE INTO vehicles VALUES (?,?,?,?,?,?)", self.EDGE_VEHICLES)
+        conn.commit()
+        conn = db.get_connection()
+        return ([r[0] for r in conn.execute("SELECT cnp FROM citizens")],
+                [r[0] for r in conn.execute("SELECT vin FROM vehicles")])
+
+    def test_lookups_match_text_layout(self, temp_db):
+        cnps, vins = self._load()
+        text = loader.publish_snapshot(layout="text")
+        assert text["layout"] == "text"
+        expected = (db.get_citizens(cnps), db.get_vehicles(vins),
+                    [db.get_citizen(c) for c in cnps], [db.get_vehicle(v) for v in vins])
+        assert len(expected[0]) == len(cnps) and len(expected[1]) == len(vins)
+
+        loader.publish_snapshot(layout="compact")
+        assert db.get_registry_connection().registry_codes is not None
+        assert (db.get_citizens(cnps), db.get_vehicles(vins),
+                [db.get_citizen(c) for c in cnps], [db.get_vehicle(v) for v in vins]) == expected
+
+    def test_strict_without_rowid_integer_keys(self, temp_db):
+        self._load()
+        loader.publish_snapshot(layout="compact")
+        conn = db.get_registry_connection()
+        tables = {r["name"]: (r["wr"], r["strict"]) for r in conn.execute("PRAGMA table_list")}
+        assert tables["citizens"] == (1, 1) and tables["vehicles"] == (1, 1)
+        assert {r[0] for r in conn.execute("SELECT DISTINCT typeof(cnp) FROM citizens")} == {"integer"}
+        assert conn.execute("SELECT COUNT(DISTINCT status) FROM citizens").fetchone()[0] <= 3
+        # Fără index separat pentru cheia primară (sqlite_autoindex_*).
+        assert not conn.execute("SELECT name FROM sqlite_master WHERE type = 'index'").fetchall()
+
+    def test_invalid_keys_not_found(self, temp_db):
+        self._load()
+        loader.publish_snapshot(layout="compact")
+        for cnp in ("", "123", "190010112345x", "١٩٠٠١٠١١٢٣٤٥٧", 1900101123457):
+            assert db.get_citizen(cnp) is None
+        assert db.get_citizens(["123", "1900101123457"]).keys() == {"1900101123457"}
+
+    def test_unknown_layout_rejected(self, temp_db):
+        with pytest.raises(ValueError):
+            loader.publish_snapshot(layout="columnar")
+
+    def test_cli_publish_compact(self, temp_db, capsys):
+        self._load()
+        loader.main(["--db", db.DB_PATH, "publish", "--layout", "compact"])
+        assert "compact" in capsys.readouterr().out
+        assert db.get_citizen("1900101123457")["address"] == "Str. Florilor 12, București"
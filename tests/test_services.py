@@ -0,0 +1,87 @@
+# tests/test_services.py — Teste pentru vederea vie asupra registrului de servicii
+import pytest
+import os
+import sys
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+from src import database as db
+from src.services import SERVICES, ServiceRegistryView
+from src.database import get_connection
+
+
+@pytest.fixture(autouse=True)
+def temp_db(tmp_path, monkeypatch):
+    """Bază temporară: testele modifică registrul, civil_servant.db rămâne neatins."""
+    monkeypatch.setattr(db, "DB_PATH", str(tmp_path / "services.db"))
+    db.ensure_schema()
+    yield tmp_path
+    db.close_connection()
+
+
+def _set_label(label):
+    conn = get_connection()
+    conn.execute(
+        "UPDATE service_fields SET field_label = ? WHERE service_key = 'fiscal_certificate' AND field_key = 'CNP'",
+        (label,))
+    conn.commit()
+    conn.close()
+
+
+def _add_service(key):
+    conn = get_connection()
+    conn.execute(
+        "INSERT INTO services (key, name, icon, description, template_file, estimated_time) "
+        "VALUES (?, 'Serviciu nou', '🆕', 'Test', 'nou.pdf', '1 zi')", (key,))
+    conn.commit()
+    conn.close()
+
+
+def _remove_service(key):
+    conn = get_connection()
+    conn.execute("DELETE FROM services WHERE key = ?", (key,))
+    conn.commit()
+    conn.close()
+
+
+class TestServiceRegistryView:
+    """Teste pentru reîncărcarea registrului fără repornirea procesului."""
+
+    def test_dict_interface_unchanged(self):
+        assert "identity_card" in SERVICES
+        assert SERVICES["identity_card"]["name"]
+        assert len(SERVICES) == len(list(SERVICES.items())) >= 6
+        assert SERVICES.get("nonexistent_service_xyz") is None
+
+    def test_reads_served_from_memory_between_checks(self):
+        view = ServiceRegistryView(refresh_s=3600)
+        first = view.snapshot()
+        original = view["fiscal_certificate"]["required_fields"]["CNP"]
+        _set_label("CNP (test)")
+        try:
+            assert view.snapshot() is first
+            assert view["fiscal_certificate"]["required_fields"]["CNP"] == original
+        finally:
+            _set_label(original)
+
+    def test_label_change_visible_after_refresh(self):
+        view = ServiceRegistryView(refresh_s=0)
+        original = view["fiscal_certificate"]["required_fields"]["CNP"]
+        _set_label("CNP (modificat)")
+        try:
+            assert view["fiscal_certificate"]["required_fields"]["CNP"] == "CNP (modificat)"
+        finally:
+            _set_label(original)
+        assert view["fiscal_certificate"]["required_fields"]["CNP"] == original
+
+    def test_new_service_appears_without_restart(self):
+        view = ServiceRegistryView(refresh_s=3600)
+        assert "test_new_service" not in view
+        _add_service("test_new_service")
+        try:
+            view.refresh()
+            assert view["test_new_service"]["required_fields"] == {}
+        finally:
+            _remove_service("test_new_service")
+        view.refresh()
+        assert "test_new_service" not in view
@@ -0,0 +1,176 @@
+# tests/test_vault_writer.py — Teste pentru scrierile amânate în seif
+import pytest
+import os
+import sys
+import time
+import sqlite3
+import threading
+import subprocess
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+from src import database as db
+from src import vault_writer
+from src.vault_writer import VaultWriter
+
+
+def _doc(name, **fields):
+    return {"name": name, "rel": name, "fields": fields or {"CNP": "1900101123457"}, "count": 1}
+
+
+class TestVaultWriter:
+    """Teste pentru coada de scrieri și firul care o confirmă."""
+
+    def setup_method(self):
+        db.clear_vault()
+        self.writer = VaultWriter(interval_s=0.3, name="test-vault-writer")
+
+    def teardown_method(self):
+        self.writer.close()
+        db.clear_vault()
+
+    def test_flush_is_a_barrier(self):
+        self.writer.save_fields({"CNP": "1900101123457"})
+        self.writer.save_document(_doc("ci.jpg"))
+        assert db.get_vault_documents() == []          # încă în fereastra de grupare
+        self.writer.flush()
+        assert db.get_vault_fields() == {"CNP": "1900101123457"}
+        assert [d["name"] for d in db.get_vault_documents()] == ["ci.jpg"]
+        assert [d["name"] for d in db.search_vault("ci")["documents"]] == ["ci.jpg"]
+
+    def test_writes_coalesced_into_one_transaction(self):
+        for i in range(20):
+            self.writer.save_fields({f"Camp{i}": str(i)})
+            self.writer.save_document(_doc(f"doc_{i}.jpg"))
+        self.writer.flush()
+        assert self.writer.transactions == 1
+        assert self.writer.writes == 40
+        assert len(db.get_vault_documents()) == 20
+
+    def test_committed_without_flush_after_interval(self):
+        self.writer.save_document(_doc("ci.jpg"))
+        deadline = time.monotonic() + 3
+        while not db.get_vault_documents() and time.monotonic() < deadline:
+            time.sleep(0.05)
+        assert [d["name"] for d in db.get_vault_documents()] == ["ci.jpg"]
+
+    def test_batch_size_bounds_transactions(self):
+        writer = VaultWriter(interval_s=0.3, max_batch=3)
+        try:
+            for i in range(10):
+                writer.save_document(_doc(f"doc_{i}.jpg"))
+            writer.flush()
+            assert writer.transactions >= 4
+            assert len(db.get_vault_documents()) == 10
+        finally:
+            writer.close()
+
+    def test_clear_after_flush_leaves_nothing_behind(self):
+        self.writer.save_document(_doc("ci.jpg"))
+        self.writer.flush()
+        db.clear_vault()
+        time.sleep(0.4)
+        assert db.get_vault_documents() == []
+
+    def test_request_path_does_not_wait_for_commit(self, monkeypatch):
+        real = db.save_vault_writes
+        monkeypatch.setattr(db, "save_vault_writes", lambda writes: (time.sleep(0.5), real(writes)))
+        start = time.perf_counter()
+        for i in range(5):
+            self.writer.save_document(_doc(f"doc_{i}.jpg"))
+        assert time.perf_counter() - start < 0.1
+        self.writer.flush()
+        assert len(db.get_vault_documents()) == 5
+
+    def test_queued_document_is_a_copy(self):
+        doc = _doc("ci.jpg", CNP="1900101123457")
+        self.writer.save_document(doc, owner="local")
+        doc["fields"]["CNP"] = "modificat"
+        self.writer.flush()
+        assert dict(db.get_vault_documents()[0]["fields"]) == {"CNP": "1900101123457"}
+
+    def test_failed_transaction_reported_on_flush(self, monkeypatch):
+        def fail(writes):
+            raise sqlite3.OperationalError("database is locked")
+        monkeypatch.setattr(db, "save_vault_writes", fail)
+        monkeypatch.setattr(vault_writer, "VAULT_WRITE_RETRIES", 1)
+        self.writer.save_document(_doc("ci.jpg"))
+        with pytest.raises(RuntimeError):
+            self.writer.flush()
+        self.writer.flush()                             # eroarea e raportată o singură dată
+
+    def test_unexpected_error_keeps_thread_alive(self, monkeypatch):
+        real = db.save_vault_writes
+
+        def bad_payload(writes):
+            if any(item[2].get("name") == "rau.jpg" for item in writes if item[0] == "document"):
+                raise TypeError("payload invalid")
+            real(writes)
+        monkeypatch.setattr(db, "save_vault_writes", bad_payload)
+        self.writer.save_document(_doc("rau.jpg"))
+        with pytest.raises(RuntimeError):
+            self.writer.flush(timeout=5)
+        self.writer.save_document(_doc("bun.jpg"))
+        self.writer.flush(timeout=5)
+        assert [d["name"] for d in db.get_vault_documents()] == ["bun.jpg"]
+
+    def test_flush_timeout_is_finite_by_default(self):
+        assert vault_writer.VAULT_FLUSH_TIMEOUT_S is not None
+        assert VaultWriter.flush.__defaults__[0] == vault_writer.VAULT_FLUSH_TIMEOUT_S
+
+    def test_errors_reported_to_their_owner_only(self, monkeypatch):
+        real = db.save_vault_writes
+
+        def fail_for_alice(writes):
+            if any(item[1] == "alice" for item in writes):
+                raise ValueError("date invalide")
+            real(writes)
+        monkeypatch.setattr(db, "save_vault_writes", fail_for_alice)
+        self.writer.save_document(_doc("a.jpg"), owner="alice")
+        self.writer.save_document(_doc("b.jpg"), owner="bob")
+        self.writer.flush(owner="bob")                  # lotul comun e reluat per proprietar
+        assert [d["name"] for d in db.get_vault_documents(owner="bob")] == ["b.jpg"]
+        with pytest.raises(RuntimeError):
+            self.writer.flush(owner="alice")
+        db.clear_vault(owner="bob")
+
+    def test_restart_after_close(self):
+        self.writer.close()
+        self.writer.save_document(_doc("ci.jpg"))
+        self.writer.flush()
+        assert len(db.get_vault_documents()) == 1
+
+    def test_writes_racing_close_are_not_lost(self):
+        # close() concurent cu scrieri: niciuna nu poate rămâne după marcajul de oprire.
+        writers = [threading.Thread(target=lambda t=t: [self.writer.save_fields({f"K{t}_{i}": str(i)})
+                                                        for i in range(300)]) for t in range(4)]
+        interval = sys.getswitchinterval()
+        sys.setswitchinterval(1e-6)                     # comutări dese între fire
+        try:
+            for thread in writers:
+                thread.start()
+            while any(thread.is_alive() for thread in writers):
+                self.writer.close()
+        finally:
+            sys.setswitchinterval(interval)
+        self.writer.close()
+        assert len(db.get_vault_fields()) == 4 * 300
+
+
+class TestShutdownDurability:
+    """La oprirea curată a procesului, coada e confirmată (atexit)."""
+
+    def test_queue_committed_on_exit(self, tmp_path):
+        path = str(tmp_path / "vault.db")
+        code = ("import sys; sys.path.insert(0, {root!r})\n"
+                "from src import database as db; db.DB_PATH = {path!r}; db.ensure_schema()\n"
+                "from src.vault_writer import VAULT_WRITER\n"
+                "for i in range(50): VAULT_WRITER.save_document({{'name': f'doc_{{i}}.jpg', 'fields': {{}}}})\n"
+                ).format(root=os.path.join(os.path.dirname(__file__), ".."), path=path)
+        env = dict(os.environ, VAULT_WRITE_INTERVAL_S="30")
+        subprocess.run([sys.executable, "-c", code], check=True, env=env, timeout=60)
+        conn = sqlite3.connect(path)
+        try:
+            assert conn.execute("SELECT COUNT(*) FROM vault_documents").fetchone()[0] == 50
+        finally:
+            conn.close()